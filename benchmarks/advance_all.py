@@ -0,0 +1,100 @@
+"""
+Measures TournamentManager.advance_all (see models/tournament_manager.py) on synthetic tournaments.
+
+The same tournaments (same players, same seed, --played rounds with random results) are saved in a
+temporary folder for every mode, then the next round of all of them is created:
+- serial: advance_all with a single worker, which computes the pairings in this process,
+- thread / process: advance_all with a pool of --workers threads or processes.
+The report is a JSON document with the time of each mode and its speedup over the serial mode,
+along with the number of CPUs: the process pool can only be faster with several CPUs.
+
+Usage: python -m benchmarks.advance_all --tournaments 8 --players 1000 --played 4 --workers 4
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import tempfile
+import time
+
+from models.pairing import PAIRING_ENGINES
+from models.player import Player
+from models.tournament_manager import TournamentManager
+
+MODES = ("serial", "thread", "process")
+RESULTS = [(1.0, 0.0), (0.0, 1.0), (0.5, 0.5)]
+
+
+def make_tournaments(manager, tournaments, players, engine, played):
+    for number in range(tournaments):
+        tournament = manager.create_tournament(
+            name=f"Benchmark {number}", location="Nowhere", start_date="01-01-2024", end_date="02-01-2024",
+            number_of_rounds=9, pairing_engine=engine,
+        )
+        for i in range(players):
+            tournament.add_player(Player(f"Player {i}", f"player{i}@example.com", f"BM{i:05d}", "01-01-1990"))
+        for _ in range(played):
+            new_round = tournament.advance_round()
+            tournament.record_results(
+                (match.player1, match.player2, *random.choice(RESULTS)) for match in new_round.matches
+            )
+        manager.save_tournament(tournament)
+
+
+def measure(mode, tournaments, players, engine, played, workers, seed):
+    with tempfile.TemporaryDirectory() as folder:
+        random.seed(seed)
+        manager = TournamentManager(folder)
+        make_tournaments(manager, tournaments, players, engine, played)
+
+        start = time.perf_counter()
+        if mode == "serial":
+            _, errors = manager.advance_all(workers=1)
+        else:
+            _, errors = manager.advance_all(workers=workers, executor=mode)
+        if errors:
+            raise RuntimeError(f"advance_all failed: {errors}")
+        return time.perf_counter() - start
+
+
+def run(tournaments, players, engine, played, workers, modes, seed):
+    times = {mode: measure(mode, tournaments, players, engine, played, workers, seed) for mode in modes}
+    serial = times.get("serial")
+    return {
+        "tournaments": tournaments,
+        "players": players,
+        "engine": engine,
+        "played_rounds": played,
+        "workers": workers,
+        "cpu_count": os.cpu_count(),
+        "seed": seed,
+        "python": platform.python_version(),
+        "modes": {
+            mode: {
+                "total_ms": round(elapsed * 1000, 3),
+                "speedup": round(serial / elapsed, 2) if serial else None,
+            }
+            for mode, elapsed in times.items()
+        },
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time advance_all with and without a pool, and report it as JSON.")
+    parser.add_argument("--tournaments", type=int, default=8, help="number of tournaments")
+    parser.add_argument("--players", type=int, default=1000, help="number of players per tournament")
+    parser.add_argument("--engine", default="weighted", choices=sorted(PAIRING_ENGINES), help="pairing engine")
+    parser.add_argument("--played", type=int, default=4, help="rounds played before the measured one")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="size of the pools")
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=MODES)
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument("--output", type=str, help="JSON file (default: standard output)")
+
+    args = parser.parse_args()
+    report = run(args.tournaments, args.players, args.engine, args.played, args.workers, args.modes, args.seed)
+    if args.output:
+        with open(args.output, "w") as fp:
+            json.dump(report, fp, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
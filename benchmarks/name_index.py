@@ -0,0 +1,98 @@
+"""
+Measures NameIndex (see models/name_index.py) on synthetic names.
+
+The index is filled with --names names made of random first and last names, then every query
+(from 1 to 5 characters, some matching many names, some none) is searched --repeat times with --limit.
+The report is a JSON document with the build time, the peak memory allocated while building
+and the median and worst time of each query length.
+
+Usage: python -m benchmarks.name_index --names 200000 --limit 20
+"""
+import argparse
+import json
+import platform
+import random
+import statistics
+import string
+import time
+import tracemalloc
+
+from models.name_index import NameIndex
+
+QUERIES = ["a", "e", "z", "ma", "an", "qx", "mar", "ann", "jea", "marti", "jean ", "zzzzz"]
+
+
+def make_names(count, seed):
+    rng = random.Random(seed)
+    syllables = ["ma", "ri", "an", "ne", "jea", "n", "pie", "rre", "lu", "cas", "to", "mas", "e", "li", "so", "phie"]
+
+    def word(parts):
+        return "".join(rng.choice(syllables) for _ in range(parts)).capitalize()
+
+    return [
+        " ".join([word(rng.randint(1, 3)) for _ in range(rng.randint(1, 2))] + [word(rng.randint(2, 4))])
+        + rng.choice(["", "", f"-{rng.choice(string.ascii_uppercase)}"])
+        for _ in range(count)
+    ]
+
+
+def build(names):
+    tracemalloc.start()
+    start = time.perf_counter()
+    index = NameIndex()
+    for key, name in enumerate(names):
+        index.add(key, name, key)
+    index.search("a", 1)   # builds the sorted lists
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return index, elapsed, peak
+
+
+def measure(index, query, limit, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        index.search(query, limit)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def run(names, limit, repeat, seed):
+    index, elapsed, peak = build(make_names(names, seed))
+    by_length = {}
+    for query in QUERIES:
+        by_length.setdefault(len(query), []).extend(measure(index, query, limit, repeat))
+    return {
+        "names": names,
+        "limit": limit,
+        "repeat": repeat,
+        "seed": seed,
+        "python": platform.python_version(),
+        "build_ms": round(elapsed * 1000, 3),
+        "build_peak_mb": round(peak / 2 ** 20, 1),
+        "query_length": {
+            length: {
+                "median_ms": round(statistics.median(times) * 1000, 3),
+                "max_ms": round(max(times) * 1000, 3),
+            }
+            for length, times in sorted(by_length.items())
+        },
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time NameIndex searches by query length, and report it as JSON.")
+    parser.add_argument("--names", type=int, default=200000, help="number of indexed names")
+    parser.add_argument("--limit", type=int, default=20, help="maximum number of results (0: no limit)")
+    parser.add_argument("--repeat", type=int, default=20, help="searches of each query")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument("--output", type=str, help="JSON file (default: standard output)")
+
+    args = parser.parse_args()
+    report = run(args.names, args.limit or None, args.repeat, args.seed)
+    if args.output:
+        with open(args.output, "w") as fp:
+            json.dump(report, fp, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
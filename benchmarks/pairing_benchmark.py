@@ -0,0 +1,82 @@
+"""
+Compares the pairing engines (see models/pairing.py) on synthetic tournaments.
+
+Every round, both engines pair the same standings: the script reports their run time and
+the number of rematches (and the number of pairs with a points difference).
+The round actually played uses the pairings of the first engine, with random results.
+
+Usage: python -m benchmarks.pairing_benchmark --players 2000 --rounds 9
+"""
+import argparse
+import random
+import time
+
+from models.match import Match
+from models.pairing import PAIRING_ENGINES
+from models.player import Player
+from models.round import Round
+from models.tournament import Tournament
+
+RESULTS = [(1.0, 0.0), (0.0, 1.0), (0.5, 0.5)]
+
+
+def make_tournament(players):
+    tournament = Tournament("Benchmark", "Nowhere", "01-01-2024", "02-01-2024", number_of_rounds=0)
+    for i in range(players):
+        tournament.add_player(Player(f"Player {i}", f"player{i}@example.com", f"BM{i:05d}", "01-01-1990"))
+    return tournament
+
+
+def measure(tournament, engine):
+    start = time.perf_counter()
+    pairings, _ = PAIRING_ENGINES[engine]().pair(tournament)
+    elapsed = time.perf_counter() - start
+
+    rematches = sum(tournament.has_played_against(p1, p2) for p1, p2 in pairings)
+    uneven = sum(tournament.get_player_points(p1) != tournament.get_player_points(p2) for p1, p2 in pairings)
+    return pairings, elapsed, rematches, uneven
+
+
+def run(players, rounds, engines, seed):
+    random.seed(seed)
+    tournament = make_tournament(players)
+    totals = {engine: [0.0, 0] for engine in engines}
+
+    print(f"{players} players, {rounds} rounds")
+    print(f"{'round':>5} " + " ".join(f"{engine + ' ms':>12} {'rematches':>9} {'uneven':>7}" for engine in engines))
+    for number in range(1, rounds + 1):
+        measures = {engine: measure(tournament, engine) for engine in engines}
+
+        columns = []
+        for engine in engines:
+            _, elapsed, rematches, uneven = measures[engine]
+            totals[engine][0] += elapsed
+            totals[engine][1] += rematches
+            columns.append(f"{elapsed * 1000:12.1f} {rematches:9d} {uneven:7d}")
+        print(f"{number:5d} " + " ".join(columns))
+
+        # Play the round with the first engine's pairings
+        pairings = measures[engines[0]][0]
+        new_round = Round(f"Round {number}")
+        for player1, player2 in pairings:
+            match = Match(player1, player2)
+            match.set_result(*random.choice(RESULTS))
+            tournament.add_points(player1, match.score1)
+            tournament.add_points(player2, match.score2)
+            new_round.add_match(match)
+        tournament.add_round(new_round)
+
+    print(f"{'total':>5} " + " ".join(
+        f"{totals[engine][0] * 1000:12.1f} {totals[engine][1]:9d} {'':>7}" for engine in engines
+    ))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the pairing engines.")
+    parser.add_argument("--players", type=int, default=1000, help="number of players")
+    parser.add_argument("--rounds", type=int, default=9, help="number of rounds")
+    parser.add_argument("--engines", nargs="+", default=["weighted", "greedy"], choices=sorted(PAIRING_ENGINES))
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+
+    args = parser.parse_args()
+    run(args.players, args.rounds, args.engines, args.seed)
@@ -0,0 +1,135 @@
+"""
+Simulates a tournament of N players x R rounds with random results, through the real
+Tournament/Round/Match code and TournamentManager.save_tournament (in a temporary folder).
+
+Every round is split in phases: generate_pairings, add_points (recording the results),
+serialize and save_tournament. The report is a JSON document with the time of each phase
+(per round and in total), the peak memory traced by tracemalloc and the number of rematches,
+so two runs (e.g. before and after a change) can be compared.
+
+Usage: python -m benchmarks.simulation --players 2000 --rounds 9 --output simulation.json
+"""
+import argparse
+import json
+import platform
+import random
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from models.match import Match
+from models.pairing import PAIRING_ENGINES
+from models.player import Player
+from models.round import Round
+from models.tournament import Tournament
+from models.tournament_manager import TournamentManager
+
+PHASES = ("generate_pairings", "add_points", "serialize", "save_tournament")
+RESULTS = [(1.0, 0.0), (0.0, 1.0), (0.5, 0.5)]
+
+
+class Recorder:
+    """Collects the time (and the traced memory peak) of each phase"""
+
+    def __init__(self, trace_memory):
+        self.trace_memory = trace_memory
+        self.times = {phase: [] for phase in PHASES}
+        self.peaks = {phase: 0 for phase in PHASES}
+
+    @contextmanager
+    def phase(self, name):
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        yield
+        self.times[name].append(time.perf_counter() - start)
+        if self.trace_memory:
+            self.peaks[name] = max(self.peaks[name], tracemalloc.get_traced_memory()[1])
+
+    def report(self):
+        return {
+            name: {
+                "total_ms": round(sum(times) * 1000, 3),
+                "max_ms": round(max(times, default=0) * 1000, 3),
+                "per_round_ms": [round(t * 1000, 3) for t in times],
+                "peak_memory_bytes": self.peaks[name] if self.trace_memory else None,
+            }
+            for name, times in self.times.items()
+        }
+
+
+def simulate(players, rounds, engine="greedy", seed=0, trace_memory=True):
+    random.seed(seed)
+    recorder = Recorder(trace_memory)
+    if trace_memory:
+        tracemalloc.start()
+
+    tournament = Tournament("Simulation", "Nowhere", "01-01-2024", "02-01-2024",
+                            number_of_rounds=rounds, pairing_engine=engine)
+    for i in range(players):
+        tournament.add_player(Player(f"Player {i}", f"player{i}@example.com", f"SM{i:05d}", "01-01-1990"))
+
+    rematches = []
+    with tempfile.TemporaryDirectory() as tournaments_dir:
+        manager = TournamentManager(tournaments_dir=tournaments_dir)
+        for number in range(1, rounds + 1):
+            with recorder.phase("generate_pairings"):
+                pairings = tournament.generate_pairings()
+            rematches.append(sum(tournament.has_played_against(p1, p2) for p1, p2 in pairings))
+
+            new_round = Round(f"Round {number}")
+            for player1, player2 in pairings:
+                new_round.add_match(Match(player1, player2))
+            tournament.add_round(new_round)
+            tournament.current_round = number
+
+            with recorder.phase("add_points"):
+                if tournament.bye_player is not None and tournament.awards_byes:
+                    tournament.award_bye(tournament.bye_player)
+                for match in new_round.matches:
+                    match.set_result(*random.choice(RESULTS))
+                    tournament.add_points(match.player1, match.score1)
+                    tournament.add_points(match.player2, match.score2)
+
+            with recorder.phase("serialize"):
+                tournament.serialize()
+
+            with recorder.phase("save_tournament"):
+                manager.save_tournament(tournament)
+
+    peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+    if trace_memory:
+        tracemalloc.stop()
+
+    return {
+        "players": players,
+        "rounds": rounds,
+        "engine": engine,
+        "seed": seed,
+        "python": platform.python_version(),
+        "trace_memory": trace_memory,
+        "phases": recorder.report(),
+        "peak_memory_bytes": peak,
+        "rematches": sum(rematches),
+        "rematches_per_round": rematches,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulate a tournament and report the time of each phase as JSON.")
+    parser.add_argument("--players", type=int, default=1000, help="number of players")
+    parser.add_argument("--rounds", type=int, default=9, help="number of rounds")
+    parser.add_argument("--engine", default="greedy", choices=sorted(PAIRING_ENGINES), help="pairing engine")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="do not trace memory allocations (tracemalloc slows everything down)")
+    parser.add_argument("--output", type=str, help="JSON file (default: standard output)")
+
+    args = parser.parse_args()
+    report = simulate(args.players, args.rounds, args.engine, args.seed, trace_memory=not args.no_memory)
+    if args.output:
+        with open(args.output, "w") as fp:
+            json.dump(report, fp, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
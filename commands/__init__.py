@@ -1,13 +1,21 @@
+from .advance_all import AdvanceAllCmd
 from .club_list import ClubListCmd
 from .create_club import ClubCreateCmd
 from .exit import ExitCmd
+from .generate_report import GenerateReportCmd
+from .import_results import ImportResultsCmd
 from .noop import NoopCmd
+from .register_player import RegisterPlayerCmd
 from .update_player import PlayerUpdateCmd
 
 __all__ = [
+    "AdvanceAllCmd",
     "ClubCreateCmd",
     "ExitCmd",
+    "GenerateReportCmd",
+    "ImportResultsCmd",
     "ClubListCmd",
     "NoopCmd",
     "PlayerUpdateCmd",
+    "RegisterPlayerCmd",
 ]
@@ -0,0 +1,22 @@
+from commands.context import Context
+from models.tournament_manager import get_tournament_manager
+
+from .base import BaseCommand
+
+
+class AdvanceAllCmd(BaseCommand):
+    """Command to create the next round of every ready tournament at once"""
+
+    def execute(self):
+        manager = get_tournament_manager()
+        advanced, errors = manager.advance_all()
+
+        for tournament in advanced:
+            status = " (completed)" if tournament.completed else ""
+            print(f"{tournament.name}: round {tournament.current_round} created{status}")
+        for name, error in errors.items():
+            print(f"{name}: could not advance the round: {error}")
+        if not advanced and not errors:
+            print("No tournament is ready for its next round.")
+
+        return Context("tournament-list", tournaments=manager.get_all_tournaments())
@@ -1,5 +1,5 @@
 from commands.context import Context
-from models import ClubManager
+from models import get_club_manager
 
 from .base import BaseCommand
 
@@ -11,7 +11,7 @@ class ClubCreateCmd(BaseCommand):
         self.name = name
 
     def execute(self):
-        """Uses a ClubManager instance to create the club and add it to the list of managed clubs"""
-        cm = ClubManager()
+        """Uses the shared ClubManager instance to create the club and add it to the list of managed clubs"""
+        cm = get_club_manager()
         club = cm.create(self.name)
         return Context("club-view", club=club)
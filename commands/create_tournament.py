@@ -1,7 +1,8 @@
 from commands.base import BaseCommand
 from commands.context import Context
+from models.pairing import PAIRING_ENGINES
 from models.tournament import Tournament
-from models import ClubManager
+from models import get_club_manager
 
 class CreateTournament(BaseCommand):
     def __init__(self):
@@ -15,6 +16,14 @@ class CreateTournament(BaseCommand):
         start_date = input("Start date (dd-mm-yyyy): ")
         end_date = input("End date (dd-mm-yyyy): ")
         time_control = input("Time control (bullet/blitz/rapid): ") or "rapid"
+        pairing_engine = input("Pairing engine (greedy/weighted): ") or "greedy"
+        if pairing_engine not in PAIRING_ENGINES:
+            print(f"Unknown pairing engine '{pairing_engine}', using greedy pairing.")
+            pairing_engine = "greedy"
+        seeding = input("Round 1 seeding (random/rating): ") or "random"
+        if seeding not in Tournament.SEEDINGS:
+            print(f"Unknown seeding '{seeding}', using random seeding.")
+            seeding = "random"
 
         tournament = Tournament(
             name=name,
@@ -22,23 +31,27 @@ class CreateTournament(BaseCommand):
             start_date=start_date,
             end_date=end_date,
             time_control=time_control,
+            pairing_engine=pairing_engine,
+            seeding=seeding,
         )
 
         # Persist via TournamentManager if available
         try:
-            from models.tournament_manager import TournamentManager  # type: ignore
-            TournamentManager().create_tournament(
+            from models.tournament_manager import get_tournament_manager  # type: ignore
+            get_tournament_manager().create_tournament(
                 name=name,
                 location=location,
                 start_date=start_date,
                 end_date=end_date,
                 time_control=time_control,
+                pairing_engine=pairing_engine,
+                seeding=seeding,
             )
         except Exception:
             pass
 
         print(f"\n✅ Tournament '{name}' created successfully!\n")
         
-        cm = ClubManager()
+        cm = get_club_manager()
         
         return Context("main-menu", clubs=cm.clubs)
\ No newline at end of file
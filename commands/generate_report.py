@@ -0,0 +1,38 @@
+from commands.context import Context
+from models.report_cache import ReportCache
+from models.reports import REPORTS, TOURNAMENT_REPORTS
+
+from .base import BaseCommand
+
+
+class GenerateReportCmd(BaseCommand):
+    """
+    Command to write a report (see models.reports) in the reports folder, as CSV, JSON or HTML.
+    The report is not rendered again if its club/tournament files did not change (see models.report_cache).
+    """
+
+    def __init__(self, report, fmt, tournament=None):
+        self.report = report
+        self.fmt = fmt
+        self.tournament = tournament
+
+    def execute(self):
+        """Reports of a tournament go back to its report screen, the other reports to the main menu"""
+        if self.tournament is None:
+            report = REPORTS[self.report]()
+            context = Context("main-menu", skip_auto_redirect=True)
+        else:
+            report = TOURNAMENT_REPORTS[self.report](self.tournament)
+            context = Context("tournament-report", tournament=self.tournament)
+
+        try:
+            filepath, cached = ReportCache().write(report, self.fmt)
+        except (OSError, ImportError) as e:
+            print(f"Could not generate the report: {e}")
+        else:
+            if cached:
+                print(f"Report up to date (no data changed): {filepath}")
+            else:
+                print(f"Report written to {filepath}")
+
+        return context
@@ -0,0 +1,25 @@
+from commands.context import Context
+from models.results_file import read_results
+from models.tournament_manager import get_tournament_manager
+
+from .base import BaseCommand
+
+
+class ImportResultsCmd(BaseCommand):
+    """Command to record the results of the current round from a CSV/JSONL file"""
+
+    def __init__(self, tournament, filepath):
+        self.tournament = tournament
+        self.filepath = filepath
+
+    def execute(self):
+        """All the results are checked before any is applied, and the tournament is saved once"""
+        try:
+            count = self.tournament.record_results(read_results(self.filepath))
+        except (OSError, ValueError) as e:
+            print(f"No result imported: {e}")
+        else:
+            get_tournament_manager().save_tournament(self.tournament)
+            print(f"{count} results imported from {self.filepath}")
+
+        return Context("tournament-view", tournament=self.tournament)
@@ -0,0 +1,31 @@
+from commands.context import Context
+from models.player_registry import get_player_registry
+from models.tournament_manager import get_tournament_manager
+
+from .base import BaseCommand
+
+
+class RegisterPlayerCmd(BaseCommand):
+    """Command to register a player (looked up by chess_id in the player registry) to a tournament"""
+
+    def __init__(self, tournament, chess_id):
+        self.tournament = tournament
+        self.chess_id = chess_id
+
+    def execute(self):
+        player = get_player_registry().find_by_chess_id(self.chess_id)
+        if player is None:
+            print(f"Player with Chess ID '{self.chess_id}' not found in any club.")
+        elif player in self.tournament.players:
+            print(f"{player.name} is already registered for this tournament.")
+        else:
+            try:
+                self.tournament.add_player(player)
+                get_tournament_manager().save_tournament(self.tournament)
+            except Exception as e:
+                print(f"❌ Could not register player: {e}")
+            else:
+                print(f"✅ {player.name} ({player.chess_id}) successfully registered!")
+        input("Press Enter to continue")
+
+        return Context("tournament-view", tournament=self.tournament)
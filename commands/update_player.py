@@ -1,4 +1,6 @@
 from commands.context import Context
+from models.player_registry import get_player_registry
+from models.tournament_manager import get_tournament_manager
 
 from .base import BaseCommand
 
@@ -13,6 +15,21 @@ class PlayerUpdateCmd(BaseCommand):
 
     def execute(self):
         """The command uses the update_player method from the Club model"""
+        # A chess_id identifies a player across all clubs: it is looked up in the registry
+        chess_id = self.data.get("chess_id")
+        owner = get_player_registry().find_by_chess_id(chess_id) if chess_id else None
+        if owner is not None and owner is not self.player:
+            print(f"Chess ID {chess_id} is already used by {owner.name}!")
+            return Context("club-view", club=self.club)
+
+        # Tournaments, ratings and statistics refer to players by chess_id: it cannot change once a player
+        # entered a tournament
+        if self.player and chess_id and chess_id != self.player.chess_id:
+            tournaments = get_tournament_manager().get_player_tournaments(self.player.chess_id)
+            if tournaments:
+                print(f"Chess ID of {self.player.name} cannot change: registered in {len(tournaments)} tournament(s)!")
+                return Context("player-view", club=self.club, player=self.player)
+
         if self.player:
             player = self.club.update_player(self.player, **self.data)
         else:
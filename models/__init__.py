@@ -1,5 +1,6 @@
 from .club import ChessClub
-from .club_manager import ClubManager
+from .club_manager import ClubManager, get_club_manager
 from .player import Player
+from .player_registry import PlayerRegistry, get_player_registry
 
-__all__ = ["Player", "ChessClub", "ClubManager"]
+__all__ = ["Player", "ChessClub", "ClubManager", "get_club_manager", "PlayerRegistry", "get_player_registry"]
@@ -0,0 +1,211 @@
+# Key Points
+# Career statistics of the players (by chess_id), across tournaments: games, wins, draws, losses,
+# points, tournaments played and performance rating
+# Updated incrementally when a tournament is saved: from its result_recorded events (a result entered
+# again replaces the previous one), and once per tournament (by tournament uid) when it is finished
+# Kept in a NumPy array with a chess_id -> row index, so the stats of a player are read in O(1)
+# Saved in data/career_stats.json; the updates are appended to its journal and compacted every COMPACT_EVERY records
+# The file is built explicitly from the tournament files (python tournament_tool.py career-stats), then kept up
+# to date when a tournament is saved
+
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+from .journal import Journal, write_json_atomic
+from .player import chess_id_of
+from .round import round_rows
+
+
+class CareerStats:
+    """
+    Career statistics of the players.
+    The performance rating of a player is the average rating of the opponents (when the games were recorded)
+    plus 400 x (wins - losses) / games.
+    """
+
+    FIELDS = ("games", "wins", "draws", "losses", "points", "tournaments", "opponent_ratings")
+    GAMES, WINS, DRAWS, LOSSES, POINTS, TOURNAMENTS, OPPONENT_RATINGS = range(len(FIELDS))
+    DEFAULT_RATING = 1500.0
+    VERSION = 2
+    # Number of journal records after which they are compacted into the JSON file
+    COMPACT_EVERY = 1000
+
+    def __init__(self, filepath=None, ratings=None):
+        self.filepath = filepath
+        self.ratings = ratings  # RatingEngine giving the opponents' ratings (DEFAULT_RATING without it)
+        self.finished = set()   # uids of the tournaments counted
+        self.journal_seq = 0
+        self.journal_records = 0
+        self._index = {}        # chess_id -> row
+        self._chess_ids = []
+        self._values = np.zeros((0, len(self.FIELDS)))
+
+    def __len__(self):
+        return len(self._chess_ids)
+
+    def __contains__(self, player):
+        return chess_id_of(player) in self._index
+
+    def _row(self, chess_id):
+        """Row of a chess_id, added if needed (the array grows by doubling: read self._values after calling it)"""
+        row = self._index.get(chess_id)
+        if row is None:
+            row = self._index[chess_id] = len(self._chess_ids)
+            self._chess_ids.append(chess_id)
+            if row >= len(self._values):
+                extra = max(len(self._values), 64)
+                self._values = np.concatenate([self._values, np.zeros((extra, len(self.FIELDS)))])
+        return row
+
+    def stats(self, player):
+        """Career statistics of a player (Player object or chess_id) as a dict, None if the player never played"""
+        row = self._index.get(chess_id_of(player))
+        if row is None:
+            return None
+        games, wins, draws, losses, points, tournaments, opponent_ratings = self._values[row].tolist()
+        return {
+            "games": int(games),
+            "wins": int(wins),
+            "draws": int(draws),
+            "losses": int(losses),
+            "points": points,
+            "tournaments": int(tournaments),
+            "performance": round(opponent_ratings / games + 400.0 * (wins - losses) / games) if games else None,
+        }
+
+    def _rating(self, chess_id):
+        return self.DEFAULT_RATING if self.ratings is None else self.ratings.rating(chess_id)
+
+    def _add_game(self, chess_id, score, opponent_score, opponent_rating, sign):
+        row = self._row(chess_id)
+        values = self._values[row]
+        values[self.GAMES] += sign
+        if score > opponent_score:
+            values[self.WINS] += sign
+        elif score < opponent_score:
+            values[self.LOSSES] += sign
+        else:
+            values[self.DRAWS] += sign
+        values[self.POINTS] += sign * score
+        values[self.OPPONENT_RATINGS] += sign * opponent_rating
+
+    def _apply(self, record):
+        """Applies a journal record: a result (replacing the previous one), or a finished tournament"""
+        if record["op"] == "result":
+            player1, player2 = record["player1"], record["player2"]
+            rating1, rating2 = record["ratings"]
+            previous1, previous2 = record["previous"]
+            if previous1 + previous2 > 0:
+                self._add_game(player1, previous1, previous2, rating2, -1)
+                self._add_game(player2, previous2, previous1, rating1, -1)
+            if record["score1"] + record["score2"] > 0:
+                self._add_game(player1, record["score1"], record["score2"], rating2, 1)
+                self._add_game(player2, record["score2"], record["score1"], rating1, 1)
+        elif record["op"] == "tournament" and record["uid"] not in self.finished:
+            self.finished.add(record["uid"])
+            for chess_id in record["players"]:
+                row = self._row(chess_id)
+                self._values[row, self.TOURNAMENTS] += 1
+
+    def _result_record(self, player1, player2, score1, score2, previous=(0, 0)):
+        return {
+            "op": "result", "player1": player1, "player2": player2, "score1": score1, "score2": score2,
+            "previous": list(previous), "ratings": [self._rating(player1), self._rating(player2)],
+        }
+
+    def update(self, tournament):
+        """
+        Applies the results recorded since the tournament was last saved (its pending events), and counts
+        the tournament for its players once it is finished. The changes are appended to the journal.
+        Returns the number of changes.
+        """
+        records = [
+            self._result_record(event["player1"], event["player2"], event["score1"], event["score2"],
+                                event.get("previous", (0, 0)))
+            for event in tournament.pending_events if event["op"] == "result_recorded"
+        ]
+        if tournament.uid not in self.finished and tournament.is_finished():
+            records.append({
+                "op": "tournament", "uid": tournament.uid,
+                "players": [chess_id_of(player) for player in tournament.players],
+            })
+
+        for record in records:
+            self._apply(record)
+        if records and self.filepath is not None:
+            # The journal is only read with the file: the first changes are written to the file
+            if self.journal_records + len(records) > self.COMPACT_EVERY or not os.path.exists(self.filepath):
+                self.save()
+            else:
+                Journal(self.filepath).extend(self.journal_seq + 1, records)
+                self.journal_seq += len(records)
+                self.journal_records += len(records)
+        return len(records)
+
+    def build(self, tournaments):
+        """Computes the statistics again from all the games of the tournaments"""
+        self.__init__(self.filepath, self.ratings)
+        for tournament in tournaments:
+            for position, round_obj in enumerate(tournament.rounds):
+                for player1, player2, score1, score2 in round_rows(round_obj, position)[3]:
+                    self._apply(self._result_record(player1, player2, score1, score2))
+            if tournament.is_finished():
+                self._apply({
+                    "op": "tournament", "uid": tournament.uid,
+                    "players": [chess_id_of(player) for player in tournament.players],
+                })
+
+    def load(self):
+        with open(self.filepath) as fp:
+            data = json.load(fp)
+        if data.get("version") != self.VERSION:
+            raise ValueError(f"{self.filepath} was written by a previous version, build it again")
+        self.__init__(self.filepath, self.ratings)
+        self.finished = set(data.get("finished", []))
+        self.journal_seq = data.get("journal_seq", 0)
+        players = data.get("players", {})
+        for chess_id, values in players.items():
+            row = self._row(chess_id)
+            self._values[row] = values
+        for record in Journal(self.filepath).records(after=self.journal_seq):
+            self._apply(record)
+            self.journal_seq = record["seq"]
+            self.journal_records += 1
+
+    def save(self):
+        """Writes all the statistics (the journal is not needed anymore)"""
+        count = len(self._chess_ids)
+        write_json_atomic(self.filepath, {
+            "version": self.VERSION,
+            "journal_seq": self.journal_seq,
+            "finished": sorted(self.finished),
+            "players": dict(zip(self._chess_ids, self._values[:count].tolist())),
+        })
+        Journal(self.filepath).clear()
+        self.journal_records = 0
+
+
+_shared_stats = {}
+
+
+def get_career_stats(filepath="data/career_stats.json", ratings=None):
+    """
+    Returns the CareerStats shared by commands and screens, loaded from filepath.
+    Without the file (or with a file of a previous version), the statistics start empty: the statistics of the
+    existing tournaments are built explicitly with `python tournament_tool.py career-stats`.
+    """
+    key = Path(filepath).resolve()
+    stats = _shared_stats.get(key)
+    if stats is None:
+        stats = _shared_stats[key] = CareerStats(filepath, ratings)
+        if os.path.exists(filepath):
+            try:
+                stats.load()
+            except ValueError as e:
+                print(f"Warning: {e} with python tournament_tool.py career-stats")
+    elif ratings is not None:
+        stats.ratings = ratings
+    return stats
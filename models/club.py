@@ -1,6 +1,68 @@
 import json
+import os
+from contextlib import contextmanager
 
+from .journal import Journal, write_json_atomic
 from .player import Player
+from .player_registry import registry
+
+
+def club_file_signature(filepath):
+    """Modification time and size of a club file and of its journal: they change whenever the club is written"""
+    signature = []
+    for path in (filepath, Journal(filepath).filepath):
+        try:
+            stat = os.stat(path)
+            signature.append((stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            signature.append(None)
+    return tuple(signature)
+
+
+def read_club_file(filepath):
+    """
+    Reads a club JSON file and replays its journal.
+    Returns the club name, its players and the journal state as a dictionary.
+    This is a module-level function so that ClubManager can run it in worker processes.
+    """
+    # Taken before reading, so that a write made while reading is noticed on the next refresh
+    signature = club_file_signature(filepath)
+    with open(filepath) as fp:
+        data = json.load(fp)
+
+    players = [Player(**player_dict) for player_dict in data["players"]]
+    journal_seq = data.get("journal_seq", 0)
+    pending_records = 0
+
+    # Apply the changes that were not compacted yet
+    for record in Journal(filepath).records(after=journal_seq):
+        if record["op"] == "create":
+            players.append(Player(**record["player"]))
+        elif record["op"] == "update":
+            player = players[record["index"]]
+            for key, value in record["data"].items():
+                setattr(player, key, value)
+        journal_seq = record["seq"]
+        pending_records += 1
+
+    return {
+        "name": data["name"],
+        "players": players,
+        "journal_seq": journal_seq,
+        "pending_records": pending_records,
+        "signature": signature,
+    }
+
+
+def read_club_header(filepath):
+    """
+    Reads only the name of a club. The whole file is parsed, so that an invalid file is reported
+    when the clubs are listed, but no Player is created (see read_club_file).
+    """
+    signature = club_file_signature(filepath)
+    with open(filepath) as fp:
+        data = json.load(fp)
+    return {"name": data["name"], "signature": signature}
 
 
 class ChessClub:
@@ -9,55 +71,250 @@ class ChessClub:
 
     Data is loaded from a JSON file (provided as argument).
     The class creates Player instances based on JSON data.
+
+    In journaled mode, each change is appended to a journal file next to the JSON file
+    instead of rewriting the whole file. The journal is compacted back into the JSON file
+    every COMPACT_EVERY records (or when save() is called), and replayed when loading.
+
+    Changes made inside a `with club.batch():` block are persisted with a single write.
+
+    In lazy mode, only the club name is read when the club is created: the players are
+    loaded the first time they are accessed.
+
+    With a storage backend (see models.storage), the club is identified by its club_id
+    and read from / written to the storage instead of a JSON file.
     """
 
-    def __init__(self, filepath=None, name=None):
+    # Number of journal records after which they are compacted into the JSON file
+    COMPACT_EVERY = 500
+
+    def __init__(self, filepath=None, name=None, journaled=False, loaded=None, lazy=False,
+                 storage=None, club_id=None):
         """The constructor works in two ways:
         - if the filepath is provided, it loads data from JSON
+          (or uses `loaded`, the result of read_club_file()/read_club_header() if the file was already read)
         - if it is not but a name is provided, it creates a new club (and a new JSON file)
+        With a storage, the club `club_id` is loaded from it (on first access in lazy mode).
         """
 
         self.name = name
         self.filepath = filepath
+        self.storage = storage
+        self.club_id = club_id
         self.players = []
+        self.journaled = journaled
+        # Sequence number of the last journal record applied, and records not compacted yet
+        self.journal_seq = 0
+        self._pending_records = 0
+        # Nesting level of batch() blocks, and whether a change was made in the current batch
+        self._batch_depth = 0
+        self._batch_dirty = False
+        # Cache of the players' positions in the list, see _index_of()
+        self._positions = {}
+        # State of the files when they were last read or written (see ClubManager.refresh)
+        self.file_signature = None
 
-        if filepath and not name:
+        if storage is not None:
+            self._players = None
+            if not lazy:
+                self._load()
+        elif filepath and not name:
             # Load data from the JSON file
-            with open(filepath) as fp:
-                data = json.load(fp)
-                self.name = data["name"]
-                self.players = [
-                    Player(**player_dict) for player_dict in data["players"]
-                ]
+            if loaded is None:
+                loaded = read_club_header(filepath) if lazy else read_club_file(filepath)
+            self.name = loaded["name"]
+            self.file_signature = loaded["signature"]
+            if "players" in loaded:
+                self._load(loaded)
+            else:
+                # Players are loaded on first access
+                self._players = None
         elif not filepath:
             # We did not have a file, so we are going to create it by running the save method
             self.save()
 
+    @property
+    def players(self):
+        if self._players is None:
+            self._load()
+        return self._players
+
+    @players.setter
+    def players(self, value):
+        self._players = value
+
+    @property
+    def is_loaded(self):
+        """False while the players of a lazy club have not been loaded"""
+        return self._players is not None
+
+    def _load(self, loaded=None):
+        """Sets the players (and journal state) from read_club_file()"""
+        if loaded is None:
+            if self.storage is not None:
+                loaded = self.storage.read_club(self.club_id)
+            else:
+                loaded = read_club_file(self.filepath)
+        self._players = loaded["players"]
+        self.journal_seq = loaded["journal_seq"]
+        self._pending_records = loaded["pending_records"]
+        self.file_signature = loaded["signature"]
+        registry.index_club(self)
+
+    @property
+    def journal(self):
+        return Journal(self.filepath)
+
+    def _record(self, op, **record):
+        """Persists a change: appended to the journal in journaled mode, full save otherwise"""
+        if self._batch_depth:
+            # The whole batch is saved at once when it ends
+            self._batch_dirty = True
+            return
+
+        if self.storage is not None:
+            self.file_signature = self.storage.record_change(self, op, record)
+            return
+
+        if not self.journaled:
+            self.save()
+            return
+
+        self.journal_seq += 1
+        self.journal.append(self.journal_seq, dict(record, op=op))
+        self._pending_records += 1
+        if self._pending_records >= self.COMPACT_EVERY:
+            self.save()
+        else:
+            self.file_signature = club_file_signature(self.filepath)
+
     def save(self):
         """Serializes the players and saves the club info to the JSON file"""
 
-        with open(self.filepath, "w") as fp:
-            json.dump(
-                {"name": self.name, "players": [p.serialize() for p in self.players]},
-                fp,
-            )
+        if self.storage is not None:
+            self.file_signature = self.storage.save_club(self)
+            return
+
+        data = {"name": self.name, "players": [p.serialize() for p in self.players]}
+        if self.journal_seq:
+            data["journal_seq"] = self.journal_seq
+        write_json_atomic(self.filepath, data)
+
+        # Everything is in the JSON file now: the journal can go
+        self.journal.clear()
+        self._pending_records = 0
+        self.file_signature = club_file_signature(self.filepath)
+
+    def compact(self):
+        """Merges the journal into the JSON file"""
+        if self._pending_records:
+            self.save()
+
+    @contextmanager
+    def batch(self):
+        """
+        Groups several changes into a single write, done when the block exits.
+        If an exception is raised inside the block, the players are restored to their
+        previous state and nothing is written.
+        """
+        if self._batch_depth:
+            # Nested batch: the outermost one persists (or rolls back) everything
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+            return
+
+        saved_players = list(self.players)
+        saved_states = [p.serialize() for p in saved_players]
+        self._batch_depth = 1
+        self._batch_dirty = False
+        try:
+            yield self
+        except BaseException:
+            self._rollback(saved_players, saved_states)
+            raise
+        finally:
+            self._batch_depth = 0
+
+        if self._batch_dirty:
+            self._batch_dirty = False
+            self.save()
+
+    def _rollback(self, players, states):
+        """Restores the players (and their attributes) saved when a batch started"""
+        for player in self.players:
+            registry.remove(player)
+
+        self.players = players
+        for player, state in zip(players, states):
+            for key, value in state.items():
+                setattr(player, key, value)
+        registry.index_club(self)
+        self._batch_dirty = False
+
+    def bulk_create_players(self, players_data):
+        """
+        Creates many players (from dictionaries of Player arguments) with a single write.
+        All the players are validated first: if one is invalid or uses a chess_id already
+        in the club, a ValueError is raised and no player is added.
+        """
+        new_players = [Player(**player_dict) for player_dict in players_data]
+
+        known_ids = {p.chess_id for p in self.players}
+        for player in new_players:
+            if player.chess_id in known_ids:
+                raise ValueError(f"Chess ID {player.chess_id} is already used in club {self.name}!")
+            known_ids.add(player.chess_id)
+
+        with self.batch():
+            self.players.extend(new_players)
+            for player in new_players:
+                registry.add(player, self)
+            self._batch_dirty = True
+        return new_players
 
     def create_player(self, **kwargs):
         """Utility method to create a new player instance and add it to the club"""
 
         player = Player(**kwargs)
         self.players.append(player)
-        self.save()
+        registry.add(player, self)
+        self._record("create", player=player.serialize())
         return player
 
     def update_player(self, player, **kwargs):
         """Utility method to update a player instance based on arguments provided"""
 
-        if player not in self.players:
+        idx = self._index_of(player)
+        if idx is None:
             raise RuntimeError(f"Player {player} not in club {self.name}!")
 
-        for key, value in kwargs.items():
-            setattr(player, key, value)
+        # The chess_id or email may change: drop the old index entries first, and index the player
+        # again even if a value is invalid (the player is then restored to its previous state)
+        previous = player.serialize()
+        registry.remove(player)
+        try:
+            for key, value in kwargs.items():
+                setattr(player, key, value)
+        except BaseException:
+            for key, value in previous.items():
+                setattr(player, key, value)
+            raise
+        finally:
+            registry.add(player, self)
 
-        self.save()
+        self._record("update", index=idx, data=kwargs)
         return player
+
+    def _index_of(self, player):
+        """Position of a player in the list (cached, so updating many players is not quadratic)"""
+        idx = self._positions.get(id(player))
+        if idx is None or idx >= len(self.players) or self.players[idx] is not player:
+            self._positions = {id(p): i for i, p in enumerate(self.players)}
+            idx = self._positions.get(id(player))
+
+        if idx is None and player in self.players:
+            idx = self.players.index(player)
+        return idx
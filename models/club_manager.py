@@ -1,25 +1,225 @@
 import json
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 
-from .club import ChessClub
+from .club import ChessClub, club_file_signature, read_club_file, read_club_header
+from .journal import write_json_atomic
+from .player_registry import registry
+
+# Names of the club files checked in lazy mode, with their signature (the file name does not end with .json)
+HEADERS_FILENAME = ".index"
+
+
+def _read_club_file_or_error(filepath):
+    """Reads a club file, returning the JSON error instead of raising it (for the worker pools)"""
+    try:
+        return read_club_file(filepath)
+    except json.JSONDecodeError as error:
+        return error
+
+
+def _read_club_header_or_error(filepath):
+    try:
+        return read_club_header(filepath)
+    except json.JSONDecodeError as error:
+        return error
+
+
+def _jsonable(signature):
+    """A club file signature as it is stored in JSON (lists instead of tuples)"""
+    return [None if part is None else list(part) for part in signature]
 
 
 class ClubManager:
-    def __init__(self, data_folder="data/clubs"):
+    """
+    Loads every club of the data folder.
+
+    Club files are read concurrently by a pool of `workers` threads (or processes, with
+    executor="process"), and the clubs are kept in file name order.
+    refresh() only re-reads the files that changed since they were loaded.
+
+    In lazy mode, only the club names are read: the players of a club are loaded when
+    they are first accessed, or for every club at once with load_players().
+    A club file is still parsed entirely when it is new or changed, so that invalid files are reported
+    at load time; the names of the valid files are kept in a sidecar index (HEADERS_FILENAME) with
+    their signature, so the files that did not change are not read again on the next start.
+
+    With a storage backend (see models.storage), clubs are read from the storage instead of data_folder.
+    """
+
+    EXECUTORS = {"thread": ThreadPoolExecutor, "process": ProcessPoolExecutor}
+
+    def __init__(self, data_folder="data/clubs", journaled=False, workers=None, executor="thread", lazy=False,
+                 storage=None):
         datadir = Path(data_folder)
         self.data_folder = datadir
+        # In journaled mode, clubs append their changes to a journal instead of rewriting their file
+        self.journaled = journaled
+        self.workers = workers
+        self.executor = executor
+        self.lazy = lazy
+        self.storage = storage
         self.clubs = []
-        for filepath in datadir.iterdir():
-            if filepath.is_file() and filepath.suffix == ".json":
-                try:
-                    self.clubs.append(ChessClub(filepath))
-                except json.JSONDecodeError:
-                    print(filepath, "is invalid JSON file.")
+        self._headers = self._read_headers() if lazy and storage is None else {}
+        self.refresh()
+
+    def _list_files(self):
+        return sorted(
+            filepath for filepath in self.data_folder.iterdir()
+            if filepath.is_file() and filepath.suffix == ".json"
+        )
+
+    def _read_files(self, filepaths, reader=_read_club_file_or_error):
+        """Reads the club files, in the same order as filepaths"""
+        if self.workers == 1 or len(filepaths) < 2:
+            return [reader(filepath) for filepath in filepaths]
+
+        with self.EXECUTORS[self.executor](max_workers=self.workers) as pool:
+            return list(pool.map(reader, filepaths))
+
+    def refresh(self):
+        """
+        Synchronizes the clubs with the data folder: a stat() per file, and only the files
+        that are new or whose modification time/size changed are read again.
+        """
+        if self.storage is not None:
+            self._refresh_from_storage()
+            return
+
+        known = {Path(club.filepath): club for club in self.clubs}
+        filepaths = self._list_files()
+        signatures = {filepath: club_file_signature(filepath) for filepath in filepaths}
+        changed = [
+            filepath for filepath in filepaths
+            if filepath not in known or known[filepath].file_signature != signatures[filepath]
+        ]
+        loaded_files = {}
+        if self.lazy:
+            # Files checked (by this or an earlier run) that did not change since
+            for filepath in changed:
+                header = self._headers.get(filepath.name)
+                if header is not None and header["signature"] == _jsonable(signatures[filepath]):
+                    loaded_files[filepath] = {"name": header["name"], "signature": signatures[filepath]}
+            changed = [filepath for filepath in changed if filepath not in loaded_files]
+        reader = _read_club_header_or_error if self.lazy else _read_club_file_or_error
+        loaded_files.update(zip(changed, self._read_files(changed, reader)))
+
+        clubs = []
+        for filepath in filepaths:
+            if filepath not in loaded_files:
+                clubs.append(known.pop(filepath))
+                continue
+
+            loaded = loaded_files[filepath]
+            if isinstance(loaded, json.JSONDecodeError):
+                print(filepath, "is invalid JSON file.")
+                continue
+            # The club instance is replaced: its old players must leave the registry
+            if filepath in known:
+                self._unregister(known.pop(filepath))
+            clubs.append(ChessClub(filepath, journaled=self.journaled, loaded=loaded, lazy=self.lazy))
+
+        # Clubs whose file was deleted (or became invalid)
+        for club in known.values():
+            self._unregister(club)
+        self.clubs = clubs
+        if self.lazy:
+            self._write_headers()
+
+    def _read_headers(self):
+        try:
+            with open(self.data_folder / HEADERS_FILENAME) as fp:
+                return json.load(fp)
+        except (FileNotFoundError, json.JSONDecodeError):
+            # Missing or invalid: every club file is checked again
+            return {}
+
+    def _write_headers(self):
+        """Records the name and signature of the clubs (only when they changed)"""
+        headers = {
+            Path(club.filepath).name: {"name": club.name, "signature": _jsonable(club.file_signature)}
+            for club in self.clubs
+        }
+        if headers != self._headers:
+            self._headers = headers
+            try:
+                write_json_atomic(self.data_folder / HEADERS_FILENAME, headers)
+            except OSError as e:
+                print(f"Warning: Could not write the club index: {e}")
+
+    def _refresh_from_storage(self):
+        """Same as refresh(), using the version number of each club in the storage"""
+        known = {club.club_id: club for club in self.clubs}
+        clubs = []
+        for club_id, (name, version) in self.storage.club_versions().items():
+            club = known.pop(club_id, None)
+            if club is not None and club.file_signature != version:
+                self._unregister(club)
+                club = None
+            if club is None:
+                club = ChessClub(name=name, lazy=self.lazy, storage=self.storage, club_id=club_id)
+                club.file_signature = version
+            clubs.append(club)
+
+        for club in known.values():
+            self._unregister(club)
+        self.clubs = clubs
+
+    def _unregister(self, club):
+        # A lazy club that was never loaded has no player in the registry
+        if club.is_loaded:
+            registry.remove_club(club)
+
+    def load_players(self):
+        """Loads the players of every club that was not loaded yet (reading the files concurrently)"""
+        pending = [club for club in self.clubs if not club.is_loaded]
+        if self.storage is not None:
+            for club in pending:
+                club._load()
+            return
+
+        for club, loaded in zip(pending, self._read_files([club.filepath for club in pending])):
+            if isinstance(loaded, json.JSONDecodeError):
+                print(club.filepath, "is invalid JSON file.")
+                self.clubs.remove(club)
+            else:
+                club._load(loaded)
 
     def create(self, name):
+        if self.storage is not None:
+            club = ChessClub(name=name, storage=self.storage, club_id=self.storage.create_club(name))
+            self.clubs.append(club)
+            return club
+
         filepath = self.data_folder / (name.replace(" ", "") + ".json")
-        club = ChessClub(name=name, filepath=filepath)
+        club = ChessClub(name=name, filepath=filepath, journaled=self.journaled)
         club.save()
 
         self.clubs.append(club)
         return club
+
+
+# Managers shared by the whole application, by data folder
+_shared_managers = {}
+
+
+def get_club_manager(data_folder="data/clubs", refresh=True, **kwargs):
+    """
+    Returns the ClubManager shared by commands and screens for this data folder.
+    It is created on the first call (in lazy and journaled mode unless specified), and refreshed on the next ones
+    (unless refresh is False). Settings given on a next call must be the ones of the shared manager.
+    """
+    key = Path(data_folder).resolve()
+    manager = _shared_managers.get(key)
+    if manager is None:
+        kwargs.setdefault("lazy", True)
+        kwargs.setdefault("journaled", True)
+        manager = _shared_managers[key] = ClubManager(data_folder, **kwargs)
+        return manager
+
+    mismatched = sorted(name for name, value in kwargs.items() if getattr(manager, name) != value)
+    if mismatched:
+        raise ValueError(f"The shared ClubManager of {data_folder} has other settings: {', '.join(mismatched)}")
+    if refresh:
+        manager.refresh()
+    return manager
@@ -0,0 +1,105 @@
+import json
+import os
+from pathlib import Path
+
+
+class Journal:
+    """
+    Append-only log of JSON records, one record per line.
+
+    A journal sits next to a JSON snapshot file: each change is appended as a small
+    record, and the records are replayed on top of the snapshot when loading it.
+    Every record carries a sequence number ("seq"), so a snapshot can tell which
+    records it already contains.
+    """
+
+    SUFFIX = ".journal"
+
+    def __init__(self, snapshot_path):
+        self.filepath = Path(str(snapshot_path) + self.SUFFIX)
+
+    def exists(self):
+        return self.filepath.exists()
+
+    def append(self, seq, record):
+        """Appends a record with its sequence number"""
+        line = json.dumps(dict(record, seq=seq), separators=(",", ":"))
+        with open(self.filepath, "a") as fp:
+            fp.write(line + "\n")
+            _sync(fp)
+
+    def extend(self, first_seq, records):
+        """Appends several records in a single write, numbered from first_seq"""
+        lines = [
+            json.dumps(dict(record, seq=seq), separators=(",", ":")) + "\n"
+            for seq, record in enumerate(records, first_seq)
+        ]
+        with open(self.filepath, "a") as fp:
+            fp.write("".join(lines))
+            _sync(fp)
+
+    def records(self, after=0):
+        """
+        Yields the records with a sequence number greater than `after`.
+        Reading stops at the first incomplete or corrupted line (e.g. a write interrupted by a crash),
+        and that damaged tail is truncated so the next records are appended after a complete line.
+        """
+        if not self.exists():
+            return
+
+        valid_size = 0
+        damaged = False
+        with open(self.filepath, "rb") as fp:
+            for line in fp:
+                if not line.endswith(b"\n"):
+                    damaged = True
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    damaged = True
+                    break
+                valid_size += len(line)
+                if record.get("seq", 0) > after:
+                    yield record
+
+        if damaged:
+            os.truncate(self.filepath, valid_size)
+
+    def clear(self):
+        """Removes the journal (once its records are part of the snapshot)"""
+        try:
+            os.remove(self.filepath)
+        except FileNotFoundError:
+            pass
+
+
+def _sync(fp):
+    """Flushes a file to the disk (not only to the operating system)"""
+    fp.flush()
+    os.fsync(fp.fileno())
+
+
+def sync_directory(path):
+    """Flushes a directory to the disk, so a file created, renamed or removed in it stays that way after a crash"""
+    if os.name != "posix":
+        # Directories cannot be opened on Windows: the rename is durable there once os.replace() returns
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def write_json_atomic(filepath, data, **kwargs):
+    """
+    Writes JSON to a temporary file then renames it, so a crash never leaves a half-written file.
+    The file and then its directory are synced, so the new content is on the disk when it returns.
+    """
+    tmp_path = str(filepath) + ".tmp"
+    with open(tmp_path, "w") as fp:
+        json.dump(data, fp, **kwargs)
+        _sync(fp)
+    os.replace(tmp_path, filepath)
+    sync_directory(os.path.dirname(os.path.abspath(filepath)))
@@ -3,6 +3,9 @@
 # Enforces that a match must have 2 players
 # Allows updating results with set_result()
 # Has serialize() method for JSON export
+# A Round copies the match into its arrays (see Round.add_match) and gives MatchView objects back
+
+from .player import chess_id_of
 
 
 class Match:
@@ -26,10 +29,10 @@ class Match:
         self.score2 = score2
 
     def serialize(self):
-        """Serialize match data for JSON export"""
+        """Serialize match data for JSON export (players are referenced by chess_id)"""
         return {
-            "player1": self.player1.serialize(),
-            "player2": self.player2.serialize(),
+            "player1": chess_id_of(self.player1),
+            "player2": chess_id_of(self.player2),
             "score1": self.score1,
             "score2": self.score2,
         }
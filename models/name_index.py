@@ -0,0 +1,169 @@
+import heapq
+from bisect import bisect_left, insort
+import unicodedata
+
+
+def normalize_name(name):
+    """Lower-cases a name, removes accents and collapses whitespace"""
+    decomposed = unicodedata.normalize("NFKD", name or "")
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.casefold().split())
+
+
+class NameIndex:
+    """
+    Search index over normalized names.
+
+    Queries are substring searches. Results are ranked: exact match, then name prefix, then word prefix,
+    then any substring; they are found in that order, so a search with a limit stops as soon as it has enough:
+    - exact matches and name prefixes are read in order from the sorted list of the names
+    - a query of 1 or 2 characters then reads the sorted list of the other words of the names,
+      and only scans the names if there are still not enough results
+    - a longer query intersects the keys of its trigrams, then the candidates are checked
+
+    The sorted lists are built on the first search, then kept up to date.
+    """
+
+    NGRAM = 3
+
+    def __init__(self):
+        self._names = {}     # key -> normalized name
+        self._values = {}    # key -> indexed value
+        self._ngrams = {}    # trigram -> set of keys
+        self._sorted_names = None   # sorted (name, key)
+        self._sorted_words = None   # sorted (word, position in the name, key), for all but the first word
+
+    def __len__(self):
+        return len(self._names)
+
+    def _ngrams_of(self, name):
+        return {name[i:i + self.NGRAM] for i in range(len(name) - self.NGRAM + 1)}
+
+    @staticmethod
+    def _words_of(key, name):
+        position = name.find(" ")
+        while position >= 0:
+            end = name.find(" ", position + 1)
+            yield name[position + 1:end if end >= 0 else None], position + 1, key
+            position = end
+
+    def add(self, key, name, value):
+        """Indexes a value under its name (replacing any previous entry for this key)"""
+        if key in self._names:
+            self.remove(key)
+
+        normalized = normalize_name(name)
+        self._names[key] = normalized
+        self._values[key] = value
+        for ngram in self._ngrams_of(normalized):
+            self._ngrams.setdefault(ngram, set()).add(key)
+        if self._sorted_names is not None:
+            insort(self._sorted_names, (normalized, key))
+            for entry in self._words_of(key, normalized):
+                insort(self._sorted_words, entry)
+
+    def remove(self, key):
+        """Removes the entry for this key (if any)"""
+        normalized = self._names.pop(key, None)
+        if normalized is None:
+            return
+        del self._values[key]
+
+        for ngram in self._ngrams_of(normalized):
+            keys = self._ngrams[ngram]
+            keys.discard(key)
+            if not keys:
+                del self._ngrams[ngram]
+        if self._sorted_names is not None:
+            del self._sorted_names[bisect_left(self._sorted_names, (normalized, key))]
+            for entry in self._words_of(key, normalized):
+                del self._sorted_words[bisect_left(self._sorted_words, entry)]
+
+    def _build_sorted(self):
+        if self._sorted_names is None:
+            self._sorted_names = sorted((name, key) for key, name in self._names.items())
+            self._sorted_words = sorted(
+                entry for key, name in self._names.items() for entry in self._words_of(key, name)
+            )
+
+    @staticmethod
+    def _prefixed(entries, prefix, limit=None):
+        """Entries of a sorted list whose first item starts with the prefix, in order"""
+        matches = []
+        for index in range(bisect_left(entries, (prefix,)), len(entries)):
+            if len(matches) == limit or not entries[index][0].startswith(prefix):
+                break
+            matches.append(entries[index])
+        return matches
+
+    def _substring_candidates(self, query):
+        """Keys of the names containing a query of at least NGRAM characters"""
+        postings = []
+        for ngram in self._ngrams_of(query):
+            keys = self._ngrams.get(ngram)
+            if not keys:
+                return ()
+            postings.append(keys)
+        if len(query) == self.NGRAM:
+            return postings[0]
+
+        # Go through the smallest set, without copying it
+        postings.sort(key=len)
+        smallest, others = postings[0], postings[1:]
+        return (
+            key for key in smallest
+            if all(key in keys for keys in others) and query in self._names[key]
+        )
+
+    @staticmethod
+    def _rank(query, name):
+        if name == query:
+            return (0, 0)
+        if name.startswith(query):
+            return (1, 0)
+        position = (" " + name).find(" " + query)
+        if position >= 0:
+            return (2, position)
+        return (3, name.find(query))
+
+    def _ranked(self, ranked, limit):
+        """Keys of the (rank, name, key) items, best first"""
+        ranked = sorted(ranked) if limit is None else heapq.nsmallest(limit, ranked)
+        return [key for _, _, key in ranked]
+
+    def _word_prefixes(self, query, exclude, limit):
+        """Keys of the names with a word (other than the first) starting with a query without spaces"""
+        positions = {}
+        for _, position, key in self._prefixed(self._sorted_words, query):
+            if key not in exclude and position < positions.get(key, position + 1):
+                positions[key] = position
+        return self._ranked(((position, self._names[key], key) for key, position in positions.items()), limit)
+
+    def search(self, query, limit=None):
+        """Returns the values whose name contains the query, best matches first"""
+        query = normalize_name(query)
+        if not query or limit == 0:
+            return []
+        self._build_sorted()
+
+        def missing():
+            return None if limit is None else limit - len(keys)
+
+        keys = [key for _, key in self._prefixed(self._sorted_names, query, limit)]
+        if len(query) < self.NGRAM and missing() != 0:
+            keys += self._word_prefixes(query, set(keys), missing())
+            if missing() != 0:
+                found = set(keys)
+                others = (
+                    ((3, name.find(query)), name, key) for key, name in self._names.items()
+                    if key not in found and query in name
+                )
+                keys += self._ranked(others, missing())
+        elif missing() != 0:
+            found = set(keys)
+            others = (
+                (self._rank(query, self._names[key]), self._names[key], key)
+                for key in self._substring_candidates(query) if key not in found
+            )
+            keys += self._ranked(others, missing())
+        return [self._values[key] for key in keys]
@@ -0,0 +1,172 @@
+# Key Points
+# Pairing engines build the pairings of a tournament's next round
+# Each engine returns (pairings, bye_player), bye_player is None for an even number of players
+# "greedy" is the original Swiss system of the Tournament class: the unpaired player gets no points
+# "weighted" models the round as a minimum-cost perfect matching, solved with a windowed heuristic (not a
+# global matching): only players a few places apart in the standings can be paired; the bye gives points
+# Round 1 of a tournament seeded by rating pairs the top half with the bottom half with both engines
+
+from .player import chess_id_of
+from .round import round_rows
+
+
+def _unpaired(tournament, pairings):
+    """The player of the tournament who is in none of the pairings, or None"""
+    paired = {id(player) for pairing in pairings for player in pairing}
+    unpaired = [player for player in tournament.players if id(player) not in paired]
+    return unpaired[0] if unpaired else None
+
+
+class GreedyPairing:
+    """
+    Random pairings for round 1, then greedy pairing by points (the Tournament methods).
+    With an odd number of players, the player left unpaired sits the round out without points.
+    """
+
+    # Whether the player left unpaired gets Tournament.BYE_POINTS (see Tournament.advance_round)
+    AWARDS_BYE = False
+
+    def pair(self, tournament):
+        if len(tournament.rounds) == 0:
+            pairings = tournament._generate_random_pairings()
+        else:
+            pairings = tournament._generate_swiss_pairings()
+        return pairings, _unpaired(tournament, pairings)
+
+
+class WeightedPairing:
+    """
+    Pairs a round with a low-cost perfect matching of the players.
+
+    The cost of a pair adds:
+    - the squared difference of the players' points (in half points) times SCORE_WEIGHT
+    - REMATCH_PENALTY if the players already played each other
+    - COLOUR_WEIGHT times the colour imbalance, when both players are due the same colour
+
+    With an odd number of players, the lowest ranked player who has not had a bye yet gets it
+    (and Tournament.BYE_POINTS).
+
+    Round 1 of a tournament seeded by rating is not a matching: the top half of the players by rating
+    plays the bottom half (see Tournament._generate_random_pairings), the lowest rated player gets the bye.
+
+    This is a windowed heuristic, not a global minimum-cost matching: the matching is only minimal
+    among the matchings whose pairs are at most `window` places apart in the standings. It is
+    computed with a dynamic programming pass over the standings, so the run time grows linearly
+    with the number of players (and with 2 ** window) and rounds of several thousand players are fine.
+    A cheaper pair further apart (e.g. to avoid a rematch in a large points group) is never considered;
+    with at most window + 1 players, the result is the global minimum.
+    """
+
+    AWARDS_BYE = True
+
+    SCORE_WEIGHT = 10
+    REMATCH_PENALTY = 1000
+    COLOUR_WEIGHT = 1
+    WINDOW = 6
+
+    def __init__(self, window=None):
+        self.window = window or self.WINDOW
+
+    def pair(self, tournament):
+        if not tournament.rounds and tournament.seeding == "rating":
+            pairings = tournament._generate_random_pairings()
+            return pairings, _unpaired(tournament, pairings)
+
+        ranked = list(tournament.get_player_rankings())
+        bye = None
+        if len(ranked) % 2:
+            bye = ranked.pop(self._bye_position(tournament, ranked))
+
+        balances = self._colour_balances(tournament)
+        points = [tournament.get_player_points(p) for p in ranked]
+        keys = [chess_id_of(p) for p in ranked]
+        colours = [balances.get(key, 0) for key in keys]
+
+        pairs = self._match(tournament, points, keys, colours)
+
+        pairings = []
+        for i, j in pairs:
+            # The player who had white less often gets white (player1)
+            if colours[j] < colours[i]:
+                i, j = j, i
+            pairings.append((ranked[i], ranked[j]))
+        return pairings, bye
+
+    def _bye_position(self, tournament, ranked):
+        """Lowest ranked player who did not get a bye yet"""
+        previous_byes = set(getattr(tournament, "byes", []))
+        for position in range(len(ranked) - 1, -1, -1):
+            if chess_id_of(ranked[position]) not in previous_byes:
+                return position
+        return len(ranked) - 1
+
+    def _colour_balances(self, tournament):
+        """Number of games with white minus number of games with black, by chess_id"""
+        balances = {}
+        for position, round_obj in enumerate(tournament.rounds):
+            _, _, _, matches = round_rows(round_obj, position)
+            for player1, player2, _, _ in matches:
+                balances[player1] = balances.get(player1, 0) + 1
+                balances[player2] = balances.get(player2, 0) - 1
+        return balances
+
+    def _pair_cost(self, tournament, points, keys, colours, i, j):
+        cost = self.SCORE_WEIGHT * (2 * (points[i] - points[j])) ** 2
+        if tournament.has_played_against(keys[i], keys[j]):
+            cost += self.REMATCH_PENALTY
+        if colours[i] * colours[j] > 0:
+            cost += self.COLOUR_WEIGHT * min(abs(colours[i]), abs(colours[j]))
+        return cost
+
+    def _match(self, tournament, points, keys, colours):
+        """
+        Minimum-cost perfect matching of positions 0..n-1, each position paired with one at most
+        `window` places further. The state at position i is a bitmask of the positions i, i+1, ...
+        already paired with an earlier position.
+        Returns the list of pairs of positions.
+        """
+        count = len(points)
+        window = min(self.window, count - 1)
+        costs = [
+            [self._pair_cost(tournament, points, keys, colours, i, i + k) if i + k < count else None
+             for k in range(window + 1)]
+            for i in range(count)
+        ]
+
+        states = {0: 0}
+        # For each position: {new state: (previous state, offset of the partner, 0 if paired before)}
+        choices = []
+        for i in range(count):
+            next_states = {}
+            step = {}
+            for mask, total in states.items():
+                if mask & 1:
+                    candidates = [(mask >> 1, total, 0)]
+                else:
+                    candidates = [
+                        ((mask | (1 << k)) >> 1, total + costs[i][k], k)
+                        for k in range(1, window + 1)
+                        if costs[i][k] is not None and not mask & (1 << k)
+                    ]
+                for new_mask, new_total, offset in candidates:
+                    if new_mask not in next_states or new_total < next_states[new_mask]:
+                        next_states[new_mask] = new_total
+                        step[new_mask] = (mask, offset)
+            states = next_states
+            choices.append(step)
+
+        # Walk back from the final state (every position paired)
+        pairs = []
+        mask = 0
+        for i in range(count - 1, -1, -1):
+            mask, offset = choices[i][mask]
+            if offset:
+                pairs.append((i, i + offset))
+        pairs.reverse()
+        return pairs
+
+
+PAIRING_ENGINES = {
+    "greedy": GreedyPairing,
+    "weighted": WeightedPairing,
+}
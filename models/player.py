@@ -1,4 +1,11 @@
 from datetime import datetime
+from functools import lru_cache
+
+
+@lru_cache(maxsize=65536)
+def parse_date(value, date_format):
+    """strptime with a cache: many players share a birthday, and datetime objects are immutable"""
+    return datetime.strptime(value, date_format)
 
 
 class Player:
@@ -23,30 +30,30 @@ class Player:
         return f"<{self.name}>"
 
     def __hash__(self):
-        """Returns the hash of the object - useful to use the instance as a key in a dictionary or in a set"""
-        return hash((self.name, self.email, self.chess_id, self.birthdate))
+        """
+        Returns the hash of the object - useful to use the instance as a key in a dictionary or in a set.
+        A player is identified by its chess_id: editing the name, email or birthday keeps the dictionary keys valid.
+        The chess_id of a player who entered a tournament cannot be edited (see PlayerUpdateCmd).
+        """
+        return hash(self.chess_id)
 
     def __eq__(self, other):
-        """Required when __hash__ is defined"""
-        if type(other) is not type(self):
-            raise TypeError("'=' is not supported with type %s" % type(other))
-
-        return (self.name, self.email, self.chess_id, self.birthdate) == (
-            other.name,
-            other.email,
-            other.chess_id,
-            other.birthdate,
-        )
+        """Required when __hash__ is defined: players with the same chess_id are the same player"""
+        if not isinstance(other, Player):
+            return NotImplemented
+        return self.chess_id == other.chess_id
 
     @property
     def birthday(self):
-        """Property to get the birthday (string) from the birthdate (datetime)"""
+        """Property to get the birthday (string) from the birthdate (datetime), None if unknown"""
+        if self.birthdate is None:
+            return None
         return self.birthdate.strftime(self.DATE_FORMAT)
 
     @birthday.setter
     def birthday(self, value):
-        """Sets the birthdate (datetime) from a string"""
-        self.birthdate = datetime.strptime(value, self.DATE_FORMAT)
+        """Sets the birthdate (datetime) from a string (None: unknown, for tournament players who are in no club)"""
+        self.birthdate = parse_date(value, self.DATE_FORMAT) if value is not None else None
 
     def serialize(self):
         """Serialize the instance in a format compatible with JSON"""
@@ -56,3 +63,10 @@ class Player:
         # datetime is notnatively serializable in JSON
         data["birthday"] = self.birthday
         return data
+
+
+def chess_id_of(player):
+    """Chess ID of a tournament player, whether it is a Player, its serialized dict or a raw chess_id"""
+    if isinstance(player, dict):
+        return player["chess_id"]
+    return getattr(player, "chess_id", player)
@@ -0,0 +1,100 @@
+from .name_index import NameIndex
+
+
+class PlayerRegistry:
+    """
+    Process-wide index of every known player.
+
+    Players are indexed by chess_id, by email and by name, so a lookup does not have to
+    re-read the club files or scan every club's list of players.
+    ChessClub keeps the registry in sync when players are loaded, created or updated.
+    """
+
+    def __init__(self):
+        self._by_chess_id = {}
+        self._by_email = {}
+        self._clubs = {}
+        self._names = NameIndex()
+
+    def __len__(self):
+        return len(self._by_chess_id)
+
+    def __iter__(self):
+        return iter(self._by_chess_id.values())
+
+    def __contains__(self, chess_id):
+        return chess_id in self._by_chess_id
+
+    @staticmethod
+    def _email_key(email):
+        return email.lower() if email else None
+
+    def add(self, player, club=None):
+        """Indexes a player (and the club it belongs to)"""
+        self._by_chess_id[player.chess_id] = player
+        self._names.add(player.chess_id, player.name, player)
+        email = self._email_key(player.email)
+        if email:
+            self._by_email[email] = player
+        if club is not None:
+            self._clubs[player.chess_id] = club
+
+    def remove(self, player):
+        """Removes a player from the indexes (only if the indexed instance is this player)"""
+        if self._by_chess_id.get(player.chess_id) is player:
+            del self._by_chess_id[player.chess_id]
+            self._clubs.pop(player.chess_id, None)
+            self._names.remove(player.chess_id)
+
+        email = self._email_key(player.email)
+        if email and self._by_email.get(email) is player:
+            del self._by_email[email]
+
+    def index_club(self, club):
+        """Indexes all the players of a club"""
+        for player in club.players:
+            self.add(player, club)
+
+    def remove_club(self, club):
+        """Removes all the players of a club from the indexes"""
+        for player in club.players:
+            self.remove(player)
+
+    def clear(self):
+        self._by_chess_id.clear()
+        self._by_email.clear()
+        self._clubs.clear()
+        self._names = NameIndex()
+
+    def find_by_chess_id(self, chess_id):
+        """Returns the player with this chess_id, or None"""
+        return self._by_chess_id.get(chess_id)
+
+    def find_by_email(self, email):
+        """Returns the player with this email address (case insensitive), or None"""
+        return self._by_email.get(self._email_key(email))
+
+    def search_by_name(self, query, limit=None):
+        """Returns the players whose name contains the query (case insensitive), best matches first"""
+        return self._names.search(query, limit)
+
+    def club_of(self, player):
+        """Returns the club a player belongs to, or None"""
+        return self._clubs.get(player.chess_id)
+
+
+# The registry shared by the whole application
+registry = PlayerRegistry()
+
+
+def get_player_registry(data_folder="data/clubs", refresh=False):
+    """
+    Returns the shared registry, with the players of every club of the shared ClubManager.
+    The clubs are loaded on the first call; the club files that changed are only read again with refresh=True
+    (changes made through ChessClub are indexed as they are made).
+    """
+    from .club_manager import get_club_manager
+
+    # Loading the clubs indexes their players (nothing is read once they are all loaded)
+    get_club_manager(data_folder, refresh=refresh).load_players()
+    return registry
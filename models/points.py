@@ -0,0 +1,63 @@
+# Key Points
+# The points of the players are derived from the history: match results of every round, plus the byes
+# All the players are computed at once: the score arrays of each round are summed with np.bincount
+# verify_points() compares them with the points kept incrementally (tournament.player_points) and reports the drift
+# Players who left the tournament (not in tournament.players) are ignored
+
+import numpy as np
+
+from .player import chess_id_of
+from .round import Round, round_rows
+
+
+def compute_points(tournament, players=None):
+    """
+    Computes the points of the players (default: tournament.players) from the rounds and the byes,
+    returns an array of the players' points in the same order.
+    """
+    players = list(tournament.players if players is None else players)
+    size = len(players)
+    index = {chess_id_of(player): position for position, player in enumerate(players)}
+    # Points of the players not in `players` go to the last slot
+    halves = np.zeros(size + 1)
+    points = np.zeros(size + 1)
+
+    targets = {}  # id(PlayerTable) -> position in `players` of each player of the table
+    for position, round_obj in enumerate(tournament.rounds):
+        if isinstance(round_obj, Round):
+            if not len(round_obj.matches):
+                continue
+            table = round_obj.player_table
+            target = targets.get(id(table))
+            if target is None or len(target) != len(table):
+                target = targets[id(table)] = np.fromiter(
+                    (index.get(chess_id, size) for chess_id in table.chess_ids), dtype=np.int64, count=len(table)
+                )
+            first, second, halves1, halves2 = (np.frombuffer(column, dtype=column.typecode)
+                                               for column in round_obj.columns())
+            halves += np.bincount(target[first], weights=halves1, minlength=size + 1)
+            halves += np.bincount(target[second], weights=halves2, minlength=size + 1)
+        else:
+            # Round of the legacy or normalized schema
+            for player1, player2, score1, score2 in round_rows(round_obj, position)[3]:
+                points[index.get(player1, size)] += score1
+                points[index.get(player2, size)] += score2
+
+    for chess_id in getattr(tournament, "byes", []):
+        points[index.get(chess_id, size)] += tournament.BYE_POINTS
+
+    return (points + halves / 2)[:size]
+
+
+def verify_points(tournament, computed=None, tolerance=1e-9):
+    """
+    Compares the points of the players (tournament.player_points) with the points computed from the history
+    (or `computed`, the result of compute_points()).
+    Returns the drift: a list of (player, points kept, points computed) for the players whose points differ.
+    """
+    players = list(tournament.players)
+    if computed is None:
+        computed = compute_points(tournament, players)
+    kept = np.array([tournament.get_player_points(player) for player in players], dtype=float)
+    drifted = np.flatnonzero(np.abs(kept - computed) > tolerance)
+    return [(players[i], float(kept[i]), float(computed[i])) for i in drifted]
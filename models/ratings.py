@@ -0,0 +1,187 @@
+# Key Points
+# Elo ratings of the players (by chess_id), computed from the rounds of the completed tournaments
+# All the games of a round are rated at once with NumPy arrays (a player plays once per round)
+# Tournaments are replayed by end date; rounds are rated once, so update() can be called again
+# The ratings are kept in data/ratings.json with the number of rounds rated per tournament (by tournament uid)
+# The file is built explicitly from the tournament files (python tournament_tool.py ratings), then kept up
+# to date when a tournament is saved
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from .journal import write_json_atomic
+from .player import chess_id_of
+from .round import round_rows
+
+
+class RatingEngine:
+    """
+    Elo ratings with the K-factor rules:
+    - K = 40 for the first PROVISIONAL_GAMES games of a player
+    - K = 10 once the player's rating reached MASTER_RATING
+    - K = 20 otherwise
+    """
+
+    DEFAULT_RATING = 1500.0
+    PROVISIONAL_GAMES = 30
+    MASTER_RATING = 2400.0
+    K_PROVISIONAL = 40.0
+    K_DEFAULT = 20.0
+    K_MASTER = 10.0
+    # Version of the ratings file (1 counted the rated rounds by tournament name)
+    VERSION = 2
+
+    def __init__(self, filepath=None):
+        self.filepath = filepath
+        self.rated_rounds = {}  # tournament uid -> number of rounds rated
+        self._index = {}        # chess_id -> position in the arrays
+        self._chess_ids = []
+        self._ratings = np.zeros(0)
+        self._games = np.zeros(0, dtype=np.int64)
+        self._peaks = np.zeros(0)
+
+    def __len__(self):
+        return len(self._chess_ids)
+
+    def rating(self, player):
+        """Rating of a player (Player object or chess_id), DEFAULT_RATING if the player never played"""
+        position = self._index.get(chess_id_of(player))
+        return self.DEFAULT_RATING if position is None else float(self._ratings[position])
+
+    def games(self, player):
+        position = self._index.get(chess_id_of(player))
+        return 0 if position is None else int(self._games[position])
+
+    def ratings_for(self, players):
+        """Returns {chess_id: rating} for the players"""
+        return {chess_id_of(player): self.rating(player) for player in players}
+
+    def _positions(self, chess_ids):
+        """Array positions of the chess_ids, adding the new players (the arrays grow by doubling)"""
+        for chess_id in chess_ids:
+            if chess_id not in self._index:
+                self._index[chess_id] = len(self._chess_ids)
+                self._chess_ids.append(chess_id)
+        if len(self._chess_ids) > len(self._ratings):
+            size = max(len(self._chess_ids), 2 * len(self._ratings), 64)
+            extra = size - len(self._ratings)
+            self._ratings = np.concatenate([self._ratings, np.full(extra, self.DEFAULT_RATING)])
+            self._games = np.concatenate([self._games, np.zeros(extra, dtype=np.int64)])
+            self._peaks = np.concatenate([self._peaks, np.full(extra, self.DEFAULT_RATING)])
+        return np.fromiter((self._index[chess_id] for chess_id in chess_ids), dtype=np.int64, count=len(chess_ids))
+
+    def _k_factors(self, positions):
+        return np.where(
+            self._games[positions] < self.PROVISIONAL_GAMES,
+            self.K_PROVISIONAL,
+            np.where(self._peaks[positions] >= self.MASTER_RATING, self.K_MASTER, self.K_DEFAULT),
+        )
+
+    def rate_round(self, matches):
+        """Updates the ratings with the games of a round: (player1, player2, score1, score2) chess_ids"""
+        played = [(p1, p2, s1, s2) for p1, p2, s1, s2 in matches if s1 + s2 > 0]
+        if not played:
+            return
+        player1, player2, score1, score2 = zip(*played)
+        first = self._positions(player1)
+        second = self._positions(player2)
+        # Score of player1 in [0, 1]
+        score = np.array(score1, dtype=float) / (np.array(score1, dtype=float) + np.array(score2, dtype=float))
+
+        rating1, rating2 = self._ratings[first], self._ratings[second]
+        expected = 1.0 / (1.0 + 10.0 ** ((rating2 - rating1) / 400.0))
+        k1, k2 = self._k_factors(first), self._k_factors(second)
+
+        self._ratings[first] = rating1 + k1 * (score - expected)
+        self._ratings[second] = rating2 - k2 * (score - expected)
+        self._games[first] += 1
+        self._games[second] += 1
+        self._peaks[first] = np.maximum(self._peaks[first], self._ratings[first])
+        self._peaks[second] = np.maximum(self._peaks[second], self._ratings[second])
+
+    def update(self, tournament):
+        """
+        Rates the rounds of a completed tournament that were not rated yet, up to the first round
+        with a missing result. Returns the number of rounds rated.
+        """
+        if not tournament.completed:
+            return 0
+        rated = self.rated_rounds.get(tournament.uid, 0)
+        count = 0
+        for position in range(rated, len(tournament.rounds)):
+            _, _, _, matches = round_rows(tournament.rounds[position], position)
+            if any(s1 + s2 == 0 for _, _, s1, s2 in matches):
+                break
+            self.rate_round(matches)
+            count += 1
+        if count:
+            self.rated_rounds[tournament.uid] = rated + count
+        return count
+
+    def replay(self, tournaments):
+        """
+        Computes the ratings again from the tournaments, given in the order of their end date (see end_date_key)
+        so that they can be read one at a time. Only the completed tournaments are rated.
+        """
+        self.__init__(self.filepath)
+        for tournament in tournaments:
+            self.update(tournament)
+
+    def load(self):
+        with open(self.filepath) as fp:
+            data = json.load(fp)
+        if data.get("version") != self.VERSION:
+            raise ValueError(f"{self.filepath} was written by a previous version, build it again")
+        self.__init__(self.filepath)
+        self.rated_rounds = data.get("rated_rounds", {})
+        players = data.get("players", {})
+        positions = self._positions(list(players))
+        values = np.array(list(players.values()), dtype=float).reshape(-1, 3)
+        self._ratings[positions] = values[:, 0]
+        self._games[positions] = values[:, 1].astype(np.int64)
+        self._peaks[positions] = values[:, 2]
+
+    def save(self):
+        count = len(self._chess_ids)
+        players = dict(zip(
+            self._chess_ids,
+            zip(self._ratings[:count].round(2).tolist(), self._games[:count].tolist(),
+                self._peaks[:count].round(2).tolist()),
+        ))
+        write_json_atomic(self.filepath, {
+            "version": self.VERSION, "rated_rounds": self.rated_rounds, "players": players,
+        })
+
+
+def end_date_key(tournament):
+    """Sort key of a Tournament (or TournamentSummary) by end date, for RatingEngine.replay()"""
+    try:
+        return datetime.strptime(tournament.end_date, "%d-%m-%Y")
+    except (TypeError, ValueError):
+        return datetime.min
+
+
+_shared_engines = {}
+
+
+def get_rating_engine(filepath="data/ratings.json"):
+    """
+    Returns the RatingEngine shared by commands and screens, loaded from filepath.
+    Without the file (or with a file of a previous version), the engine starts empty: the ratings of the
+    existing tournaments are built explicitly with `python tournament_tool.py ratings`.
+    """
+    key = Path(filepath).resolve()
+    engine = _shared_engines.get(key)
+    if engine is None:
+        engine = RatingEngine(filepath)
+        if os.path.exists(filepath):
+            try:
+                engine.load()
+            except ValueError as e:
+                print(f"Warning: {e} with python tournament_tool.py ratings")
+        _shared_engines[key] = engine
+    return engine
@@ -0,0 +1,91 @@
+# Key Points
+# Generated reports are kept in the reports folder with the version of their inputs
+# The version is a hash of the modification time and size of every input file (and of its journal):
+# a report is rendered again only when one of its club/tournament files changed, was added or removed
+# The manifest (.cache.json) records the version, size and last use of each report file
+# Beyond max_bytes, the least recently used report files are removed
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+from .journal import write_json_atomic
+from .reports import WRITERS, write_report
+from .tournament_index import file_signature
+
+MANIFEST_FILENAME = ".cache.json"
+# Changed when the reports or the writers change, so the files of the previous versions are rendered again
+CACHE_VERSION = 1
+
+
+def report_version(report, fmt):
+    """
+    Version stamp of a report: a hash of its name, columns and format, and of the signature of its input files.
+    None if the report cannot be cached (its inputs are not only files).
+    """
+    if report.inputs is None:
+        return None
+    digest = hashlib.sha256()
+    digest.update(json.dumps([CACHE_VERSION, report.name, list(report.columns), fmt]).encode())
+    for filepath in report.inputs:
+        digest.update(json.dumps([str(filepath), file_signature(filepath)]).encode())
+    return digest.hexdigest()
+
+
+class ReportCache:
+    """The report files of a folder, rendered again only when their inputs changed"""
+
+    MAX_BYTES = 100 * 1024 * 1024
+
+    def __init__(self, output_dir="reports", max_bytes=None):
+        self.output_dir = Path(output_dir)
+        self.max_bytes = self.MAX_BYTES if max_bytes is None else max_bytes
+        self.filepath = self.output_dir / MANIFEST_FILENAME
+        try:
+            with open(self.filepath) as fp:
+                self.entries = json.load(fp)
+        except (FileNotFoundError, json.JSONDecodeError):
+            # Missing or invalid: every report is rendered again
+            self.entries = {}
+
+    def write(self, report, fmt="csv"):
+        """
+        Returns (path of the report file, True if it was up to date): the report is only rendered
+        (see models.reports.write_report) if its file is missing or was rendered from other inputs.
+        """
+        filename = f"{report.name}.{WRITERS[fmt].extension}"
+        filepath = self.output_dir / filename
+        version = report_version(report, fmt)
+        entry = self.entries.get(filename)
+        cached = version is not None and entry is not None and entry["version"] == version and filepath.exists()
+
+        if not cached:
+            write_report(report, fmt, self.output_dir)
+            entry = self.entries[filename] = {"version": version, "size": filepath.stat().st_size}
+        entry["used"] = time.time()
+        self.evict(keep=filename)
+        self.save()
+        return filepath, cached
+
+    def evict(self, keep=None):
+        """Removes the least recently used report files while the reports take more than max_bytes"""
+        for filename in [filename for filename in self.entries if not (self.output_dir / filename).exists()]:
+            del self.entries[filename]
+
+        total = sum(entry["size"] for entry in self.entries.values())
+        for filename in sorted(self.entries, key=lambda filename: self.entries[filename]["used"]):
+            if total <= self.max_bytes:
+                break
+            if filename == keep:
+                continue
+            total -= self.entries.pop(filename)["size"]
+            try:
+                os.remove(self.output_dir / filename)
+            except FileNotFoundError:
+                pass
+
+    def save(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        write_json_atomic(self.filepath, self.entries)
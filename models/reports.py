@@ -0,0 +1,255 @@
+# Key Points
+# A report is a title, columns and a generator of rows: nothing is read before a writer asks for the rows
+# Writers (WRITERS) stream the rows to a CSV, JSON or static HTML file of the reports folder
+# Club files are read one at a time, and the players are sorted with an external merge sort (runs of
+# SORT_RUN_SIZE rows written to temporary files), so the memory used does not grow with the number of players
+# The tournaments are listed from the metadata index (see models.tournament_index), without reading their files
+
+import csv
+import heapq
+import json
+import os
+import tempfile
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+
+from .club import read_club_file
+from .player import chess_id_of
+from .round import round_rows
+from .tournament_index import TournamentIndex
+
+# Number of rows sorted in memory at once by sorted_rows()
+SORT_RUN_SIZE = 50000
+
+
+class Report:
+    """
+    A report: a name (used for the file name), a title, its columns and an iterable of rows (tuples).
+    inputs are the files the rows are read from (see models.report_cache), None if they are not only read from files.
+    """
+
+    def __init__(self, name, title, columns, rows, inputs=None):
+        self.name = name
+        self.title = title
+        self.columns = columns
+        self.rows = rows
+        self.inputs = inputs
+
+    def __str__(self):
+        return f"<Report {self.name}>"
+
+
+def sorted_rows(rows, key, run_size=SORT_RUN_SIZE):
+    """
+    Yields the rows sorted by key. Up to run_size rows are sorted in memory; beyond that, the rows are
+    sorted in runs of run_size rows written to temporary files (JSON lines), which are then merged.
+    """
+    rows = iter(rows)
+    runs = []
+    try:
+        while True:
+            run = sorted(islice(rows, run_size), key=key)
+            if not runs and len(run) < run_size:
+                # Everything fits in one run
+                yield from run
+                return
+            if not run:
+                break
+            fp = tempfile.TemporaryFile("w+")
+            fp.writelines(json.dumps(row) + "\n" for row in run)
+            fp.seek(0)
+            runs.append(fp)
+            # Released before the next run is read
+            del run
+        yield from heapq.merge(*((tuple(json.loads(line)) for line in fp) for fp in runs), key=key)
+    finally:
+        for fp in runs:
+            fp.close()
+
+
+def _safe_name(name):
+    return name.replace(" ", "_").lower()
+
+
+def _name_of(player):
+    """Name of a tournament player (its chess_id for a player in no club known only by its chess_id)"""
+    return getattr(player, "name", None) or chess_id_of(player)
+
+
+def _data_files(folder):
+    return sorted(Path(folder).glob("*.json"))
+
+
+def _tournament_inputs(tournament, tournaments_dir, clubs_dir):
+    """The files of a tournament report: the tournament file, and the club files (the players' names)"""
+    if tournament.filename is None or tournament.pending_events:
+        # Not saved, or changed since it was saved
+        return None
+    return [Path(tournaments_dir) / tournament.filename] + _data_files(clubs_dir)
+
+
+def players_report(clubs_dir="data/clubs"):
+    """All the players of the clubs, in alphabetical order"""
+    filepaths = _data_files(clubs_dir)
+
+    def rows():
+        for filepath in filepaths:
+            try:
+                club = read_club_file(filepath)
+            except json.JSONDecodeError as e:
+                print(f"Warning: Could not load club from {filepath.name}: {e}")
+                continue
+            for player in club["players"]:
+                yield player.name or "", player.chess_id, player.email, player.birthday, club["name"]
+
+    return Report(
+        "players", "All players",
+        ("name", "chess_id", "email", "birthday", "club"),
+        sorted_rows(rows(), key=lambda row: (row[0].lower(), row[1])),
+        inputs=filepaths,
+    )
+
+
+def tournaments_report(tournaments_dir="data/tournaments"):
+    """All the tournaments, by start date"""
+    def start_date(summary):
+        try:
+            return datetime.strptime(summary.start_date, "%d-%m-%Y")
+        except (TypeError, ValueError):
+            return datetime.min
+
+    def rows():
+        index = TournamentIndex(tournaments_dir)
+        index.refresh()
+        for summary in sorted(index.summaries(), key=start_date):
+            yield (summary.name, summary.location, summary.start_date, summary.end_date,
+                   summary.number_of_rounds, summary.current_round, summary.completed)
+
+    return Report(
+        "tournaments", "All tournaments",
+        ("name", "location", "start_date", "end_date", "number_of_rounds", "current_round", "completed"),
+        rows(),
+        inputs=_data_files(tournaments_dir),
+    )
+
+
+def tournament_players_report(tournament, tournaments_dir="data/tournaments", clubs_dir="data/clubs"):
+    """The players of a tournament, in alphabetical order, with their points and rank"""
+    def rows():
+        ranks = {chess_id_of(player): rank for rank, player in enumerate(tournament.get_player_rankings(), 1)}
+        for player in sorted(tournament.players, key=lambda p: (_name_of(p).lower(), chess_id_of(p))):
+            chess_id = chess_id_of(player)
+            yield _name_of(player), chess_id, tournament.get_player_points(player), ranks.get(chess_id)
+
+    return Report(
+        f"{_safe_name(tournament.name)}_players", f"{tournament.name}: players",
+        ("name", "chess_id", "points", "rank"),
+        rows(),
+        inputs=_tournament_inputs(tournament, tournaments_dir, clubs_dir),
+    )
+
+
+def rounds_report(tournament, tournaments_dir="data/tournaments", clubs_dir="data/clubs"):
+    """The rounds of a tournament with their matches, one row per match"""
+    def rows():
+        names = {chess_id_of(player): _name_of(player) for player in tournament.players}
+        for position, round_obj in enumerate(tournament.rounds):
+            name, start, end, matches = round_rows(round_obj, position)
+            for player1, player2, score1, score2 in matches:
+                yield (name, start, end, player1, names.get(player1, player1), player2, names.get(player2, player2),
+                       score1, score2)
+
+    return Report(
+        f"{_safe_name(tournament.name)}_rounds", f"{tournament.name}: rounds and matches",
+        ("round", "start_datetime", "end_datetime", "player1", "player1_name", "player2", "player2_name",
+         "score1", "score2"),
+        rows(),
+        inputs=_tournament_inputs(tournament, tournaments_dir, clubs_dir),
+    )
+
+
+# Reports of the whole data folders, and reports of a tournament
+REPORTS = {"players": players_report, "tournaments": tournaments_report}
+TOURNAMENT_REPORTS = {"players": tournament_players_report, "rounds": rounds_report}
+
+
+class CsvWriter:
+    """A header line with the columns, then a line per row"""
+
+    extension = "csv"
+
+    def write(self, report, fp):
+        writer = csv.writer(fp)
+        writer.writerow(report.columns)
+        writer.writerows(report.rows)
+
+
+class JsonWriter:
+    """A JSON document with the title, the columns and the rows as objects (one per line)"""
+
+    extension = "json"
+
+    def write(self, report, fp):
+        fp.write('{"title": %s, "columns": %s, "rows": [' % (json.dumps(report.title), json.dumps(report.columns)))
+        separator = "\n"
+        for row in report.rows:
+            fp.write(separator + json.dumps(dict(zip(report.columns, row))))
+            separator = ",\n"
+        fp.write("\n]}\n")
+
+
+class HtmlWriter:
+    """A static HTML page with a table, rendered with Jinja2 (the template is rendered while it is written)"""
+
+    extension = "html"
+    TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{{ report.title }}</title>
+<style>
+body { font-family: sans-serif; }
+table { border-collapse: collapse; }
+th, td { border: 1px solid #ccc; padding: 2px 8px; text-align: left; }
+</style>
+</head>
+<body>
+<h1>{{ report.title }}</h1>
+<table>
+<thead><tr>{% for column in report.columns %}<th>{{ column }}</th>{% endfor %}</tr></thead>
+<tbody>
+{% for row in report.rows %}<tr>{% for value in row %}<td>{{ "" if value is none else value }}</td>{% endfor %}</tr>
+{% endfor %}</tbody>
+</table>
+</body>
+</html>
+"""
+
+    def write(self, report, fp):
+        from jinja2 import Environment
+
+        template = Environment(autoescape=True).from_string(self.TEMPLATE)
+        fp.writelines(template.generate(report=report))
+
+
+WRITERS = {"csv": CsvWriter, "json": JsonWriter, "html": HtmlWriter}
+
+
+def write_report(report, fmt="csv", output_dir="reports"):
+    """
+    Writes a report to output_dir/<report name>.<format> with the writer of the format (see WRITERS).
+    The file is written under a temporary name then renamed. Returns the path of the file.
+    """
+    writer = WRITERS[fmt]()
+    os.makedirs(output_dir, exist_ok=True)
+    filepath = Path(output_dir) / f"{report.name}.{writer.extension}"
+    tmp_path = f"{filepath}.tmp"
+    try:
+        with open(tmp_path, "w", newline="", encoding="utf-8") as fp:
+            writer.write(report, fp)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, filepath)
+    return filepath
@@ -0,0 +1,67 @@
+# Key Points
+# Reads the results of a round from a CSV or JSON Lines file (see Tournament.record_results)
+# CSV: a header line with player1,player2 and either score1,score2 or result
+# JSONL: one object per line with the same keys
+# result is "1-0", "0-1" or a draw ("0.5-0.5", "1/2-1/2", "½-½")
+
+import csv
+import json
+import os
+
+DRAW_SCORES = ("0.5", "1/2", "½")
+
+
+def _score(value):
+    value = str(value).strip()
+    if value in DRAW_SCORES:
+        return 0.5
+    return float(value)
+
+
+def parse_result_row(row):
+    """Returns (player1, player2, score1, score2) from a dict of the results file"""
+    player1 = str(row.get("player1") or "").strip()
+    player2 = str(row.get("player2") or "").strip()
+    if not player1 or not player2:
+        raise ValueError("player1 and player2 are required!")
+
+    if row.get("result") not in (None, ""):
+        score1, _, score2 = str(row["result"]).replace(" ", "").partition("-")
+    else:
+        score1, score2 = row.get("score1"), row.get("score2")
+    if score1 in (None, "") or score2 in (None, ""):
+        raise ValueError("a result or score1 and score2 are required!")
+    return player1, player2, _score(score1), _score(score2)
+
+
+def read_results(filepath):
+    """
+    Reads a CSV (.csv) or JSON Lines (.jsonl, .json) results file.
+    Returns the list of (player1, player2, score1, score2) tuples; raises ValueError listing
+    every invalid line.
+    """
+    extension = os.path.splitext(filepath)[1].lower()
+    results = []
+    errors = []
+    with open(filepath, newline="", encoding="utf-8-sig") as fp:
+        if extension == ".csv":
+            # Line 1 is the header
+            rows = ((line, row) for line, row in enumerate(csv.DictReader(fp), 2))
+        elif extension in (".jsonl", ".json"):
+            rows = ((line, text) for line, text in enumerate(fp, 1) if text.strip())
+        else:
+            raise ValueError(f"Unsupported results file {filepath} (.csv or .jsonl expected)!")
+
+        for line, row in rows:
+            try:
+                if not isinstance(row, dict):
+                    row = json.loads(row)
+                    if not isinstance(row, dict):
+                        raise ValueError("a JSON object is expected!")
+                results.append(parse_result_row(row))
+            except ValueError as e:
+                errors.append(f"line {line}: {e}")
+
+    if errors:
+        raise ValueError("Invalid results file:\n" + "\n".join(errors))
+    return results
@@ -1,54 +1,228 @@
 # Key Points
-# Handles start and end timestamps
-# Holds matches
+# Handles start and end timestamps (stored as epoch seconds, formatted when read)
+# Holds matches in arrays: player positions in a PlayerTable and scores in half points
+# Round.matches gives MatchView objects, that read and write those arrays
 # Has serialize() method for JSON export
 
 
-from datetime import datetime
+from array import array
+from collections.abc import Sequence
+from datetime import datetime, timedelta
+
+from .player import chess_id_of
+
+EPOCH = datetime(1970, 1, 1)
+
+
+class PlayerTable:
+    """
+    Players referenced by position in the match arrays of rounds.
+    The rounds of a tournament share the table of the tournament, so a player is stored once.
+    """
+
+    def __init__(self):
+        self.players = []
+        self.chess_ids = []
+        self._positions = {}  # id(player) -> position
+
+    def __len__(self):
+        return len(self.players)
+
+    def __getstate__(self):
+        # Positions are keyed by id(): they are computed again when unpickled
+        return {"players": self.players}
+
+    def __setstate__(self, state):
+        self.__init__()
+        for player in state["players"]:
+            self.position(player)
+
+    def position(self, player):
+        """Position of a player, added to the table if needed"""
+        position = self._positions.get(id(player))
+        if position is None:
+            position = self._positions[id(player)] = len(self.players)
+            self.players.append(player)
+            self.chess_ids.append(chess_id_of(player))
+        return position
+
+
+class MatchView:
+    """A match of a Round, read from and written to the round's arrays (same interface as Match)"""
+
+    __slots__ = ("_round", "index")
+
+    def __init__(self, round_obj, index):
+        self._round = round_obj
+        self.index = index
+
+    def __str__(self):
+        return f"<Match {self.player1} vs {self.player2} ({self.score1}-{self.score2})>"
+
+    @property
+    def player1(self):
+        return self._round.player_table.players[self._round._first[self.index]]
+
+    @property
+    def player2(self):
+        return self._round.player_table.players[self._round._second[self.index]]
+
+    @property
+    def score1(self):
+        return self._round._halves1[self.index] / 2
+
+    @property
+    def score2(self):
+        return self._round._halves2[self.index] / 2
+
+    def set_result(self, score1, score2):
+        """Set or update the match result"""
+        halves1, halves2 = Round.to_halves(score1), Round.to_halves(score2)
+        self._round._halves1[self.index] = halves1
+        self._round._halves2[self.index] = halves2
+
+    def serialize(self):
+        """Serialize match data for JSON export (players are referenced by chess_id)"""
+        chess_ids = self._round.player_table.chess_ids
+        return {
+            "player1": chess_ids[self._round._first[self.index]],
+            "player2": chess_ids[self._round._second[self.index]],
+            "score1": self.score1,
+            "score2": self.score2,
+        }
+
+
+class RoundMatches(Sequence):
+    """Read-only sequence of the MatchView objects of a round (created when accessed)"""
+
+    __slots__ = ("_round",)
+
+    def __init__(self, round_obj):
+        self._round = round_obj
+
+    def __len__(self):
+        return len(self._round._first)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [MatchView(self._round, i) for i in range(len(self))[index]]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("match index out of range")
+        return MatchView(self._round, index)
+
+    def __iter__(self):
+        return (MatchView(self._round, i) for i in range(len(self)))
 
 
 class Round:
-    """Represents a single round in a tournament"""
+    """
+    Represents a single round in a tournament.
+
+    The matches are stored as a struct of arrays: the positions of the two players in a PlayerTable
+    (shared with the other rounds of the tournament, see Tournament.add_round) and their scores in
+    half points (0..255, so 0 to 127.5 points). Round.matches gives lightweight MatchView objects;
+    add_match() copies a Match into the arrays.
+    """
 
     DATETIME_FORMAT = "%d-%m-%Y %H:%M"
 
-    def __init__(self, name, start_datetime=None, end_datetime=None):
+    def __init__(self, name, start_datetime=None, end_datetime=None, player_table=None):
         if not name:
             raise ValueError("Round name is required!")
 
         self.name = name
-        self._start_datetime = None
-        self._end_datetime = None
+        self.player_table = player_table if player_table is not None else PlayerTable()
+        self.start_timestamp = None  # epoch seconds
+        self.end_timestamp = None
         self.start_datetime = start_datetime or datetime.now().strftime(self.DATETIME_FORMAT)
         self.end_datetime = end_datetime or None
 
-        self.matches = []  # list of Match objects
+        self._first = array("i")    # position of player1 in self.player_table
+        self._second = array("i")   # position of player2
+        self._halves1 = array("B")  # score of player1, in half points
+        self._halves2 = array("B")
 
     def __str__(self):
         return f"<Round {self.name}>"
 
+    @classmethod
+    def to_timestamp(cls, value):
+        return int((datetime.strptime(value, cls.DATETIME_FORMAT) - EPOCH).total_seconds())
+
+    @classmethod
+    def from_timestamp(cls, timestamp):
+        return (EPOCH + timedelta(seconds=timestamp)).strftime(cls.DATETIME_FORMAT)
+
+    @staticmethod
+    def to_halves(score):
+        halves = score * 2
+        if halves != int(halves) or not 0 <= halves <= 255:
+            raise ValueError(f"Invalid score {score}: scores are multiples of 0.5 up to 127.5")
+        return int(halves)
+
     @property
     def start_datetime(self):
-        return self._start_datetime.strftime(self.DATETIME_FORMAT)
+        if self.start_timestamp is not None:
+            return self.from_timestamp(self.start_timestamp)
+        return None
 
     @start_datetime.setter
     def start_datetime(self, value):
-        self._start_datetime = datetime.strptime(value, self.DATETIME_FORMAT)
+        # None for the rounds of the legacy schema, which have no dates
+        self.start_timestamp = self.to_timestamp(value) if value else None
 
     @property
     def end_datetime(self):
-        if self._end_datetime:
-            return self._end_datetime.strftime(self.DATETIME_FORMAT)
+        if self.end_timestamp is not None:
+            return self.from_timestamp(self.end_timestamp)
         return None
 
     @end_datetime.setter
     def end_datetime(self, value):
         if value:
-            self._end_datetime = datetime.strptime(value, self.DATETIME_FORMAT)
+            self.end_timestamp = self.to_timestamp(value)
+
+    @property
+    def matches(self):
+        return RoundMatches(self)
+
+    def add_pairing(self, player1, player2, score1=0, score2=0):
+        """Adds a match between two players to this round"""
+        if not player1 or not player2:
+            raise ValueError("A match requires two players!")
+        # Scores are checked first: the arrays always have the same length
+        halves1, halves2 = self.to_halves(score1), self.to_halves(score2)
+        self._first.append(self.player_table.position(player1))
+        self._second.append(self.player_table.position(player2))
+        self._halves1.append(halves1)
+        self._halves2.append(halves2)
 
     def add_match(self, match):
-        """Adds a Match object to this round"""
-        self.matches.append(match)
+        """Adds a Match object to this round (its players and scores are copied)"""
+        self.add_pairing(match.player1, match.player2, match.score1, match.score2)
+
+    def share_players(self, table):
+        """Moves the matches to another PlayerTable (e.g. the tournament's one)"""
+        if table is self.player_table:
+            return
+        positions = array("i", (table.position(player) for player in self.player_table.players))
+        self._first = array("i", (positions[i] for i in self._first))
+        self._second = array("i", (positions[i] for i in self._second))
+        self.player_table = table
+
+    def columns(self):
+        """The match arrays: positions of player1 and player2 in the player table, scores in half points"""
+        return self._first, self._second, self._halves1, self._halves2
+
+    def rows(self):
+        """The matches as (player1, player2, score1, score2) tuples, with chess_ids"""
+        chess_ids = self.player_table.chess_ids
+        return [
+            (chess_ids[first], chess_ids[second], halves1 / 2, halves2 / 2)
+            for first, second, halves1, halves2 in zip(self._first, self._second, self._halves1, self._halves2)
+        ]
 
     def serialize(self):
         """Serialize round data for JSON export"""
@@ -56,5 +230,40 @@ class Round:
             "name": self.name,
             "start_datetime": self.start_datetime,
             "end_datetime": self.end_datetime,
-            "matches": [m.serialize() for m in self.matches],
+            "matches": [
+                {"player1": player1, "player2": player2, "score1": score1, "score2": score2}
+                for player1, player2, score1, score2 in self.rows()
+            ],
         }
+
+
+def round_rows(round_obj, position):
+    """
+    Returns (name, start_datetime, end_datetime, matches) for a tournament round, where matches
+    is a list of (player1, player2, score1, score2) tuples with chess_ids.
+    Rounds can be Round instances, dicts of the normalized schema or lists of the legacy schema
+    ({"players": [...], "completed": ..., "winner": ...}).
+    """
+    if isinstance(round_obj, list):
+        matches = []
+        for match in round_obj:
+            player1, player2 = match["players"]
+            if not match.get("completed"):
+                scores = (0, 0)
+            elif match.get("winner") is None:
+                scores = (0.5, 0.5)
+            else:
+                scores = (1, 0) if match["winner"] == player1 else (0, 1)
+            matches.append((player1, player2) + scores)
+        return f"Round {position + 1}", None, None, matches
+
+    if isinstance(round_obj, dict):
+        name = round_obj.get("name") or f"Round {position + 1}"
+        start, end = round_obj.get("start_datetime"), round_obj.get("end_datetime")
+        matches = [
+            (chess_id_of(m["player1"]), chess_id_of(m["player2"]), m.get("score1", 0), m.get("score2", 0))
+            for m in round_obj.get("matches", [])
+        ]
+        return name, start, end, matches
+
+    return round_obj.name, round_obj.start_datetime, round_obj.end_datetime, round_obj.rows()
@@ -0,0 +1,338 @@
+import sqlite3
+
+from .player import Player, chess_id_of
+from .round import round_rows
+from .storage import Storage
+from .tournament_index import legacy_uid
+
+# Tournaments are identified by uid: several tournaments can have the same name
+TOURNAMENTS_TABLE = """
+CREATE TABLE IF NOT EXISTS {table} (
+    id INTEGER PRIMARY KEY,
+    uid TEXT,
+    name TEXT NOT NULL,
+    location TEXT NOT NULL,
+    description TEXT NOT NULL DEFAULT '',
+    time_control TEXT,
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    number_of_rounds INTEGER NOT NULL,
+    current_round INTEGER,
+    completed INTEGER NOT NULL DEFAULT 0,
+    pairing_engine TEXT NOT NULL DEFAULT 'greedy',
+    seeding TEXT NOT NULL DEFAULT 'random'
+);
+"""
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS clubs (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    version INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS players (
+    club_id INTEGER NOT NULL REFERENCES clubs(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    email TEXT,
+    chess_id TEXT,
+    birthday TEXT NOT NULL,
+    PRIMARY KEY (club_id, position)
+);
+CREATE INDEX IF NOT EXISTS players_chess_id ON players(chess_id);
+CREATE INDEX IF NOT EXISTS players_name ON players(name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS players_email ON players(email COLLATE NOCASE);
+
+""" + TOURNAMENTS_TABLE.format(table="tournaments") + """
+CREATE TABLE IF NOT EXISTS tournament_players (
+    tournament_id INTEGER NOT NULL REFERENCES tournaments(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    chess_id TEXT NOT NULL,
+    points REAL NOT NULL DEFAULT 0,
+    byes INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (tournament_id, position)
+);
+CREATE INDEX IF NOT EXISTS tournament_players_chess_id ON tournament_players(chess_id);
+CREATE TABLE IF NOT EXISTS rounds (
+    id INTEGER PRIMARY KEY,
+    tournament_id INTEGER NOT NULL REFERENCES tournaments(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    start_datetime TEXT,
+    end_datetime TEXT,
+    UNIQUE (tournament_id, position)
+);
+CREATE TABLE IF NOT EXISTS matches (
+    round_id INTEGER NOT NULL REFERENCES rounds(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    player1 TEXT NOT NULL,
+    player2 TEXT NOT NULL,
+    score1 REAL NOT NULL DEFAULT 0,
+    score2 REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (round_id, position)
+);
+CREATE INDEX IF NOT EXISTS matches_player1 ON matches(player1);
+CREATE INDEX IF NOT EXISTS matches_player2 ON matches(player2);
+"""
+
+# Columns added since the first version of the schema: (table, column, definition)
+MIGRATIONS = (
+    ("tournaments", "pairing_engine", "TEXT NOT NULL DEFAULT 'greedy'"),
+    ("tournaments", "seeding", "TEXT NOT NULL DEFAULT 'random'"),
+    ("tournaments", "uid", "TEXT"),
+    ("tournament_players", "byes", "INTEGER NOT NULL DEFAULT 0"),
+)
+
+INSERT_PLAYER = "INSERT INTO players (club_id, position, name, email, chess_id, birthday) VALUES (?, ?, ?, ?, ?, ?)"
+
+
+class SQLiteStorage(Storage):
+    """
+    Storage backend keeping clubs and tournaments in a SQLite database.
+
+    Players, tournament entries and matches are indexed by chess_id, so lookups like
+    "all the tournaments a player entered" do not need to load every tournament.
+    """
+
+    def __init__(self, database="data/chess.db"):
+        self.database = database
+        self.connection = sqlite3.connect(database)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        """
+        Upgrades a database created by a previous version: adds the missing columns (see MIGRATIONS),
+        drops the UNIQUE constraint of the tournament names and gives a uid to the tournaments without one.
+        """
+        with self.connection:
+            for table, column, definition in MIGRATIONS:
+                columns = {row[1] for row in self.connection.execute(f"PRAGMA table_info({table})")}
+                if column not in columns:
+                    self.connection.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+        if self._unique_tournament_names():
+            self._rebuild_tournaments_table()
+        with self.connection:
+            rows = self.connection.execute(
+                "SELECT id, name, start_date, location FROM tournaments WHERE uid IS NULL"
+            ).fetchall()
+            self.connection.executemany(
+                "UPDATE tournaments SET uid = ? WHERE id = ?",
+                ((legacy_uid(name, start_date, location), tournament_id)
+                 for tournament_id, name, start_date, location in rows),
+            )
+            # SQLite cannot add a UNIQUE column: the uid is indexed instead
+            self.connection.execute("CREATE UNIQUE INDEX IF NOT EXISTS tournaments_uid ON tournaments(uid)")
+
+    def _unique_tournament_names(self):
+        """True if the tournaments table has the UNIQUE constraint on name of the first versions"""
+        for _, index, unique, origin, _ in self.connection.execute("PRAGMA index_list(tournaments)"):
+            columns = [row[2] for row in self.connection.execute(f"PRAGMA index_info('{index}')")]
+            if unique and origin == "u" and columns == ["name"]:
+                return True
+        return False
+
+    def _rebuild_tournaments_table(self):
+        """
+        SQLite cannot drop a constraint: the table is created again (see TOURNAMENTS_TABLE) and its rows
+        copied, with the foreign keys off so that the players and rounds of the tournaments are kept.
+        """
+        columns = ", ".join(row[1] for row in self.connection.execute("PRAGMA table_info(tournaments)"))
+        self.connection.execute("PRAGMA foreign_keys = OFF")
+        try:
+            with self.connection:
+                self.connection.execute(TOURNAMENTS_TABLE.format(table="tournaments_rebuilt"))
+                self.connection.execute(
+                    f"INSERT INTO tournaments_rebuilt ({columns}) SELECT {columns} FROM tournaments"
+                )
+                self.connection.execute("DROP TABLE tournaments")
+                self.connection.execute("ALTER TABLE tournaments_rebuilt RENAME TO tournaments")
+        finally:
+            self.connection.execute("PRAGMA foreign_keys = ON")
+
+    def close(self):
+        self.connection.close()
+
+    # Clubs
+
+    def club_versions(self):
+        rows = self.connection.execute("SELECT id, name, version FROM clubs ORDER BY name, id")
+        return {club_id: (name, version) for club_id, name, version in rows}
+
+    def create_club(self, name):
+        with self.connection:
+            cursor = self.connection.execute("INSERT INTO clubs (name) VALUES (?)", (name,))
+        return cursor.lastrowid
+
+    def _bump_version(self, club_id):
+        self.connection.execute("UPDATE clubs SET version = version + 1 WHERE id = ?", (club_id,))
+        return self.connection.execute("SELECT version FROM clubs WHERE id = ?", (club_id,)).fetchone()[0]
+
+    def read_club(self, club_id):
+        name, version = self.connection.execute(
+            "SELECT name, version FROM clubs WHERE id = ?", (club_id,)
+        ).fetchone()
+        rows = self.connection.execute(
+            "SELECT name, email, chess_id, birthday FROM players WHERE club_id = ? ORDER BY position",
+            (club_id,),
+        )
+        return {
+            "name": name,
+            "players": [Player(*row) for row in rows],
+            "journal_seq": 0,
+            "pending_records": 0,
+            "signature": version,
+        }
+
+    def save_club(self, club):
+        with self.connection:
+            self.connection.execute("UPDATE clubs SET name = ? WHERE id = ?", (club.name, club.club_id))
+            self.connection.execute("DELETE FROM players WHERE club_id = ?", (club.club_id,))
+            self.connection.executemany(
+                INSERT_PLAYER,
+                (
+                    (club.club_id, position, p.name, p.email, p.chess_id, p.birthday)
+                    for position, p in enumerate(club.players)
+                ),
+            )
+            return self._bump_version(club.club_id)
+
+    def record_change(self, club, op, record):
+        with self.connection:
+            if op == "create":
+                p = record["player"]
+                self.connection.execute(
+                    INSERT_PLAYER,
+                    (club.club_id, len(club.players) - 1, p["name"], p["email"], p["chess_id"], p["birthday"]),
+                )
+            elif op == "update":
+                player = club.players[record["index"]]
+                self.connection.execute(
+                    "UPDATE players SET name = ?, email = ?, chess_id = ?, birthday = ? "
+                    "WHERE club_id = ? AND position = ?",
+                    (player.name, player.email, player.chess_id, player.birthday, club.club_id, record["index"]),
+                )
+            return self._bump_version(club.club_id)
+
+    def find_player_clubs(self, chess_id):
+        """Returns the names of the clubs a player belongs to"""
+        rows = self.connection.execute(
+            "SELECT DISTINCT clubs.name FROM players JOIN clubs ON clubs.id = players.club_id "
+            "WHERE players.chess_id = ?",
+            (chess_id,),
+        )
+        return [name for name, in rows]
+
+    # Tournaments
+
+    def save_tournament(self, tournament):
+        with self.connection:
+            row = self.connection.execute("SELECT id FROM tournaments WHERE uid = ?", (tournament.uid,)).fetchone()
+            values = (
+                tournament.location, tournament.description, tournament.time_control,
+                tournament.start_date, tournament.end_date, tournament.number_of_rounds,
+                tournament.current_round, int(bool(tournament.completed)), tournament.pairing_engine,
+                tournament.seeding, tournament.uid,
+            )
+            if row:
+                tournament_id = row[0]
+                self.connection.execute(
+                    "UPDATE tournaments SET location = ?, description = ?, time_control = ?, start_date = ?, "
+                    "end_date = ?, number_of_rounds = ?, current_round = ?, completed = ?, pairing_engine = ?, "
+                    "seeding = ?, uid = ?, name = ? WHERE id = ?",
+                    values + (tournament.name, tournament_id),
+                )
+                # Players and rounds are written again below
+                self.connection.execute("DELETE FROM tournament_players WHERE tournament_id = ?", (tournament_id,))
+                self.connection.execute("DELETE FROM rounds WHERE tournament_id = ?", (tournament_id,))
+            else:
+                tournament_id = self.connection.execute(
+                    "INSERT INTO tournaments (location, description, time_control, start_date, end_date, "
+                    "number_of_rounds, current_round, completed, pairing_engine, seeding, uid, name) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    values + (tournament.name,),
+                ).lastrowid
+
+            self.connection.executemany(
+                "INSERT INTO tournament_players (tournament_id, position, chess_id, points, byes) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    (tournament_id, position, chess_id_of(player), tournament.get_player_points(player),
+                     tournament.byes.count(chess_id_of(player)))
+                    for position, player in enumerate(tournament.players)
+                ),
+            )
+            for position, round_obj in enumerate(tournament.rounds):
+                name, start, end, matches = round_rows(round_obj, position)
+                round_id = self.connection.execute(
+                    "INSERT INTO rounds (tournament_id, position, name, start_datetime, end_datetime) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (tournament_id, position, name, start, end),
+                ).lastrowid
+                self.connection.executemany(
+                    "INSERT INTO matches (round_id, position, player1, player2, score1, score2) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    ((round_id, idx) + match for idx, match in enumerate(matches)),
+                )
+
+    def load_tournaments(self):
+        tournaments = []
+        rows = self.connection.execute(
+            "SELECT id, uid, name, location, description, time_control, start_date, end_date, "
+            "number_of_rounds, current_round, completed, pairing_engine, seeding FROM tournaments ORDER BY id"
+        ).fetchall()
+        for (tournament_id, uid, name, location, description, time_control, start_date, end_date,
+             number_of_rounds, current_round, completed, pairing_engine, seeding) in rows:
+            players = self.connection.execute(
+                "SELECT chess_id, points, byes FROM tournament_players WHERE tournament_id = ? ORDER BY position",
+                (tournament_id,),
+            ).fetchall()
+            tournaments.append({
+                "uid": uid,
+                "name": name,
+                "location": location,
+                "description": description,
+                "time_control": time_control,
+                "start_date": start_date,
+                "end_date": end_date,
+                "number_of_rounds": number_of_rounds,
+                "current_round": current_round,
+                "completed": bool(completed),
+                "pairing_engine": pairing_engine,
+                "seeding": seeding,
+                "players": [chess_id for chess_id, _, _ in players],
+                "player_points": {chess_id: points for chess_id, points, _ in players},
+                "byes": [chess_id for chess_id, _, byes in players for _ in range(byes)],
+                "rounds": self._load_rounds(tournament_id),
+            })
+        return tournaments
+
+    def _load_rounds(self, tournament_id):
+        rounds = []
+        for round_id, name, start, end in self.connection.execute(
+            "SELECT id, name, start_datetime, end_datetime FROM rounds WHERE tournament_id = ? ORDER BY position",
+            (tournament_id,),
+        ).fetchall():
+            matches = self.connection.execute(
+                "SELECT player1, player2, score1, score2 FROM matches WHERE round_id = ? ORDER BY position",
+                (round_id,),
+            )
+            rounds.append({
+                "name": name,
+                "start_datetime": start,
+                "end_datetime": end,
+                "matches": [
+                    {"player1": p1, "player2": p2, "score1": s1, "score2": s2} for p1, p2, s1, s2 in matches
+                ],
+            })
+        return rounds
+
+    def tournaments_for_player(self, chess_id):
+        rows = self.connection.execute(
+            "SELECT tournaments.uid FROM tournament_players "
+            "JOIN tournaments ON tournaments.id = tournament_players.tournament_id "
+            "WHERE tournament_players.chess_id = ? ORDER BY tournaments.id",
+            (chess_id,),
+        )
+        return [uid for uid, in rows]
@@ -0,0 +1,89 @@
+import heapq
+import random
+from itertools import count
+
+
+class Standings:
+    """
+    Players ranked by tournament points, updated incrementally.
+
+    Players are grouped by points. Inside a group, players are ordered by a random key drawn
+    once per player, when the player is first added, so players with the same points are in random
+    order (see notes/matchmaking.md) and keep their relative order when they move to another group.
+
+    Each group is a heap: updating a player's points pushes an entry in the new group's heap
+    (O(log n)) and only marks the entry of the old group as stale. The stale entries are dropped
+    when a group holds more stale entries than players, so the heaps stay at most twice their size.
+    The groups are sorted when the players are listed (there are only a few distinct point values).
+    """
+
+    def __init__(self):
+        self._groups = {}    # points -> heap of (random key, player sequence, entry sequence, player)
+        self._sizes = {}     # points -> number of players (the heap also holds stale entries)
+        self._entries = {}   # player -> (points, entry)
+        self._keys = {}      # player -> (random key, player sequence), drawn once
+        self._sequence = count()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, player):
+        return player in self._entries
+
+    def __iter__(self):
+        """Players from the best to the worst ranked"""
+        for _, players in self.points_groups():
+            yield from players
+
+    def _is_live(self, entry):
+        current = self._entries.get(entry[-1])
+        return current is not None and current[1] is entry
+
+    def _insert(self, player, points):
+        key = self._keys.get(player)
+        if key is None:
+            key = self._keys[player] = (random.random(), next(self._sequence))
+        entry = key + (next(self._sequence), player)
+        heapq.heappush(self._groups.setdefault(points, []), entry)
+        self._sizes[points] = self._sizes.get(points, 0) + 1
+        self._entries[player] = (points, entry)
+
+    def _remove(self, player):
+        points, _ = self._entries.pop(player)
+        size = self._sizes[points] - 1
+        if not size:
+            del self._groups[points]
+            del self._sizes[points]
+            return
+
+        self._sizes[points] = size
+        group = self._groups[points]
+        if len(group) > 2 * size:
+            # Drop the stale entries
+            group[:] = [entry for entry in group if self._is_live(entry)]
+            heapq.heapify(group)
+
+    def update(self, player, points):
+        """Sets the points of a player (adding the player if needed)"""
+        current = self._entries.get(player)
+        if current is not None:
+            if current[0] == points:
+                return
+            self._remove(player)
+        self._insert(player, points)
+
+    def remove(self, player):
+        if player in self._entries:
+            self._remove(player)
+            del self._keys[player]
+
+    def rank(self, player):
+        """Position of a player (1 for the first one); players with the same points share the best position"""
+        points, _ = self._entries[player]
+        return 1 + sum(size for better, size in self._sizes.items() if better > points)
+
+    def points_groups(self):
+        """Yields (points, players) from the best to the worst points"""
+        for points in sorted(self._groups, reverse=True):
+            entries = sorted(entry for entry in self._groups[points] if self._is_live(entry))
+            yield points, [entry[-1] for entry in entries]
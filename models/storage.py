@@ -0,0 +1,47 @@
+from abc import ABC, abstractmethod
+
+
+class Storage(ABC):
+    """
+    Base class for the storage backends of ClubManager and TournamentManager.
+
+    Without a storage, clubs and tournaments are kept in JSON files (data/clubs and data/tournaments).
+    A storage backend replaces these files: clubs are identified by a club_id, and each write
+    of a club returns a new version number (used to know when a club must be re-read).
+    """
+
+    # Clubs
+
+    @abstractmethod
+    def club_versions(self):
+        """Returns {club_id: (name, version)} for every club"""
+
+    @abstractmethod
+    def create_club(self, name):
+        """Creates an empty club and returns its club_id"""
+
+    @abstractmethod
+    def read_club(self, club_id):
+        """Returns the club data in the same format as read_club_file()"""
+
+    @abstractmethod
+    def save_club(self, club):
+        """Replaces all the players of a club and returns the new version"""
+
+    @abstractmethod
+    def record_change(self, club, op, record):
+        """Persists a single change ("create" or "update" of a player) and returns the new version"""
+
+    # Tournaments
+
+    @abstractmethod
+    def load_tournaments(self):
+        """Returns the data of every tournament, in the normalized JSON schema"""
+
+    @abstractmethod
+    def save_tournament(self, tournament):
+        """Persists a Tournament"""
+
+    @abstractmethod
+    def tournaments_for_player(self, chess_id):
+        """Returns the uids of the tournaments a player entered"""
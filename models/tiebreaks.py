@@ -0,0 +1,98 @@
+# Key Points
+# Tie-breaks separate the players who have the same tournament points
+# All the players are computed at once with NumPy arrays of shape (players, rounds)
+# Opponents are scored with their final tournament points
+# Players who left the tournament (not in tournament.players) are ignored as opponents
+
+import numpy as np
+
+from .player import chess_id_of
+from .round import round_rows
+
+# Tie-breaks used by rank_players(), the first one decides first
+TIEBREAKS = ("buchholz", "median_buchholz", "sonneborn_berger", "cumulative")
+
+
+def _history(tournament, players):
+    """
+    Returns (opponents, scores) arrays of shape (players, rounds): the index of the opponent
+    in each round (-1 when the player was not paired) and the player's score of the game.
+    """
+    index = {chess_id_of(player): position for position, player in enumerate(players)}
+    opponents = np.full((len(players), len(tournament.rounds)), -1, dtype=np.int64)
+    scores = np.zeros((len(players), len(tournament.rounds)))
+
+    for position, round_obj in enumerate(tournament.rounds):
+        _, _, _, matches = round_rows(round_obj, position)
+        if not matches:
+            continue
+        player1, player2, score1, score2 = zip(*matches)
+        idx1 = np.array([index.get(key, -1) for key in player1], dtype=np.int64)
+        idx2 = np.array([index.get(key, -1) for key in player2], dtype=np.int64)
+        score1 = np.array(score1, dtype=float)
+        score2 = np.array(score2, dtype=float)
+
+        known = (idx1 >= 0) & (idx2 >= 0)
+        opponents[idx1[known], position] = idx2[known]
+        opponents[idx2[known], position] = idx1[known]
+        scores[idx1[idx1 >= 0], position] = score1[idx1 >= 0]
+        scores[idx2[idx2 >= 0], position] = score2[idx2 >= 0]
+    return opponents, scores
+
+
+def compute_tiebreaks(tournament, players=None):
+    """
+    Computes the tie-breaks of the players (default: tournament.players), returns
+    {tie-break name: array of the players' values in the same order}:
+    - buchholz: sum of the opponents' points
+    - median_buchholz: buchholz without the best and the worst opponent (3 opponents or more)
+    - sonneborn_berger: sum of the points of the beaten opponents, plus half of the drawn ones
+    - cumulative: sum of the player's running total after each round
+    """
+    players = list(tournament.players if players is None else players)
+    points = np.array([tournament.get_player_points(player) for player in players], dtype=float)
+    opponents, scores = _history(tournament, players)
+
+    paired = opponents >= 0
+    opponent_points = np.where(paired, points[opponents], 0.0)
+    buchholz = opponent_points.sum(axis=1)
+
+    games = paired.sum(axis=1)
+    cut = games >= 3
+    best = np.where(paired, opponent_points, -np.inf).max(axis=1, initial=-np.inf)
+    worst = np.where(paired, opponent_points, np.inf).min(axis=1, initial=np.inf)
+    median_buchholz = buchholz - np.where(cut, best, 0.0) - np.where(cut, worst, 0.0)
+
+    sonneborn_berger = (opponent_points * scores * paired).sum(axis=1)
+
+    # The byes of a player are given in the rounds the player was not paired, in order
+    byes = {}
+    for chess_id in getattr(tournament, "byes", []):
+        byes[chess_id] = byes.get(chess_id, 0) + 1
+    bye_counts = np.array([byes.get(chess_id_of(player), 0) for player in players])
+    unpaired = ~paired
+    bye_rounds = unpaired & (np.cumsum(unpaired, axis=1) <= bye_counts[:, None])
+    round_points = scores + bye_rounds * tournament.BYE_POINTS
+    cumulative = np.cumsum(round_points, axis=1).sum(axis=1)
+
+    return {
+        "points": points,
+        "buchholz": buchholz,
+        "median_buchholz": median_buchholz,
+        "sonneborn_berger": sonneborn_berger,
+        "cumulative": cumulative,
+    }
+
+
+def rank_players(tournament, players=None, tiebreaks=TIEBREAKS):
+    """
+    Sorts the players (default: tournament.players) by points, then by each tie-break.
+    Players still tied keep their order in `players`.
+    """
+    players = list(tournament.players if players is None else players)
+    if not players:
+        return []
+    values = compute_tiebreaks(tournament, players)
+    # np.lexsort sorts by the last key first, in ascending order
+    keys = [-values[name] for name in reversed(tiebreaks)] + [-values["points"]]
+    return [players[i] for i in np.lexsort(keys)]
@@ -3,23 +3,45 @@
 # as strings in "DD-MM-YYYY" format. Similar to Player class.
 # Keeps lists of players and rounds.
 # Has serialize() method so the whole tournament can be saved to JSON.
+# add_player(), advance_round() and record_results() also record events (pending_events),
+# that TournamentManager can append to the tournament's journal instead of rewriting its file.
+# player_points is updated incrementally; recompute_points() derives it again from the match history.
+# uid identifies a tournament (ratings, career statistics): its name can be shared by several tournaments.
 
 from datetime import datetime
 import random
+import uuid
+
+from .pairing import PAIRING_ENGINES
+from .player import chess_id_of
+from .points import compute_points, verify_points
+from .round import PlayerTable, Round, round_rows
+from .standings import Standings
+from .tiebreaks import rank_players
 
 
 class Tournament:
     """The Tournament class holds all information related to a chess tournament"""
 
     DATE_FORMAT = "%d-%m-%Y"
+    # Points given to a player who is not paired in a round (odd number of players)
+    BYE_POINTS = 1.0
+    # Order of the players before the pairing of round 1
+    SEEDINGS = ("random", "rating")
+    # (score1, score2) of a played match
+    VALID_RESULTS = {(1.0, 0.0), (0.0, 1.0), (0.5, 0.5)}
 
     def __init__(self, name, location, start_date, end_date, description="",
                  time_control="bullet", number_of_rounds=4,
-                 current_round=None, completed=False):
+                 current_round=None, completed=False, pairing_engine="greedy", seeding="random", uid=None):
         if not name:
             raise ValueError("Tournament name is required!")
         if not location:
             raise ValueError("Tournament location is required!")
+        if pairing_engine not in PAIRING_ENGINES:
+            raise ValueError(f"Unknown pairing engine {pairing_engine}!")
+        if seeding not in self.SEEDINGS:
+            raise ValueError(f"Unknown seeding {seeding}!")
 
         self.name = name
         self.location = location
@@ -28,6 +50,9 @@ class Tournament:
         self.number_of_rounds = number_of_rounds
         self.current_round = current_round
         self.completed = completed
+        self.pairing_engine = pairing_engine  # see models.pairing
+        self.seeding = seeding  # "rating": round 1 pairs the top half with the bottom half (see models.ratings)
+        self.uid = uid or uuid.uuid4().hex  # stable identifier, saved with the tournament
 
         # Dates
         self._start_date = None
@@ -38,7 +63,23 @@ class Tournament:
         # Containers
         self.players = []   # list of Player objects
         self.rounds = []    # list of Round objects
+        self.player_table = PlayerTable()  # players of the rounds' match arrays, shared by the rounds
         self.player_points = {}  # Track tournament points for each player
+        self.points_drift = []   # points of the loaded file that did not match the history, see recompute_points()
+        self.byes = []      # chess_ids of the players who got a bye, in round order
+        self.bye_player = None  # player left unpaired by the last generate_pairings()
+        self.standings = Standings()  # players ranked by points, see get_player_rankings()
+
+        # Pairs of chess_ids that already played each other, and number of rounds indexed
+        self._played_pairs = set()
+        self._indexed_rounds = 0
+
+        # Events not persisted yet (player_registered, round_started, result_recorded, round_closed),
+        # and journal state of the file the tournament was loaded from or saved to (see TournamentManager)
+        self.pending_events = []
+        self.filename = None
+        self.journal_seq = 0
+        self.journal_records = 0
 
     def __str__(self):
         return f"<Tournament {self.name} at {self.location}>"
@@ -60,13 +101,38 @@ class Tournament:
         self._end_date = datetime.strptime(value, self.DATE_FORMAT)
 
     def add_player(self, player):
-        """Adds a Player object to the tournament"""
+        """Adds a Player object (or the chess_id of a player in no club) to the tournament"""
         self.players.append(player)
         self.player_points[player] = 0.0
+        self.standings.update(player, 0.0)
+        self.pending_events.append({
+            "op": "player_registered",
+            "player": player.serialize() if hasattr(player, "serialize") else player,
+        })
 
     def add_round(self, round_obj):
-        """Adds a Round object to the tournament"""
+        """Adds a Round object to the tournament (its matches must be created before)"""
+        if isinstance(round_obj, Round):
+            round_obj.share_players(self.player_table)
         self.rounds.append(round_obj)
+        self._index_pairs(round_obj, len(self.rounds) - 1)
+        self._indexed_rounds = len(self.rounds)
+
+    def _index_pairs(self, round_obj, position):
+        _, _, _, matches = round_rows(round_obj, position)
+        for player1, player2, _, _ in matches:
+            self._played_pairs.add(frozenset((player1, player2)))
+
+    def rebuild_pair_history(self):
+        """Rebuilds the index of the pairs that already played (e.g. after loading the rounds)"""
+        self._played_pairs = set()
+        for position, round_obj in enumerate(self.rounds):
+            self._index_pairs(round_obj, position)
+        self._indexed_rounds = len(self.rounds)
+
+    def record_pairing(self, player1, player2):
+        """Adds a pair to the history (for a match added to a round after add_round)"""
+        self._played_pairs.add(frozenset((chess_id_of(player1), chess_id_of(player2))))
 
     def get_player_points(self, player):
         """Get current tournament points for a player"""
@@ -77,33 +143,200 @@ class Tournament:
         if player not in self.player_points:
             self.player_points[player] = 0.0
         self.player_points[player] += points
+        if player in self.standings:
+            self.standings.update(player, self.player_points[player])
 
-    def get_player_rankings(self):
-        """Get players sorted by tournament points (descending)"""
-        return sorted(self.players, key=lambda p: self.get_player_points(p),
-                      reverse=True)
+    def record_results(self, results):
+        """
+        Sets the results of matches of the current round and updates the players' points.
+        results: iterable of (player1, player2, score1, score2), players given as chess_ids or Player objects,
+        in any order. Every result is checked against the round's matches before any is applied:
+        raises ValueError listing the invalid ones. A result entered again replaces the previous one.
+        Returns the number of results recorded.
+        """
+        current_round = self.rounds[-1] if self.rounds else None
+        if not getattr(current_round, "matches", None) or isinstance(current_round, dict):
+            raise ValueError("The current round has no matches!")
+
+        matches = {
+            frozenset((chess_id_of(m.player1), chess_id_of(m.player2))): m for m in current_round.matches
+        }
+        updates = []
+        seen = set()
+        errors = []
+        for number, (player1, player2, score1, score2) in enumerate(results, 1):
+            player1, player2 = chess_id_of(player1), chess_id_of(player2)
+            match = matches.get(frozenset((player1, player2)))
+            if match is None:
+                errors.append(f"Result {number}: no match {player1} vs {player2} in {current_round.name}")
+                continue
+            if (float(score1), float(score2)) not in self.VALID_RESULTS:
+                errors.append(f"Result {number}: invalid score {score1}-{score2}")
+                continue
+            if id(match) in seen:
+                errors.append(f"Result {number}: {player1} vs {player2} is given more than once")
+                continue
+            seen.add(id(match))
+            if chess_id_of(match.player1) != player1:
+                score1, score2 = score2, score1
+            updates.append((match, float(score1), float(score2)))
+        if errors:
+            raise ValueError("\n".join(errors))
+
+        position = len(self.rounds) - 1
+        for match, score1, score2 in updates:
+            # A match without result is 0-0
+            previous = [match.score1, match.score2]
+            self.add_points(match.player1, score1 - previous[0])
+            self.add_points(match.player2, score2 - previous[1])
+            match.set_result(score1, score2)
+            self.pending_events.append({
+                "op": "result_recorded",
+                "round": position,
+                "player1": chess_id_of(match.player1),
+                "player2": chess_id_of(match.player2),
+                "score1": score1,
+                "score2": score2,
+                "previous": previous,
+            })
+
+        # The round is closed when its last result is entered
+        if current_round.end_datetime is None and all(m.score1 + m.score2 > 0 for m in current_round.matches):
+            current_round.end_datetime = datetime.now().strftime(Round.DATETIME_FORMAT)
+            self.pending_events.append({
+                "op": "round_closed", "round": position, "end_datetime": current_round.end_datetime,
+            })
+        return len(updates)
+
+    def verify_points(self):
+        """
+        Checks the players' points against the match history and the byes (see models.points).
+        Returns the drift: a list of (player, points kept, points computed), empty if they match.
+        """
+        return verify_points(self)
+
+    def recompute_points(self):
+        """
+        Sets the players' points from the match history and the byes, and rebuilds the standings.
+        Returns the drift that was corrected (see verify_points()).
+        """
+        computed = compute_points(self)
+        drift = verify_points(self, computed)
+        self.player_points = dict(zip(self.players, computed.tolist()))
+        self.rebuild_standings()
+        return drift
+
+    def rebuild_standings(self):
+        """Rebuilds the standings from the players and their points (e.g. after loading them)"""
+        self.standings = Standings()
+        for player in self.players:
+            self.standings.update(player, self.get_player_points(player))
+
+    def get_player_rankings(self, tiebreaks=False):
+        """
+        Get players sorted by tournament points (descending), in random order for equal points.
+        With tiebreaks=True, equal points are sorted by the tie-breaks (see models.tiebreaks).
+        """
+        if len(self.standings) != len(self.players):
+            # The players were replaced without add_player()
+            self.rebuild_standings()
+        if tiebreaks:
+            return rank_players(self, self.standings)
+        return list(self.standings)
 
     def has_played_against(self, player1, player2):
         """Check if two players have played against each other in previous rounds"""
-        for round_obj in self.rounds:
-            for match in round_obj.matches:
-                if ((match.player1 == player1 and match.player2 == player2) or
-                        (match.player1 == player2 and match.player2 == player1)):
-                    return True
-        return False
+        if self._indexed_rounds != len(self.rounds):
+            # The rounds were replaced without add_round()
+            self.rebuild_pair_history()
+        return frozenset((chess_id_of(player1), chess_id_of(player2))) in self._played_pairs
 
     def generate_pairings(self):
-        """Generate pairings for the next round using Swiss system"""
-        if len(self.rounds) == 0:
-            return self._generate_random_pairings()
+        """Generate pairings for the next round with the tournament's pairing engine (Swiss system)"""
+        pairings, self.bye_player = PAIRING_ENGINES[self.pairing_engine]().pair(self)
+        return pairings
+
+    def is_finished(self):
+        """True if the last round was created and every result of it entered"""
+        if not self.completed or not self.rounds:
+            return False
+        _, _, _, matches = round_rows(self.rounds[-1], len(self.rounds) - 1)
+        return all(score1 + score2 > 0 for _, _, score1, score2 in matches)
+
+    def is_ready_to_advance(self):
+        """True if the next round can be created: rounds left, and every result of the current round entered"""
+        if self.completed or len(self.rounds) >= self.number_of_rounds:
+            return False
+        if not self.rounds:
+            return True
+        _, _, _, matches = round_rows(self.rounds[-1], len(self.rounds) - 1)
+        return all(score1 + score2 > 0 for _, _, score1, score2 in matches)
+
+    def advance_round(self, pairings=None, bye_player=None):
+        """
+        Creates the next round with its matches, gives the bye and marks the tournament as completed
+        after the last round. The pairings are computed with generate_pairings() unless they are given
+        (with the bye_player, e.g. when they were computed in another process).
+        Returns the new Round.
+        """
+        if len(self.rounds) >= self.number_of_rounds:
+            raise ValueError("All the rounds have been played!")
+
+        if pairings is None:
+            pairings = self.generate_pairings()
         else:
-            return self._generate_swiss_pairings()
+            self.bye_player = bye_player
+
+        number = len(self.rounds) + 1
+        new_round = Round(f"Round {number}", player_table=self.player_table)
+        for player1, player2 in pairings:
+            new_round.add_pairing(player1, player2)
+        self.add_round(new_round)
+
+        # Odd number of players: one of them is not paired (and gets the bye points with some engines)
+        bye = self.bye_player if self.awards_byes else None
+        if bye is not None:
+            self.award_bye(bye)
+
+        self.current_round = number
+        if self.current_round >= self.number_of_rounds:
+            self.completed = True
+
+        self.pending_events.append({
+            "op": "round_started",
+            "number": number,
+            "name": new_round.name,
+            "start_datetime": new_round.start_datetime,
+            "matches": [[chess_id_of(player1), chess_id_of(player2)] for player1, player2 in pairings],
+            "bye": None if bye is None else chess_id_of(bye),
+            "completed": self.completed,
+        })
+        return new_round
+
+    @property
+    def awards_byes(self):
+        """Whether the player left unpaired gets BYE_POINTS (depends on the pairing engine, see models.pairing)"""
+        return PAIRING_ENGINES[self.pairing_engine].AWARDS_BYE
+
+    def award_bye(self, player):
+        """Gives the bye points to the player left unpaired in a round"""
+        self.byes.append(chess_id_of(player))
+        self.add_points(player, self.BYE_POINTS)
 
     def _generate_random_pairings(self):
-        """Generate random pairings for round 1"""
+        """Generate random pairings for round 1 (seeded by rating if the tournament's seeding is "rating")"""
         players = self.players.copy()
         random.shuffle(players)
 
+        if self.seeding == "rating":
+            from .ratings import get_rating_engine
+
+            # Sorting is stable: players with the same rating stay in random order
+            ratings = get_rating_engine().ratings_for(players)
+            players.sort(key=lambda p: ratings[chess_id_of(p)], reverse=True)
+            half = len(players) // 2
+            return list(zip(players[:half], players[half:2 * half]))
+
         pairings = []
         for i in range(0, len(players), 2):
             if i + 1 < len(players):
@@ -114,36 +347,28 @@ class Tournament:
         """Generate Swiss system pairings based on current standings"""
         ranked_players = self.get_player_rankings()
         pairings = []
-        used_players = set()
+        # Players not paired yet, best ranked first
+        unpaired = list(ranked_players)
 
-        for i, player1 in enumerate(ranked_players):
-            if player1 in used_players:
-                continue
+        while len(unpaired) > 1:
+            player1 = unpaired.pop(0)
 
             # Find best opponent for this player
-            for j in range(i + 1, len(ranked_players)):
-                player2 = ranked_players[j]
-                if (player2 not in used_players and
-                        not self.has_played_against(player1, player2)):
-                    pairings.append((player1, player2))
-                    used_players.add(player1)
-                    used_players.add(player2)
+            for idx, player2 in enumerate(unpaired):
+                if not self.has_played_against(player1, player2):
                     break
             else:
                 # If no unplayed opponent found, pair with closest available
-                for j in range(i + 1, len(ranked_players)):
-                    player2 = ranked_players[j]
-                    if player2 not in used_players:
-                        pairings.append((player1, player2))
-                        used_players.add(player1)
-                        used_players.add(player2)
-                        break
+                idx = 0
+
+            pairings.append((player1, unpaired.pop(idx)))
 
         return pairings
 
     def serialize(self):
         """Serialize tournament data into JSON-compatible format"""
         return {
+            "uid": self.uid,
             "name": self.name,
             "location": self.location,
             "description": self.description,
@@ -153,9 +378,12 @@ class Tournament:
             "number_of_rounds": self.number_of_rounds,
             "current_round": self.current_round,
             "completed": self.completed,
-            "players": [p.serialize() for p in self.players],
+            "pairing_engine": self.pairing_engine,
+            "seeding": self.seeding,
+            "byes": self.byes,
+            "players": [p.serialize() if hasattr(p, "serialize") else chess_id_of(p) for p in self.players],
             "rounds": [r.serialize() for r in self.rounds],
             "player_points": {
-                str(p): points for p, points in self.player_points.items()
+                chess_id_of(p): points for p, points in self.player_points.items()
             }
         }
\ No newline at end of file
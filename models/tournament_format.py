@@ -0,0 +1,95 @@
+# Key Points
+# Compact file format of the tournaments (version FORMAT_VERSION, written by TournamentManager)
+# Players are listed once, with their points; matches are [player1 chess_id, player2 chess_id, result code]
+# Files are written without indentation
+# expand_tournament_data() turns a compact file back into the normalized schema, other schemas are kept as is
+# journal_seq is the last event of the tournament's journal included in the file (see TournamentManager)
+
+from .player import chess_id_of
+from .round import round_rows
+
+FORMAT_VERSION = 2
+
+# (score1, score2) -> result code; other scores are written as [score1, score2]
+RESULT_CODES = {
+    (0.0, 0.0): "",   # not played yet
+    (1.0, 0.0): "W",  # player1 wins
+    (0.0, 1.0): "L",  # player2 wins
+    (0.5, 0.5): "D",  # draw
+}
+RESULT_SCORES = {code: scores for scores, code in RESULT_CODES.items()}
+
+# Attributes of the tournament written as is
+HEADER_FIELDS = (
+    "uid", "name", "location", "description", "time_control", "start_date", "end_date",
+    "number_of_rounds", "current_round", "completed", "pairing_engine", "seeding",
+)
+
+
+def result_code(score1, score2):
+    return RESULT_CODES.get((float(score1), float(score2)), [score1, score2])
+
+
+def result_scores(code):
+    if isinstance(code, list):
+        return tuple(code)
+    return RESULT_SCORES[code]
+
+
+def compact_tournament(tournament):
+    """Returns the data of a Tournament in the compact format"""
+    data = {"format": FORMAT_VERSION}
+    data.update({field: getattr(tournament, field) for field in HEADER_FIELDS})
+    data["byes"] = tournament.byes
+    data["players"] = [
+        player.serialize() if hasattr(player, "serialize") else chess_id_of(player) for player in tournament.players
+    ]
+    data["points"] = [tournament.get_player_points(player) for player in tournament.players]
+
+    rounds = []
+    for position, round_obj in enumerate(tournament.rounds):
+        name, start, end, matches = round_rows(round_obj, position)
+        rounds.append({
+            "name": name,
+            "start_datetime": start,
+            "end_datetime": end,
+            "matches": [
+                [player1, player2, result_code(score1, score2)] for player1, player2, score1, score2 in matches
+            ],
+        })
+    data["rounds"] = rounds
+    if tournament.journal_seq:
+        data["journal_seq"] = tournament.journal_seq
+    return data
+
+
+def is_compact(data):
+    return data.get("format") == FORMAT_VERSION
+
+
+def expand_tournament_data(data):
+    """Returns the data of a tournament file in the normalized schema (compact files are expanded)"""
+    if not is_compact(data):
+        return data
+
+    expanded = {field: data.get(field) for field in HEADER_FIELDS if field in data}
+    expanded["byes"] = data.get("byes", [])
+    expanded["journal_seq"] = data.get("journal_seq", 0)
+    expanded["players"] = data.get("players", [])
+    expanded["player_points"] = {
+        player["chess_id"] if isinstance(player, dict) else player: points
+        for player, points in zip(expanded["players"], data.get("points", []))
+    }
+    expanded["rounds"] = [
+        {
+            "name": round_data.get("name"),
+            "start_datetime": round_data.get("start_datetime"),
+            "end_datetime": round_data.get("end_datetime"),
+            "matches": [
+                dict(zip(("player1", "player2", "score1", "score2"), (player1, player2) + result_scores(code)))
+                for player1, player2, code in round_data.get("matches", [])
+            ],
+        }
+        for round_data in data.get("rounds", [])
+    ]
+    return expanded
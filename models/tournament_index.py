@@ -0,0 +1,165 @@
+# Key Points
+# The metadata of the tournament files (name, dates, location, status) is kept in a sidecar file
+# of the tournaments folder, with the modification time and size of each tournament file
+# Only the files that changed since the index was written are parsed again
+# The index file name does not end with .json, so it is never read as a tournament
+# The round_started events of a tournament's journal update its current round and status
+
+import json
+import os
+import uuid
+
+from .journal import Journal, write_json_atomic
+
+INDEX_FILENAME = ".index"
+
+
+def legacy_uid(name, start_date, location):
+    """
+    Identifier of a tournament saved before tournaments had one, derived from its name, start date and location
+    so that it is the same every time the tournament is loaded (and once the tournament is saved again).
+    """
+    return uuid.uuid5(uuid.NAMESPACE_URL, json.dumps(["tournament", name, start_date, location])).hex
+
+
+def read_tournament_header(data):
+    """
+    Returns the tournament attributes (all but players, rounds and points) of the JSON data of a tournament.
+    Handles both schemas: flat start_date/end_date/location, or sample dates.from/to and venue.
+    """
+    start_date = data.get("start_date")
+    end_date = data.get("end_date")
+    if not start_date or not end_date:
+        dates = data.get("dates", {})
+        start_date = dates.get("from")
+        end_date = dates.get("to")
+
+    name = data.get("name")
+    location = data.get("location") or data.get("venue")
+    return {
+        "uid": data.get("uid") or legacy_uid(name, start_date, location),
+        "name": name,
+        "location": location,
+        "start_date": start_date,
+        "end_date": end_date,
+        "description": data.get("description", ""),
+        "time_control": data.get("time_control", "rapid"),
+        "number_of_rounds": data.get("number_of_rounds", 4),
+        "current_round": data.get("current_round"),
+        "completed": data.get("completed", False),
+        "pairing_engine": data.get("pairing_engine", "greedy"),
+        "seeding": data.get("seeding", "random"),
+    }
+
+
+def file_signature(filepath):
+    """Modification time and size of a tournament file and of its journal"""
+    signature = []
+    for path in (filepath, Journal(filepath).filepath):
+        try:
+            stat = os.stat(path)
+            signature.extend([stat.st_mtime_ns, stat.st_size])
+        except FileNotFoundError:
+            signature.extend([None, None])
+    return signature
+
+
+class TournamentSummary:
+    """Metadata of a tournament file, enough to list tournaments without loading players and rounds"""
+
+    FIELDS = ("name", "location", "start_date", "end_date", "number_of_rounds", "current_round", "completed")
+
+    def __init__(self, filename, signature, name, location, start_date, end_date, number_of_rounds=4,
+                 current_round=None, completed=False):
+        self.filename = filename
+        self.signature = signature  # [mtime_ns, size] of the file and of its journal
+        self.name = name
+        self.location = location
+        self.start_date = start_date
+        self.end_date = end_date
+        self.number_of_rounds = number_of_rounds
+        self.current_round = current_round
+        self.completed = completed
+
+    def __str__(self):
+        return f"<TournamentSummary {self.name} at {self.location}>"
+
+    @classmethod
+    def from_tournament(cls, filename, signature, tournament):
+        return cls(filename, signature, **{field: getattr(tournament, field) for field in cls.FIELDS})
+
+    def serialize(self):
+        data = {field: getattr(self, field) for field in self.FIELDS}
+        data["signature"] = self.signature
+        return data
+
+
+class TournamentIndex:
+    """Summaries of the tournament files of a folder, by file name"""
+
+    def __init__(self, tournaments_dir):
+        self.tournaments_dir = tournaments_dir
+        self.filepath = os.path.join(tournaments_dir, INDEX_FILENAME)
+        self.entries = {}
+        try:
+            with open(self.filepath) as fp:
+                for filename, data in json.load(fp).items():
+                    self.entries[filename] = TournamentSummary(filename, **data)
+        except (FileNotFoundError, json.JSONDecodeError, TypeError, AttributeError):
+            # Missing or invalid: every file is read by the next refresh()
+            self.entries = {}
+
+    def summaries(self):
+        """Summaries in file name order"""
+        return [self.entries[filename] for filename in sorted(self.entries)]
+
+    def refresh(self):
+        """
+        Updates the index from the files of the folder: only new or modified files are read.
+        Returns the names of the files that were added, modified or removed.
+        """
+        if not os.path.exists(self.tournaments_dir):
+            filenames = []
+        else:
+            filenames = [filename for filename in os.listdir(self.tournaments_dir) if filename.endswith(".json")]
+
+        changed = set(self.entries) - set(filenames)
+        for filename in changed:
+            del self.entries[filename]
+
+        for filename in filenames:
+            filepath = os.path.join(self.tournaments_dir, filename)
+            signature = file_signature(filepath)
+            entry = self.entries.get(filename)
+            if entry is not None and entry.signature == signature:
+                continue
+            changed.add(filename)
+            try:
+                with open(filepath) as fp:
+                    data = json.load(fp)
+                header = read_tournament_header(data)
+                for record in Journal(filepath).records(after=data.get("journal_seq", 0)):
+                    if record["op"] == "round_started":
+                        header["current_round"] = record["number"]
+                        header["completed"] = record["completed"]
+            except (json.JSONDecodeError, FileNotFoundError) as e:
+                print(f"Warning: Could not load tournament from {filename}: {e}")
+                self.entries.pop(filename, None)
+                continue
+            self.entries[filename] = TournamentSummary(
+                filename, signature, **{field: header[field] for field in TournamentSummary.FIELDS}
+            )
+
+        if changed:
+            self.save()
+        return changed
+
+    def update(self, filename, tournament):
+        """Updates the summary of a tournament file that was just written"""
+        signature = file_signature(os.path.join(self.tournaments_dir, filename))
+        self.entries[filename] = TournamentSummary.from_tournament(filename, signature, tournament)
+        self.save()
+
+    def save(self):
+        os.makedirs(self.tournaments_dir, exist_ok=True)
+        write_json_atomic(self.filepath, {filename: entry.serialize() for filename, entry in self.entries.items()})
@@ -1,103 +1,463 @@
 import json
 import os
+import random
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
+from pathlib import Path
+from .player import Player, chess_id_of
+from .player_registry import PlayerRegistry, get_player_registry
 from .tournament import Tournament
-from .round import Round
-from .match import Match
+from .journal import Journal, write_json_atomic
+from .tournament_format import compact_tournament, expand_tournament_data, is_compact
+from .tournament_index import TournamentIndex, TournamentSummary, read_tournament_header
+from .round import Round, round_rows
+
+# Players of loaded tournaments who are in no club but were saved with their data, by chess_id
+# (shared by every tournament)
+_unregistered_players = {}
+
+def _pair_next_round(tournament):
+    """
+    Computes the pairings of a tournament's next round (in a worker of advance_all).
+    Returns the pairs and the bye as positions in tournament.players, as the worker has its own copies of the players.
+    """
+    # Forked workers start with the random state of the parent process
+    random.seed()
+    pairings = tournament.generate_pairings()
+    positions = {id(player): position for position, player in enumerate(tournament.players)}
+    bye = tournament.bye_player
+    return (
+        [(positions[id(player1)], positions[id(player2)]) for player1, player2 in pairings],
+        None if bye is None else positions[id(bye)],
+    )
+
 
 class TournamentManager:
-    """Manages tournament data loading, saving, and operations"""
-    
-    def __init__(self):
-        self.tournaments = []
-        self.tournaments_dir = "data/tournaments"
+    """Manages tournament data loading, saving, and operations
+
+    Tournaments are JSON files of tournaments_dir, unless a storage backend (see models.storage) is given.
+
+    In lazy mode, tournaments are listed from the index of the folder (see models.tournament_index):
+    get_active_tournaments(), get_completed_tournaments() and get_all_tournaments() return
+    TournamentSummary objects, and a tournament file is only read by open_tournament().
+
+    In journaled mode, saving a tournament appends its new events (registrations, rounds, results,
+    see Tournament.pending_events) to a journal next to its file instead of rewriting the file.
+    The file is written again (a snapshot) every SNAPSHOT_EVERY events, and the events recorded
+    since the last snapshot are replayed when the tournament is loaded.
+    """
+
+    EXECUTORS = {"thread": ThreadPoolExecutor, "process": ProcessPoolExecutor}
+    # Number of journal events after which the tournament file is written again
+    SNAPSHOT_EVERY = 500
+
+    def __init__(self, tournaments_dir="data/tournaments", storage=None, ratings=None, lazy=False,
+                 player_registry=None, journaled=False, career_stats=None):
+        self._tournaments = []
+        self.journaled = journaled
+        # Index of the club players, used to resolve the chess_ids of loaded tournaments
+        self._player_registry = player_registry
+        self.tournaments_dir = tournaments_dir
+        self.storage = storage
+        self.ratings = ratings  # RatingEngine updated when a completed tournament is saved
+        self.career_stats = career_stats  # CareerStats updated with the results of a tournament when it is saved
+        self.lazy = lazy and storage is None
+        self.index = TournamentIndex(tournaments_dir) if self.lazy else None
+        self._opened = {}  # file name -> Tournament, in lazy mode
         self.load_tournaments()
-    
+
+    @property
+    def tournaments(self):
+        """
+        All the tournaments. In lazy mode, every file not opened yet is read and kept: to go through
+        the tournaments, use iter_tournaments() (or the index) instead.
+        """
+        if not self.lazy:
+            return self._tournaments
+        tournaments = []
+        for summary in self.index.summaries():
+            try:
+                tournaments.append(self.open_tournament(summary))
+            except (json.JSONDecodeError, FileNotFoundError) as e:
+                print(f"Warning: Could not load tournament from {summary.filename}: {e}")
+        return tournaments
+
+    @tournaments.setter
+    def tournaments(self, tournaments):
+        self._tournaments = tournaments
+
     def load_tournaments(self):
-        """Load all tournaments from JSON files"""
+        """Load all tournaments from JSON files (in lazy mode, only the files that changed are indexed again)"""
+        if self.lazy:
+            for filename in self.index.refresh():
+                self._opened.pop(filename, None)
+            return
+
         # Clear existing tournaments to avoid duplicates
         self.tournaments = []
-        
+
+        if self.storage is not None:
+            self.tournaments = [self._json_to_tournament(data) for data in self.storage.load_tournaments()]
+            return
+
         if not os.path.exists(self.tournaments_dir):
             return
             
         for filename in os.listdir(self.tournaments_dir):
             if filename.endswith('.json'):
-                filepath = os.path.join(self.tournaments_dir, filename)
                 try:
-                    with open(filepath, 'r') as f:
-                        data = json.load(f)
-                        # Convert JSON data to Tournament objects
-                        tournament = self._json_to_tournament(data)
-                        self.tournaments.append(tournament)
+                    tournament = self._load_file(filename)
+                    self.tournaments.append(tournament)
                 except (json.JSONDecodeError, FileNotFoundError) as e:
                     print(f"Warning: Could not load tournament from {filename}: {e}")
                     continue
 
+    def _load_file(self, filename):
+        filepath = os.path.join(self.tournaments_dir, filename)
+        with open(filepath, 'r') as f:
+            data = json.load(f)
+        # Convert JSON data to Tournament objects
+        tournament = self._json_to_tournament(data)
+        self._replay_journal(tournament, filepath)
+        tournament.filename = filename
+        return tournament
+
+    def _replay_journal(self, tournament, filepath):
+        """Applies the events of the tournament's journal that are more recent than its file"""
+        players = {chess_id_of(player): player for player in tournament.players}
+
+        def player_of(chess_id):
+            if chess_id not in players:
+                players[chess_id] = self._resolve_player(chess_id)
+            return players[chess_id]
+
+        for record in Journal(filepath).records(after=tournament.journal_seq):
+            op = record["op"]
+            if op == "player_registered":
+                player = self._resolve_player(record["player"])
+                players[chess_id_of(player)] = player
+                tournament.add_player(player)
+            elif op == "round_started":
+                new_round = tournament.advance_round(
+                    [(player_of(player1), player_of(player2)) for player1, player2 in record["matches"]],
+                    None if record["bye"] is None else player_of(record["bye"]),
+                )
+                new_round.name = record["name"]
+                new_round.start_datetime = record["start_datetime"]
+            elif op == "result_recorded":
+                tournament.record_results([(record["player1"], record["player2"], record["score1"], record["score2"])])
+            elif op == "round_closed":
+                tournament.rounds[record["round"]].end_datetime = record["end_datetime"]
+            tournament.journal_seq = record["seq"]
+            tournament.journal_records += 1
+
+        # The replayed events are already persisted
+        tournament.pending_events = []
+
+    def open_tournament(self, tournament):
+        """
+        Returns the Tournament of a TournamentSummary, reading its file if needed (a Tournament is returned as is)
+        """
+        if not isinstance(tournament, TournamentSummary):
+            return tournament
+        opened = self._opened.get(tournament.filename)
+        if opened is None:
+            opened = self._opened[tournament.filename] = self._load_file(tournament.filename)
+        return opened
+
+    @property
+    def player_registry(self):
+        """The registry of the club players (the shared one, loaded on first use)"""
+        if self._player_registry is None:
+            try:
+                self._player_registry = get_player_registry()
+            except FileNotFoundError:
+                # No clubs folder: every player is unregistered
+                self._player_registry = PlayerRegistry()
+        return self._player_registry
+
+    def _resolve_player(self, player):
+        """
+        Returns the Player of a tournament player given as a chess_id or a serialized player:
+        the club player with this chess_id, or a single Player per chess_id for players in no club.
+        A player in no club known only by its chess_id stays a chess_id (no player data is made up).
+        """
+        chess_id = chess_id_of(player)
+        resolved = self.player_registry.find_by_chess_id(chess_id)
+        if resolved is None:
+            resolved = _unregistered_players.get(chess_id)
+        if resolved is None:
+            if not isinstance(player, dict):
+                return chess_id
+            resolved = _unregistered_players[chess_id] = Player(**player)
+        return resolved
+
     def _json_to_tournament(self, data):
         """Adapt on-disk JSON (supports existing sample schema) to a Tournament object"""
-        # Handle two schemas: new (flat) or sample (dates/from-to, venue)
-        name = data.get("name")
-        location = data.get("location") or data.get("venue")
-        # Dates: either flat start_date/end_date or nested dates.from/to
-        start_date = data.get("start_date")
-        end_date = data.get("end_date")
-        if not start_date or not end_date:
-            dates = data.get("dates", {})
-            start_date = dates.get("from")
-            end_date = dates.get("to")
-
-        number_of_rounds = data.get("number_of_rounds", 4)
-        current_round = data.get("current_round")
-        completed = data.get("completed", False)
-        description = data.get("description", "")
-        time_control = data.get("time_control", "rapid")
-
-        tournament = Tournament(
-            name=name,
-            location=location,
-            start_date=start_date,
-            end_date=end_date,
-            description=description,
-            time_control=time_control,
-            number_of_rounds=number_of_rounds,
-            current_round=current_round,
-            completed=completed,
-        )
-
-        # Players (for now, store raw IDs if sample data provides chess IDs)
-        tournament.players = data.get("players", [])
-
-        # Rounds/matches: keep raw for now; future work can turn into objects
-        tournament.rounds = data.get("rounds", [])
-    
-        # Load player points if available
-        tournament.player_points = data.get("player_points", {})
+        # Handles three schemas: compact (see models.tournament_format), new (flat) or sample (dates/from-to, venue)
+        data = expand_tournament_data(data)
+        tournament = Tournament(**read_tournament_header(data))
+        tournament.byes = data.get("byes", [])
+        tournament.journal_seq = data.get("journal_seq", 0)
+
+        # Players: chess_ids (or serialized players) resolved to shared Player objects
+        players = {}
+        for player in data.get("players", []):
+            resolved = self._resolve_player(player)
+            players[chess_id_of(resolved)] = resolved
+        tournament.players = list(players.values())
+
+        # Rounds: normalized (dict) or legacy (list of matches) schema, see round_rows()
+        for position, round_data in enumerate(data.get("rounds", [])):
+            name, start, end, matches = round_rows(round_data, position)
+            round_obj = Round(name, end_datetime=end, player_table=tournament.player_table)
+            round_obj.start_datetime = start
+            for player1, player2, score1, score2 in matches:
+                if player1 not in players:
+                    players[player1] = self._resolve_player(player1)
+                if player2 not in players:
+                    players[player2] = self._resolve_player(player2)
+                round_obj.add_pairing(players[player1], players[player2], score1, score2)
+            tournament.rounds.append(round_obj)
+        tournament.rebuild_pair_history()
+
+        # Points by chess_id (files saved before they were keyed by "<player name>"), then computed again
+        # from the rounds and the byes: the points of the file that did not match are kept in points_drift.
+        # Files of the sample schema have no points: there is nothing to compare with.
+        points = data.get("player_points", {})
+        tournament.player_points = {
+            player: points.get(chess_id, points.get(str(player), 0.0)) for chess_id, player in players.items()
+        }
+        drift = tournament.recompute_points()
+        tournament.points_drift = drift if "player_points" in data else []
 
         return tournament
 
     def save_tournament(self, tournament):
-        """Persist a tournament to disk using a normalized schema"""
-        os.makedirs(self.tournaments_dir, exist_ok=True)
+        """
+        Persist a tournament to disk in the compact format (see models.tournament_format).
+        A tournament loaded from (or already saved to) a file is written to that file; a new one gets
+        a file named after it. In journaled mode, only the new events are appended to the journal of
+        its file when possible.
+        """
+        if self.storage is not None:
+            self.storage.save_tournament(tournament)
+        else:
+            filename = tournament.filename or self._new_filename(tournament)
+            events = tournament.pending_events
+            if (self.journaled and events and tournament.filename == filename
+                    and tournament.journal_records + len(events) <= self.SNAPSHOT_EVERY):
+                self._append_events(filename, tournament)
+            else:
+                # Other changes than events (or no file yet): the whole tournament is written
+                self._write_file(filename, tournament)
+        if self.career_stats is not None:
+            self.career_stats.update(tournament)
+        tournament.pending_events = []
+
+        if self.ratings is not None and self.ratings.update(tournament):
+            self.ratings.save()
+
+    def _new_filename(self, tournament):
+        """
+        File name of a tournament that was never saved: named after the tournament, with the start of its uid
+        if another tournament with the same name already has this file
+        """
         safe_name = tournament.name.replace(" ", "_").lower()
-        filepath = os.path.join(self.tournaments_dir, f"{safe_name}.json")
-        with open(filepath, "w") as f:
-            json.dump(tournament.serialize(), f, indent=2)
+        filename = f"{safe_name}.json"
+        if os.path.exists(os.path.join(self.tournaments_dir, filename)):
+            filename = f"{safe_name}_{tournament.uid[:8]}.json"
+        return filename
+
+    def _write_file(self, filename, tournament):
+        """Writes a tournament file in the compact format (a snapshot: the journal is not needed anymore)"""
+        os.makedirs(self.tournaments_dir, exist_ok=True)
+        filepath = os.path.join(self.tournaments_dir, filename)
+        write_json_atomic(filepath, compact_tournament(tournament), separators=(",", ":"))
+        Journal(filepath).clear()
+        tournament.filename = filename
+        tournament.journal_records = 0
+        if self.lazy:
+            self.index.update(filename, tournament)
+            self._opened[filename] = tournament
+
+    def _append_events(self, filename, tournament):
+        """Appends the pending events of a tournament to the journal of its file"""
+        events = tournament.pending_events
+        Journal(os.path.join(self.tournaments_dir, filename)).extend(tournament.journal_seq + 1, events)
+        tournament.journal_seq += len(events)
+        tournament.journal_records += len(events)
+        if self.lazy:
+            self.index.update(filename, tournament)
+            self._opened[filename] = tournament
+
+    def migrate_files(self, dry_run=False):
+        """
+        Rewrites the tournament files that are not in the compact format yet (in place, keeping their name).
+        The points are written as computed from the match history and the byes (after the journal is replayed),
+        not copied from the previous file. Returns the names of the files migrated (or to migrate, with dry_run=True).
+        """
+        migrated = []
+        if self.storage is not None or not os.path.exists(self.tournaments_dir):
+            return migrated
+        for filename in sorted(os.listdir(self.tournaments_dir)):
+            if not filename.endswith(".json"):
+                continue
+            with open(os.path.join(self.tournaments_dir, filename)) as f:
+                data = json.load(f)
+            if is_compact(data):
+                continue
+            if not dry_run:
+                tournament = self._json_to_tournament(data)
+                self._replay_journal(tournament, os.path.join(self.tournaments_dir, filename))
+                tournament.recompute_points()
+                self._write_file(filename, tournament)
+            migrated.append(filename)
+        return migrated
+
+    def verify_points(self, fix=False):
+        """
+        Checks the points saved in the tournament files against their match history and byes.
+        Returns {file name: drift} for the files with a drift (see Tournament.verify_points()); with fix=True,
+        these files are written again with the points computed from the history.
+        """
+        drifts = {}
+        if self.storage is not None or not os.path.exists(self.tournaments_dir):
+            return drifts
+        for filename in sorted(os.listdir(self.tournaments_dir)):
+            if not filename.endswith(".json"):
+                continue
+            tournament = self._load_file(filename)
+            if tournament.points_drift:
+                drifts[filename] = tournament.points_drift
+                if fix:
+                    self._write_file(filename, tournament)
+        return drifts
 
     def create_tournament(self, **kwargs):
         """Create, register, and persist a new tournament"""
         tournament = Tournament(**kwargs)
-        self.tournaments.append(tournament)
+        if not self.lazy:
+            self.tournaments.append(tournament)
         self.save_tournament(tournament)
         return tournament
     
+    def get_ready_tournaments(self):
+        """Get tournaments whose next round can be created (see Tournament.is_ready_to_advance)"""
+        opened = (self.open_tournament(t) for t in self.get_active_tournaments())
+        return [t for t in opened if t.is_ready_to_advance()]
+
+    def advance_all(self, workers=None, executor="process"):
+        """
+        Creates the next round of every ready tournament. The pairings are computed in a pool of `workers`
+        processes (or threads, with executor="thread"; by default, one per CPU), then each tournament is
+        saved once. With a single worker (or a single ready tournament), the pairings are computed in this
+        process: a pool only pays off with several CPUs, see benchmarks/advance_all.py.
+        Returns (list of the advanced tournaments, {tournament name: error message}).
+        """
+        ready = self.get_ready_tournaments()
+        advanced = []
+        errors = {}
+        if not ready:
+            return advanced, errors
+
+        serial = min(workers or os.cpu_count() or 1, len(ready)) == 1
+        with nullcontext() if serial else self.EXECUTORS[executor](max_workers=workers) as pool:
+            futures = [
+                (tournament, None if serial else pool.submit(_pair_next_round, tournament)) for tournament in ready
+            ]
+            for tournament, future in futures:
+                try:
+                    if future is None:
+                        tournament.advance_round()
+                    else:
+                        pairings, bye = future.result()
+                        players = tournament.players
+                        tournament.advance_round(
+                            [(players[i], players[j]) for i, j in pairings],
+                            None if bye is None else players[bye],
+                        )
+                    self.save_tournament(tournament)
+                except Exception as e:
+                    errors[tournament.name] = str(e) or e.__class__.__name__
+                else:
+                    advanced.append(tournament)
+        return advanced, errors
+
+    def _listed_tournaments(self):
+        return self.index.summaries() if self.lazy else self.tournaments
+
+    def iter_tournaments(self, key=None, completed=None):
+        """
+        Yields the tournaments one at a time, sorted by key (a function of a Tournament or TournamentSummary)
+        and, if completed is given, only the completed (or not completed) ones. In lazy mode the index is sorted
+        and filtered first, and each file is read when its turn comes, without being kept (unless already opened).
+        """
+        listed = [t for t in self._listed_tournaments() if completed is None or bool(t.completed) == completed]
+        if key is not None:
+            listed.sort(key=key)
+        for tournament in listed:
+            if not self.lazy:
+                yield tournament
+                continue
+            opened = self._opened.get(tournament.filename)
+            if opened is None:
+                try:
+                    opened = self._load_file(tournament.filename)
+                except (json.JSONDecodeError, FileNotFoundError) as e:
+                    print(f"Warning: Could not load tournament from {tournament.filename}: {e}")
+                    continue
+            yield opened
+
     def get_active_tournaments(self):
         """Get tournaments that are not completed"""
-        return [t for t in self.tournaments if not getattr(t, 'completed', False)]
+        return [t for t in self._listed_tournaments() if not getattr(t, 'completed', False)]
     
     def get_completed_tournaments(self):
         """Get completed tournaments"""
-        return [t for t in self.tournaments if getattr(t, 'completed', False)]
+        return [t for t in self._listed_tournaments() if getattr(t, 'completed', False)]
     
     def get_all_tournaments(self):
         """Get all tournaments"""
-        return self.tournaments
\ No newline at end of file
+        return self._listed_tournaments()
+
+    def get_player_tournaments(self, chess_id):
+        """Get the tournaments a player entered (an indexed lookup with a storage backend)"""
+        if self.storage is not None:
+            uids = set(self.storage.tournaments_for_player(chess_id))
+            return [t for t in self.tournaments if t.uid in uids]
+        return [t for t in self.iter_tournaments()
+                if chess_id in [chess_id_of(p) for p in t.players]]
+
+
+_shared_managers = {}
+
+
+def data_file_path(tournaments_dir, filename):
+    """Path of a file of the data folder holding tournaments_dir (e.g. data/ratings.json for data/tournaments)"""
+    return os.path.join(os.path.dirname(os.path.normpath(tournaments_dir)), filename)
+
+
+def get_tournament_manager(tournaments_dir="data/tournaments", **kwargs):
+    """
+    Returns the TournamentManager shared by commands and screens for this folder, so saving
+    a tournament does not load every tournament file again. It is created on the first call (in lazy
+    and journaled modes unless specified), with the ratings (ratings.json next to the folder)
+    updated when a tournament completes, and the players' career statistics (career_stats.json).
+    """
+    key = Path(tournaments_dir).resolve()
+    manager = _shared_managers.get(key)
+    if manager is None:
+        kwargs.setdefault("lazy", True)
+        kwargs.setdefault("journaled", True)
+        manager = _shared_managers[key] = TournamentManager(tournaments_dir, **kwargs)
+        if manager.ratings is None:
+            from .ratings import get_rating_engine
+
+            manager.ratings = get_rating_engine(data_file_path(tournaments_dir, "ratings.json"))
+        if manager.career_stats is None:
+            from .career_stats import get_career_stats
+
+            stats_file = data_file_path(tournaments_dir, "career_stats.json")
+            manager.career_stats = get_career_stats(stats_file, manager.ratings)
+    return manager
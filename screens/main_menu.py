@@ -1,4 +1,4 @@
-from commands import ExitCmd, NoopCmd
+from commands import ExitCmd, GenerateReportCmd, NoopCmd
 from commands.create_tournament import CreateTournament
 
 from .base_screen import BaseScreen
@@ -11,8 +11,8 @@ class MainMenu(BaseScreen):
         # Load clubs if not provided
         if clubs is None:
             try:
-                from models import ClubManager
-                cm = ClubManager()
+                from models import get_club_manager
+                cm = get_club_manager()
                 self.clubs = cm.clubs
             except Exception:
                 self.clubs = []
@@ -24,8 +24,8 @@ class MainMenu(BaseScreen):
             
         # Lazy/optional tournament manager to avoid hard dependency before Step 2
         try:
-            from models.tournament_manager import TournamentManager  # type: ignore
-            self.tournament_manager = TournamentManager()
+            from models.tournament_manager import get_tournament_manager  # type: ignore
+            self.tournament_manager = get_tournament_manager()
         except Exception:
             self.tournament_manager = None
 
@@ -33,14 +33,15 @@ class MainMenu(BaseScreen):
         # Check for active tournaments first (per spec requirement) if manager available
         # But skip auto-redirect if we're coming back from a tournament screen
         if getattr(self, "tournament_manager", None) and not self.skip_auto_redirect:
-            # Reload tournaments to get the latest data
+            # Reload tournaments to get the latest data (only the index of the files that changed)
             self.tournament_manager.load_tournaments()
             active_tournaments = self.tournament_manager.get_active_tournaments()
             if len(active_tournaments) == 1:
                 print(f"Active Tournament: {active_tournaments[0].name}")
                 print("Redirecting to tournament management...")
                 # Store the redirect info for get_command to use
-                self._redirect_to = ("tournament-view", {"tournament": active_tournaments[0]})
+                tournament = self.tournament_manager.open_tournament(active_tournaments[0])
+                self._redirect_to = ("tournament-view", {"tournament": tournament})
                 return None  # Don't return tuple from display()
             elif len(active_tournaments) > 1:
                 print("Multiple active tournaments:")
@@ -67,6 +68,7 @@ class MainMenu(BaseScreen):
             print("Type C to create a club or a club number to view/edit it.")
             print("Type T to create a tournament.")
             print("Type V to view all tournaments.")
+            print("Type R to generate a report of all the players or all the tournaments.")
             print("Type X to exit.")
             value = self.input_string()
             if value.isdigit():
@@ -81,11 +83,25 @@ class MainMenu(BaseScreen):
                 return CreateTournament()
             elif value.upper() == "V":
                 return self._view_all_tournaments()
+            elif value.upper() == "R":
+                return self._generate_report()
             elif value.upper() == "X":
                 return ExitCmd()
             else:
                 print("Invalid choice. Please try again.")
 
+    def _generate_report(self):
+        """Asks for the report (all players or all tournaments) and its format"""
+        from models.reports import REPORTS, WRITERS
+
+        report = ""
+        while report not in REPORTS:
+            report = self.input_string(f"Report ({'/'.join(REPORTS)})", default="players")
+        fmt = ""
+        while fmt not in WRITERS:
+            fmt = self.input_string(f"Format ({'/'.join(WRITERS)})", default="csv")
+        return GenerateReportCmd(report, fmt)
+
     def _view_all_tournaments(self):
         """View all tournaments (active and completed)"""
         if not getattr(self, "tournament_manager", None):
@@ -94,7 +110,7 @@ class MainMenu(BaseScreen):
         
         # Reload tournaments to get the latest data
         self.tournament_manager.load_tournaments()
-        all_tournaments = self.tournament_manager.tournaments
+        all_tournaments = self.tournament_manager.get_all_tournaments()
         
         if not all_tournaments:
             print("No tournaments found.")
@@ -16,6 +16,26 @@ class PlayerView(BaseScreen):
         print("Email:", self.player.email)
         print("Chess ID:", self.player.chess_id)
         print("Birthdate:", self.player.birthday)
+        self.display_career()
+
+    def display_career(self):
+        """Prints the player's career statistics (kept up to date when results are entered, see models.career_stats)"""
+        try:
+            from models.tournament_manager import get_tournament_manager
+
+            stats = get_tournament_manager().career_stats.stats(self.player)
+        except Exception as e:
+            print(f"Career statistics not available: {e}")
+            return
+
+        if stats is None:
+            print("Career: no game played")
+            return
+        print(
+            f"Career: {stats['tournaments']} tournaments, {stats['games']} games "
+            f"(+{stats['wins']} ={stats['draws']} -{stats['losses']}), {stats['points']:g} points, "
+            f"performance {stats['performance']}"
+        )
 
     def get_command(self):
         while True:
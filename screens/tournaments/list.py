@@ -1,5 +1,5 @@
 from ..base_screen import BaseScreen
-from commands import NoopCmd
+from commands import AdvanceAllCmd, NoopCmd
 from commands.create_tournament import CreateTournament
 
 class TournamentList(BaseScreen):
@@ -16,6 +16,7 @@ class TournamentList(BaseScreen):
         while True:
             print("\nEnter tournament number to view/manage, or:")
             print("C - Create new tournament")
+            print("A - Advance every ready tournament to its next round")
             print("B - Back to main menu")
             
             choice = self.input_string("Your choice")
@@ -23,11 +24,16 @@ class TournamentList(BaseScreen):
             if choice.isdigit():
                 idx = int(choice) - 1
                 if 0 <= idx < len(self.tournaments):
-                    return NoopCmd("tournament-view", tournament=self.tournaments[idx])
+                    # The list may hold summaries: the tournament is read when it is opened
+                    from models.tournament_manager import get_tournament_manager
+                    tournament = get_tournament_manager().open_tournament(self.tournaments[idx])
+                    return NoopCmd("tournament-view", tournament=tournament)
                 else:
                     print("Invalid tournament number. Please try again.")
             elif choice.upper() == "C":
                 return CreateTournament()
+            elif choice.upper() == "A":
+                return AdvanceAllCmd()
             elif choice.upper() == "B":
                 return NoopCmd("main-menu", skip_auto_redirect=True)
             else:
@@ -37,12 +37,19 @@ class MatchResults(BaseScreen):
             return NoopCmd("tournament-view", tournament=self.tournament)
         
         print("\nEnter match number to update result, or:")
+        print("I - Import the round results from a CSV/JSONL file")
         print("B - Back to tournament view")
         
         choice = self.input_string("Your choice")
         
         if choice.upper() == "B":
             return NoopCmd("tournament-view", tournament=self.tournament)
+
+        if choice.upper() == "I":
+            from commands import ImportResultsCmd
+            print("Columns: player1, player2 (chess IDs) and score1, score2 or result (1-0, 0-1, 1/2-1/2)")
+            filepath = self.input_string("Results file", empty=True)
+            return ImportResultsCmd(self.tournament, filepath)
         
         if choice.isdigit():
             match_idx = int(choice) - 1
@@ -62,19 +69,13 @@ class MatchResults(BaseScreen):
         result = self.input_string("Result (1/2/3)")
         
         if result == "1":
-            match.set_result(1, 0)
-            self.tournament.add_points(match.player1, 1.0)
-            self.tournament.add_points(match.player2, 0.0)
+            self.tournament.record_results([(match.player1, match.player2, 1, 0)])
             print(f"{match.player1} wins!")
         elif result == "2":
-            match.set_result(0, 1)
-            self.tournament.add_points(match.player1, 0.0)
-            self.tournament.add_points(match.player2, 1.0)
+            self.tournament.record_results([(match.player1, match.player2, 0, 1)])
             print(f"{match.player2} wins!")
         elif result == "3":
-            match.set_result(0.5, 0.5)
-            self.tournament.add_points(match.player1, 0.5)
-            self.tournament.add_points(match.player2, 0.5)
+            self.tournament.record_results([(match.player1, match.player2, 0.5, 0.5)])
             print("Draw!")
         else:
             print("Invalid choice")
@@ -82,8 +83,8 @@ class MatchResults(BaseScreen):
         
         # Save the tournament
         try:
-            from models.tournament_manager import TournamentManager
-            TournamentManager().save_tournament(self.tournament)
+            from models.tournament_manager import get_tournament_manager
+            get_tournament_manager().save_tournament(self.tournament)
             print("Result saved!")
         except Exception:
             print("Could not save result")
\ No newline at end of file
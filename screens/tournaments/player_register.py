@@ -2,6 +2,9 @@ from ..base_screen import BaseScreen
 
 
 class PlayerRegister(BaseScreen):
+    # Maximum number of players listed for a name search
+    SEARCH_LIMIT = 50
+
     def __init__(self, tournament):
         self.tournament = tournament
 
@@ -76,43 +79,24 @@ class PlayerRegister(BaseScreen):
     def _find_player_by_chess_id(self, chess_id):
         """Find a player by Chess ID across all clubs"""
         try:
-            from models.club_manager import ClubManager
-            club_manager = ClubManager()
-            
-            for club in club_manager.clubs:
-                for player in club.players:
-                    if player.chess_id == chess_id:
-                        return player
-            return None
+            from models.player_registry import get_player_registry
+            return get_player_registry().find_by_chess_id(chess_id)
         except Exception:
             return None
 
     def _find_players_by_name(self, name_part):
         """Find players by partial name match (case insensitive)"""
         try:
-            from models.club_manager import ClubManager
-            club_manager = ClubManager()
-            matching_players = []
-            
-            name_lower = name_part.lower()
-            for club in club_manager.clubs:
-                for player in club.players:
-                    if name_lower in player.name.lower():
-                        matching_players.append(player)
-            return matching_players
+            from models.player_registry import get_player_registry
+            return get_player_registry().search_by_name(name_part, limit=self.SEARCH_LIMIT)
         except Exception:
             return []
 
     def _get_all_available_players(self):
         """Get all players from all clubs"""
         try:
-            from models.club_manager import ClubManager
-            club_manager = ClubManager()
-            all_players = []
-            
-            for club in club_manager.clubs:
-                all_players.extend(club.players)
-            return all_players
+            from models.player_registry import get_player_registry
+            return list(get_player_registry())
         except Exception:
             return []
 
@@ -158,26 +142,6 @@ class PlayerRegister(BaseScreen):
 
     def _register_player(self, player):
         """Register a player for the tournament"""
-        from commands import NoopCmd
-        
-        if player in self.tournament.players:
-            print(f"{player.name} is already registered for this tournament.")
-            input("Press Enter to continue")
-            return NoopCmd("tournament-view", tournament=self.tournament)
-        
-        try:
-            # Add player to tournament
-            self.tournament.add_player(player)
-            
-            # Persist change
-            from models.tournament_manager import TournamentManager
-            TournamentManager().save_tournament(self.tournament)
-            
-            print(f"✅ {player.name} ({player.chess_id}) successfully registered!")
-            input("Press Enter to continue")
-            
-        except Exception as e:
-            print(f"❌ Could not register player: {e}")
-            input("Press Enter to continue")
-        
-        return NoopCmd("tournament-view", tournament=self.tournament)
\ No newline at end of file
+        from commands import RegisterPlayerCmd
+
+        return RegisterPlayerCmd(self.tournament, player.chess_id)
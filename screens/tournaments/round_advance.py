@@ -27,32 +27,20 @@ class RoundAdvance(BaseScreen):
         
         choice = self.input_string("Advance round? (Y/N)")
         if choice.upper() == "Y":
-            from models.round import Round
-            from models.match import Match
-            
-            new_round = Round(f"Round {current_round_num + 1}")
-            
-            # Generate pairings for this round
-            pairings = self.tournament.generate_pairings()
-            
-            # Create matches from pairings
-            for player1, player2 in pairings:
-                match = Match(player1, player2)
-                new_round.add_match(match)
-            
-            # Add the round to tournament
-            self.tournament.add_round(new_round)
-            self.tournament.current_round = current_round_num + 1
-            
-            # Check if tournament is complete
-            if self.tournament.current_round >= self.tournament.number_of_rounds:
-                self.tournament.completed = True
+            # Pairings, matches, bye and completion
+            self.tournament.advance_round()
+
+            if self.tournament.bye_player is not None and self.tournament.awards_byes:
+                print(f"{self.tournament.bye_player} gets a bye ({self.tournament.BYE_POINTS} point)")
+            elif self.tournament.bye_player is not None:
+                print(f"{self.tournament.bye_player} sits out this round (no points)")
+            if self.tournament.completed:
                 print("Tournament completed!")
             
             # Save the tournament
             try:
-                from models.tournament_manager import TournamentManager
-                TournamentManager().save_tournament(self.tournament)
+                from models.tournament_manager import get_tournament_manager
+                get_tournament_manager().save_tournament(self.tournament)
                 print("Round advanced successfully!")
             except Exception:
                 print("Could not save tournament")
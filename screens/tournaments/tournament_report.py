@@ -10,12 +10,62 @@ class TournamentReport(BaseScreen):
         print(f"Location: {self.tournament.location}")
         print(f"Dates: {self.tournament.start_date} to {self.tournament.end_date}")
         print(f"Rounds: {len(self.tournament.rounds)} | Current: {self.tournament.current_round}")
-        print(f"Players ({len(self.tournament.players)}): {self.tournament.players}")
-        print("\n(Stub) Full report generation will be implemented later.")
+        self.display_players()
+        self.display_standings()
+        self.display_rounds()
+
+    def display_players(self):
+        """Prints the players in alphabetical order"""
+        from models.reports import tournament_players_report
+
+        print(f"\nPlayers ({len(self.tournament.players)}):")
+        for name, chess_id, points, _ in tournament_players_report(self.tournament).rows:
+            print(f"  {name} ({chess_id}): {points:g}")
+
+    def display_rounds(self):
+        """Prints the rounds with their matches"""
+        from models.reports import rounds_report
+
+        current = None
+        for name, start, end, _, player1, _, player2, score1, score2 in rounds_report(self.tournament).rows:
+            if name != current:
+                current = name
+                print(f"\n{name} ({start or '?'} - {end or 'in progress'})")
+            result = f"{score1:g}-{score2:g}" if score1 + score2 else "not played"
+            print(f"  {player1} vs {player2}: {result}")
+
+    def display_standings(self):
+        """Prints the players ranked by points and tie-breaks"""
+        from models.player import chess_id_of
+        from models.tiebreaks import compute_tiebreaks
+
+        try:
+            ranked = self.tournament.get_player_rankings(tiebreaks=True)
+            values = compute_tiebreaks(self.tournament, ranked)
+        except Exception as e:
+            print(f"Could not compute the standings: {e}")
+            return
+
+        print("\nStandings:")
+        print(f"{'#':>4} {'Player':<12} {'Pts':>5} {'Buch':>6} {'Med':>6} {'SB':>6} {'Cum':>6}")
+        for position, player in enumerate(ranked):
+            print(
+                f"{position + 1:>4} {chess_id_of(player):<12} {values['points'][position]:>5g} "
+                f"{values['buchholz'][position]:>6g} {values['median_buchholz'][position]:>6g} "
+                f"{values['sonneborn_berger'][position]:>6g} {values['cumulative'][position]:>6g}"
+            )
 
     def get_command(self):
-        from commands import NoopCmd
-        _ = self.input_string("Press Enter to go back")
-        return NoopCmd("tournament-view", tournament=self.tournament)
+        from commands import GenerateReportCmd, NoopCmd
+        from models.reports import TOURNAMENT_REPORTS, WRITERS
+
+        print(f"Type {'/'.join(TOURNAMENT_REPORTS)} to save a report in the reports folder.")
+        report = self.input_string("Report (Enter to go back)")
+        if report not in TOURNAMENT_REPORTS:
+            return NoopCmd("tournament-view", tournament=self.tournament)
+        fmt = ""
+        while fmt not in WRITERS:
+            fmt = self.input_string(f"Format ({'/'.join(WRITERS)})", default="csv")
+        return GenerateReportCmd(report, fmt, tournament=self.tournament)
 
 
@@ -0,0 +1,84 @@
+"""
+Imports the JSON data (data/clubs and data/tournaments) into a SQLite database,
+or exports a SQLite database back to the JSON files layout.
+"""
+import argparse
+import json
+import os
+import sys
+
+from models import ClubManager
+from models.sqlite_storage import SQLiteStorage
+from models.tournament_manager import TournamentManager
+
+
+def import_json(database, clubs_dir, tournaments_dir):
+    """Copies every club and tournament of the JSON files into the database"""
+    storage = SQLiteStorage(database)
+    if storage.club_versions():
+        print(f"{database} already contains clubs: import into a new database.")
+        return 1
+
+    clubs = ClubManager(clubs_dir).clubs
+    for club in clubs:
+        club.club_id = storage.create_club(club.name)
+        storage.save_club(club)
+
+    # The tournament files are read one at a time. Files of the same tournament (same uid, e.g. the same
+    # tournament in two schemas) would overwrite each other: only the first one is imported
+    imported = {}
+    skipped = 0
+    for tournament in TournamentManager(tournaments_dir, lazy=True).iter_tournaments(key=lambda t: t.filename):
+        if tournament.uid in imported:
+            print(f"Skipped {tournament.filename}: same tournament ({tournament.name}, uid {tournament.uid}) "
+                  f"as {imported[tournament.uid]}")
+            skipped += 1
+            continue
+        storage.save_tournament(tournament)
+        imported[tournament.uid] = tournament.filename
+
+    storage.close()
+    skipped = f" ({skipped} files skipped)" if skipped else ""
+    print(f"Imported {len(clubs)} clubs and {len(imported)} tournaments{skipped} into {database}")
+    return 0
+
+
+def export_json(database, clubs_dir, tournaments_dir):
+    """Writes every club and tournament of the database as JSON files"""
+    storage = SQLiteStorage(database)
+    os.makedirs(clubs_dir, exist_ok=True)
+    os.makedirs(tournaments_dir, exist_ok=True)
+
+    clubs = ClubManager(storage=storage).clubs
+    for club in clubs:
+        filepath = os.path.join(clubs_dir, club.name.replace(" ", "") + ".json")
+        with open(filepath, "w") as fp:
+            json.dump({"name": club.name, "players": [p.serialize() for p in club.players]}, fp)
+
+    tournaments = storage.load_tournaments()
+    filenames = set()
+    for data in tournaments:
+        safe_name = data["name"].replace(" ", "_").lower()
+        filename = f"{safe_name}.json"
+        if filename in filenames:
+            # Several tournaments have this name
+            filename = f"{safe_name}_{data['uid'][:8]}.json"
+        filenames.add(filename)
+        with open(os.path.join(tournaments_dir, filename), "w") as fp:
+            json.dump(data, fp, indent=2)
+
+    storage.close()
+    print(f"Exported {len(clubs)} clubs and {len(tournaments)} tournaments from {database}")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import/export the chess data to/from a SQLite database.")
+    parser.add_argument("action", choices=["import", "export"], help="import JSON files, or export to JSON files")
+    parser.add_argument("database", type=str, nargs="?", default="data/chess.db", help="SQLite database file")
+    parser.add_argument("--clubs", type=str, default="data/clubs", help="clubs folder")
+    parser.add_argument("--tournaments", type=str, default="data/tournaments", help="tournaments folder")
+
+    args = parser.parse_args()
+    action = import_json if args.action == "import" else export_json
+    sys.exit(action(args.database, args.clubs, args.tournaments))
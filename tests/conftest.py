@@ -0,0 +1,19 @@
+import random
+
+import pytest
+
+from models import player_registry
+
+
+@pytest.fixture(autouse=True)
+def seed():
+    """The pairings and the results of the tests are random, but the same on every run"""
+    random.seed(0)
+
+
+@pytest.fixture(autouse=True)
+def registry():
+    """Clubs index their players in the process-wide registry: every test starts and ends with an empty one"""
+    player_registry.registry.clear()
+    yield player_registry.registry
+    player_registry.registry.clear()
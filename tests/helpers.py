@@ -0,0 +1,33 @@
+"""Builders of players and tournaments shared by the tests"""
+import random
+
+from models.player import Player
+from models.tournament import Tournament
+
+RESULTS = [(1.0, 0.0), (0.0, 1.0), (0.5, 0.5)]
+
+
+def make_players(count, prefix="TS"):
+    return [Player(f"Player {i}", f"player{i}@example.com", f"{prefix}{i:05d}", "01-01-1990") for i in range(count)]
+
+
+def make_tournament(players, number_of_rounds=5, pairing_engine="greedy", name="Test Open", end_date="02-01-2024",
+                    **kwargs):
+    tournament = Tournament(name, "Nowhere", "01-01-2024", end_date, number_of_rounds=number_of_rounds,
+                            pairing_engine=pairing_engine, **kwargs)
+    for player in players:
+        tournament.add_player(player)
+    return tournament
+
+
+def play_round(tournament, manager=None):
+    """Creates the next round and enters random results (saving after each step with a manager)"""
+    new_round = tournament.advance_round()
+    if manager is not None:
+        manager.save_tournament(tournament)
+    tournament.record_results(
+        (match.player1, match.player2, *random.choice(RESULTS)) for match in new_round.matches
+    )
+    if manager is not None:
+        manager.save_tournament(tournament)
+    return new_round
@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+from models.career_stats import CareerStats, get_career_stats
+from models.player_registry import PlayerRegistry
+from models.tournament_manager import TournamentManager
+
+from .helpers import make_players, make_tournament, play_round
+
+
+@pytest.fixture
+def players():
+    return make_players(7, prefix="CS")
+
+
+@pytest.fixture
+def manager(tmp_path, players):
+    registry = PlayerRegistry()
+    for player in players:
+        registry.add(player)
+    return TournamentManager(tmp_path / "tournaments", player_registry=registry, journaled=True,
+                             career_stats=CareerStats(tmp_path / "career_stats.json"))
+
+
+def play_tournament(players, name, played=3, manager=None):
+    tournament = make_tournament(players, number_of_rounds=3, pairing_engine="weighted", name=name)
+    if manager is not None:
+        manager.save_tournament(tournament)
+    for _ in range(played):
+        play_round(tournament, manager)
+    return tournament
+
+
+def test_incremental_stats_match_the_build(tmp_path, manager, players):
+    finished = play_tournament(players, "Open", manager=manager)
+    unfinished = play_tournament(players, "Cup", played=2, manager=manager)
+    # A result entered again replaces the previous one
+    match = unfinished.rounds[-1].matches[0]
+    unfinished.record_results([(match.player1, match.player2, 0.5, 0.5)])
+    manager.save_tournament(unfinished)
+
+    stats = manager.career_stats
+    assert stats.finished == {finished.uid}
+    built = CareerStats()
+    built.build(TournamentManager(manager.tournaments_dir, player_registry=manager.player_registry).iter_tournaments())
+    assert built.finished == stats.finished
+    assert [built.stats(p) for p in players] == [stats.stats(p) for p in players]
+    assert {stats.stats(p)["tournaments"] for p in players} == {1}
+    assert sum(stats.stats(p)["games"] for p in players) == 2 * (3 + 2) * 3
+
+    # Saved file and journal
+    loaded = CareerStats(tmp_path / "career_stats.json")
+    loaded.load()
+    assert loaded.finished == stats.finished
+    assert [loaded.stats(p) for p in players] == [stats.stats(p) for p in players]
+
+
+def test_tournaments_with_the_same_name_are_counted(players):
+    tournaments = [play_tournament(players, "Open") for _ in range(2)]
+    stats = CareerStats()
+    stats.build(tournaments)
+    assert stats.finished == {tournament.uid for tournament in tournaments}
+    assert {stats.stats(p)["tournaments"] for p in players} == {2}
+
+
+def test_stats_are_not_built_implicitly(tmp_path):
+    assert len(get_career_stats(tmp_path / "missing.json")) == 0
+
+    with open(tmp_path / "previous.json", "w") as fp:
+        json.dump({"finished": ["Open"], "players": {"CS00000": [1, 1, 0, 0, 1, 1, 1500]}}, fp)
+    with pytest.raises(ValueError):
+        CareerStats(tmp_path / "previous.json").load()
+    assert len(get_career_stats(tmp_path / "previous.json")) == 0
@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+from models.club import ChessClub
+from models.club_manager import ClubManager
+
+
+def player_data(i):
+    return {"name": f"Player {i}", "email": f"player{i}@example.com", "chess_id": f"JN{i:05d}",
+            "birthday": "01-01-1990"}
+
+
+@pytest.fixture
+def club(tmp_path):
+    return ClubManager(tmp_path, journaled=True).create("Batch Club")
+
+
+def reload(club):
+    return ChessClub(club.filepath, journaled=True)
+
+
+def serialized(club):
+    return [player.serialize() for player in club.players]
+
+
+def test_batch_is_written_once(club):
+    club.create_player(**player_data(0))
+    with club.batch():
+        with club.batch():
+            club.create_player(**player_data(1))
+        club.update_player(club.players[0], name="Renamed")
+        assert club.journal_seq == 1
+
+    # The batch is written as a snapshot, the journal is gone
+    assert not club.journal.exists()
+    with open(club.filepath) as fp:
+        assert json.load(fp)["players"] == serialized(club)
+
+
+def test_failed_batch_is_rolled_back(club, registry):
+    first = club.create_player(**player_data(0))
+    journal = club.journal.filepath.read_bytes()
+    with pytest.raises(ValueError):
+        with club.batch():
+            club.create_player(**player_data(1))
+            club.update_player(first, name="Renamed", email="renamed@example.com")
+            club.update_player(first, birthday="not a date")
+
+    assert serialized(club) == [player_data(0)]
+    assert registry.find_by_chess_id("JN00001") is None
+    assert registry.find_by_email("player0@example.com") is first
+    # Nothing was written
+    assert club.journal.filepath.read_bytes() == journal
+    assert serialized(reload(club)) == [player_data(0)]
+
+
+def test_bulk_create_adds_all_players_or_none(club, registry):
+    club.create_player(**player_data(0))
+    with pytest.raises(ValueError):
+        club.bulk_create_players([player_data(1), player_data(0)])
+    assert len(club.players) == 1
+    assert registry.find_by_chess_id("JN00001") is None
+
+    club.bulk_create_players([player_data(i) for i in range(1, 4)])
+    assert [player["chess_id"] for player in serialized(reload(club))] == [f"JN{i:05d}" for i in range(4)]
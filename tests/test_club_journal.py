@@ -0,0 +1,83 @@
+import json
+
+import pytest
+
+from models.club import ChessClub
+from models.club_manager import ClubManager
+
+
+def player_data(i):
+    return {"name": f"Player {i}", "email": f"player{i}@example.com", "chess_id": f"JN{i:05d}",
+            "birthday": "01-01-1990"}
+
+
+@pytest.fixture
+def club(tmp_path):
+    return ClubManager(tmp_path, journaled=True).create("Journal Club")
+
+
+def reload(club):
+    return ChessClub(club.filepath, journaled=True)
+
+
+def serialized(club):
+    return [player.serialize() for player in club.players]
+
+
+def test_changes_are_appended_then_replayed(club):
+    players = [club.create_player(**player_data(i)) for i in range(3)]
+    club.update_player(players[1], name="Renamed", email="renamed@example.com")
+
+    # The JSON file is untouched: the changes are only in the journal
+    with open(club.filepath) as fp:
+        assert json.load(fp)["players"] == []
+    assert [record["op"] for record in club.journal.records()] == ["create"] * 3 + ["update"]
+
+    loaded = reload(club)
+    assert serialized(loaded) == serialized(club)
+    assert loaded.journal_seq == 4
+    assert loaded._pending_records == 4
+
+
+def test_interrupted_write_is_dropped_and_truncated(club):
+    club.create_player(**player_data(0))
+    expected = serialized(club)
+    size = club.journal.filepath.stat().st_size
+    # A crash in the middle of the next write leaves half a record
+    with open(club.journal.filepath, "a") as fp:
+        fp.write('{"op":"create","player":{"name":"Half')
+
+    loaded = reload(club)
+    assert serialized(loaded) == expected
+    assert club.journal.filepath.stat().st_size == size
+
+    # The next records are appended after the last complete one
+    loaded.create_player(**player_data(1))
+    assert [player["chess_id"] for player in serialized(reload(club))] == ["JN00000", "JN00001"]
+
+
+def test_records_already_compacted_are_not_replayed(club):
+    for i in range(3):
+        club.create_player(**player_data(i))
+    journal = club.journal.filepath.read_bytes()
+    club.compact()
+    assert not club.journal.exists()
+
+    # A crash after the snapshot was written but before the journal was removed
+    club.journal.filepath.write_bytes(journal)
+    loaded = reload(club)
+    assert serialized(loaded) == serialized(club)
+    assert loaded._pending_records == 0
+
+
+def test_journal_is_compacted_every_compact_every_records(club, monkeypatch):
+    monkeypatch.setattr(ChessClub, "COMPACT_EVERY", 3)
+    for i in range(4):
+        club.create_player(**player_data(i))
+
+    with open(club.filepath) as fp:
+        data = json.load(fp)
+    assert [player["chess_id"] for player in data["players"]] == ["JN00000", "JN00001", "JN00002"]
+    assert data["journal_seq"] == 3
+    assert [record["seq"] for record in club.journal.records()] == [4]
+    assert serialized(reload(club)) == serialized(club)
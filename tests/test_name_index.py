@@ -0,0 +1,62 @@
+import random
+import statistics
+import time
+
+from benchmarks.name_index import make_names
+from models.name_index import NameIndex, normalize_name
+
+
+def full_scan(names, query, limit=None):
+    """The ranking of NameIndex, computed over every name"""
+    query = normalize_name(query)
+    ranked = sorted((NameIndex._rank(query, name), name, key) for key, name in names.items() if query in name)
+    return [key for _, _, key in ranked[:limit]]
+
+
+def test_search_matches_a_full_scan():
+    index = NameIndex()
+    names = {}
+    for key, name in enumerate(make_names(3000, seed=1)):
+        index.add(key, name, key)
+        names[key] = normalize_name(name)
+    index.search("a")
+
+    # Changes after the first search update the sorted lists
+    for key in random.sample(sorted(names), 300):
+        if random.random() < 0.5:
+            index.remove(key)
+            del names[key]
+        else:
+            index.add(key, "Élise Marie Anne", key)
+            names[key] = "elise marie anne"
+
+    assert len(index) == len(names)
+    for query in ["a", "E", "é", "ma", "an", "zz", "mar", "jean", "anne", "ie a", "marie anne", "elise marie anne"]:
+        for limit in (None, 1, 5, 50):
+            assert index.search(query, limit) == full_scan(names, query, limit), (query, limit)
+
+
+def test_results_are_ranked():
+    index = NameIndex()
+    for key, name in enumerate(["Dianne Lee", "Anne Smith", "Marie-Anne Roy", "Jean Anne", "Anne"]):
+        index.add(key, name, name)
+
+    assert index.search("anne") == ["Anne", "Anne Smith", "Jean Anne", "Dianne Lee", "Marie-Anne Roy"]
+    assert index.search("an", limit=3) == ["Anne", "Anne Smith", "Jean Anne"]
+    assert index.search(" ") == []
+    assert index.search("a", limit=0) == []
+
+
+def test_short_queries_stop_at_the_limit():
+    index = NameIndex()
+    for key, name in enumerate(make_names(20000, seed=2)):
+        index.add(key, name, key)
+    index.search("a", 1)
+
+    # A full scan of the names takes several milliseconds: short queries read the sorted names instead
+    times = []
+    for query in ["a", "m", "e", "ma", "an", "je"] * 5:
+        start = time.perf_counter()
+        assert len(index.search(query, limit=20)) == 20
+        times.append(time.perf_counter() - start)
+    assert statistics.median(times) < 0.002
@@ -0,0 +1,94 @@
+import pytest
+
+from models.pairing import WeightedPairing
+from models.player import chess_id_of
+
+from .helpers import make_players, make_tournament, play_round
+
+
+def matching_cost(engine, tournament, pairs):
+    """Cost of pairs of players, as computed by the weighted engine"""
+    balances = engine._colour_balances(tournament)
+    total = 0
+    for pair in pairs:
+        points = [tournament.get_player_points(player) for player in pair]
+        keys = [chess_id_of(player) for player in pair]
+        colours = [balances.get(key, 0) for key in keys]
+        total += engine._pair_cost(tournament, points, keys, colours, 0, 1)
+    return total
+
+
+def perfect_matchings(players):
+    if not players:
+        yield []
+        return
+    first, rest = players[0], players[1:]
+    for position, partner in enumerate(rest):
+        for matching in perfect_matchings(rest[:position] + rest[position + 1:]):
+            yield [(first, partner)] + matching
+
+
+@pytest.mark.parametrize("count", [4, 6, 7])
+@pytest.mark.parametrize("played", [1, 2, 3])
+def test_weighted_pairing_is_optimal_for_small_rounds(count, played):
+    tournament = make_tournament(make_players(count), number_of_rounds=played + 1, pairing_engine="weighted")
+    for _ in range(played):
+        play_round(tournament)
+
+    engine = WeightedPairing()
+    pairings, bye = engine.pair(tournament)
+    paired = [player for pair in pairings for player in pair]
+    players = [player for player in tournament.players if player is not bye]
+    assert sorted(map(chess_id_of, paired)) == sorted(map(chess_id_of, players))
+
+    best = min(matching_cost(engine, tournament, matching) for matching in perfect_matchings(players))
+    assert matching_cost(engine, tournament, pairings) == best
+
+
+def test_weighted_pairing_avoids_rematches():
+    tournament = make_tournament(make_players(8), number_of_rounds=4, pairing_engine="weighted")
+    for _ in range(4):
+        pairings, _ = WeightedPairing().pair(tournament)
+        assert not any(tournament.has_played_against(player1, player2) for player1, player2 in pairings)
+        play_round(tournament)
+
+
+def test_weighted_bye_goes_once_to_each_player_with_points():
+    tournament = make_tournament(make_players(5), number_of_rounds=5, pairing_engine="weighted")
+    players = {chess_id_of(player): player for player in tournament.players}
+    for _ in range(5):
+        before = {player: tournament.get_player_points(player) for player in tournament.players}
+        new_round = play_round(tournament)
+        bye = players[tournament.byes[-1]]
+        assert bye not in {player for match in new_round.matches for player in (match.player1, match.player2)}
+        assert tournament.get_player_points(bye) == before[bye] + tournament.BYE_POINTS
+
+    assert len(set(tournament.byes)) == 5
+    assert tournament.verify_points() == []
+
+
+def test_greedy_unpaired_player_gets_no_points():
+    tournament = make_tournament(make_players(5), number_of_rounds=1)
+    new_round = play_round(tournament)
+
+    paired = {chess_id_of(player) for match in new_round.matches for player in (match.player1, match.player2)}
+    unpaired = [player for player in tournament.players if chess_id_of(player) not in paired]
+    assert len(unpaired) == 1
+    assert tournament.get_player_points(unpaired[0]) == 0
+    assert tournament.byes == []
+    assert tournament.verify_points() == []
+
+
+@pytest.mark.parametrize("engine", ["greedy", "weighted"])
+def test_first_round_seeded_by_rating(monkeypatch, engine):
+    class Ratings:
+        def ratings_for(self, players):
+            return {chess_id_of(player): 1000 + int(chess_id_of(player)[2:]) for player in players}
+
+    monkeypatch.setattr("models.ratings.get_rating_engine", Ratings)
+    tournament = make_tournament(make_players(7), number_of_rounds=1, pairing_engine=engine, seeding="rating")
+    new_round = play_round(tournament)
+
+    pairs = sorted((chess_id_of(match.player1), chess_id_of(match.player2)) for match in new_round.matches)
+    assert pairs == [("TS00004", "TS00001"), ("TS00005", "TS00002"), ("TS00006", "TS00003")]
+    assert tournament.byes == (["TS00000"] if engine == "weighted" else [])
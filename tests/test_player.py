@@ -0,0 +1,42 @@
+from commands import PlayerUpdateCmd
+from models.club_manager import ClubManager
+from models.player import Player
+from models.tournament_manager import TournamentManager
+
+from .helpers import make_tournament
+
+
+def test_edited_player_is_still_found_in_dicts(tmp_path, registry):
+    club = ClubManager(tmp_path).create("Test Club")
+    player = club.create_player(name="Ann", email="ann@example.com", chess_id="PL00001", birthday="01-01-1990")
+    points = {player: 1.5}
+    club.update_player(player, name="Anna", email="anna@example.com", birthday="02-02-1992")
+    assert points[player] == 1.5
+    assert player in set(points)
+    assert registry.find_by_email("anna@example.com") is player
+
+
+def test_players_are_identified_by_chess_id():
+    player = Player("Ann", "ann@example.com", "PL00001", "01-01-1990")
+    assert player == Player("Someone", None, "PL00001", None)
+    assert player != Player("Ann", "ann@example.com", "PL00002", "01-01-1990")
+    # Comparing with other types does not raise (tournaments can hold bare chess_ids)
+    assert player != "PL00001"
+    assert player not in ["PL00001", None]
+
+
+def test_chess_id_of_a_tournament_player_cannot_change(tmp_path, monkeypatch, registry):
+    (tmp_path / "clubs").mkdir()
+    club = ClubManager(tmp_path / "clubs").create("Test Club")
+    entered = club.create_player(name="Ann", email="ann@example.com", chess_id="PL00001", birthday="01-01-1990")
+    other = club.create_player(name="Bob", email="bob@example.com", chess_id="PL00002", birthday="01-01-1990")
+    TournamentManager(tmp_path / "tournaments").save_tournament(make_tournament([entered]))
+    monkeypatch.setattr("commands.update_player.get_player_registry", lambda: registry)
+    monkeypatch.setattr("commands.update_player.get_tournament_manager",
+                        lambda: TournamentManager(tmp_path / "tournaments"))
+
+    PlayerUpdateCmd(club, entered, chess_id="PL00003").execute()
+    PlayerUpdateCmd(club, other, chess_id="PL00004").execute()
+    assert (entered.chess_id, other.chess_id) == ("PL00001", "PL00004")
+    assert registry.find_by_chess_id("PL00001") is entered
+    assert registry.find_by_chess_id("PL00004") is other
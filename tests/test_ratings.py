@@ -0,0 +1,69 @@
+import json
+
+import numpy as np
+import pytest
+
+from models.player_registry import PlayerRegistry
+from models.ratings import RatingEngine, end_date_key
+from models.tournament_manager import TournamentManager
+
+from .helpers import make_players, make_tournament, play_round
+
+
+def play_tournaments(manager, players):
+    """Two tournaments played to the end, one after the other, saved after every step"""
+    tournaments = []
+    for number, end_date in enumerate(("02-01-2024", "02-02-2024")):
+        tournament = make_tournament(players, number_of_rounds=4, pairing_engine="weighted",
+                                     name=f"Open {number}", end_date=end_date)
+        manager.save_tournament(tournament)
+        for _ in range(tournament.number_of_rounds):
+            play_round(tournament, manager)
+        tournaments.append(tournament)
+    return tournaments
+
+
+@pytest.fixture
+def played(tmp_path):
+    players = make_players(9, prefix="EL")
+    registry = PlayerRegistry()
+    for player in players:
+        registry.add(player)
+    ratings = RatingEngine(tmp_path / "ratings.json")
+    manager = TournamentManager(tmp_path / "tournaments", player_registry=registry, ratings=ratings, lazy=True)
+    tournaments = play_tournaments(manager, players)
+    return manager, ratings, players, tournaments
+
+
+def test_incremental_ratings_match_the_replay(tmp_path, played):
+    manager, ratings, players, tournaments = played
+    assert ratings.rated_rounds == {tournament.uid: 4 for tournament in tournaments}
+
+    rebuilt = RatingEngine(tmp_path / "rebuilt.json")
+    rebuilt.replay(manager.iter_tournaments(key=end_date_key, completed=True))
+    assert rebuilt.rated_rounds == ratings.rated_rounds
+    assert np.allclose([rebuilt.rating(p) for p in players], [ratings.rating(p) for p in players])
+    assert [rebuilt.games(p) for p in players] == [ratings.games(p) for p in players]
+    assert len({ratings.rating(p) for p in players}) > 1
+
+
+def test_rounds_are_rated_once(played):
+    _, ratings, players, tournaments = played
+    before = [ratings.rating(p) for p in players]
+    assert ratings.update(tournaments[0]) == 0
+    assert [ratings.rating(p) for p in players] == before
+
+
+def test_ratings_file_is_loaded_again(tmp_path, played):
+    _, ratings, players, _ = played
+    loaded = RatingEngine(tmp_path / "ratings.json")
+    loaded.load()
+    assert loaded.rated_rounds == ratings.rated_rounds
+    assert np.allclose([loaded.rating(p) for p in players], [ratings.rating(p) for p in players], atol=0.01)
+
+
+def test_ratings_file_of_a_previous_version_is_rejected(tmp_path):
+    with open(tmp_path / "ratings.json", "w") as fp:
+        json.dump({"rated_rounds": {"Open": 4}, "players": {}}, fp)
+    with pytest.raises(ValueError):
+        RatingEngine(tmp_path / "ratings.json").load()
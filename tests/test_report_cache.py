@@ -0,0 +1,94 @@
+import pytest
+
+from models.club_manager import ClubManager
+from models.player_registry import PlayerRegistry
+from models.report_cache import ReportCache
+from models.reports import Report, players_report, rounds_report
+from models.tournament_manager import TournamentManager
+
+from .helpers import make_players, make_tournament, play_round
+
+
+@pytest.fixture
+def clubs_dir(tmp_path):
+    clubs_dir = tmp_path / "clubs"
+    clubs_dir.mkdir()
+    club = ClubManager(clubs_dir, journaled=True).create("Cache Club")
+    club.bulk_create_players(player.serialize() for player in make_players(5))
+    return clubs_dir
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ReportCache(tmp_path / "reports")
+
+
+def test_report_is_rendered_again_when_an_input_changes(clubs_dir, cache):
+    filepath, cached = cache.write(players_report(clubs_dir))
+    assert not cached
+    rendered = filepath.stat().st_mtime_ns
+    assert cache.write(players_report(clubs_dir)) == (filepath, True)
+    assert filepath.stat().st_mtime_ns == rendered
+
+    # A change appended to the journal of a club file
+    club, = ClubManager(clubs_dir, journaled=True).clubs
+    club.create_player(name="Zoe", email="zoe@example.com", chess_id="ZZ00001", birthday="01-01-2000")
+    assert cache.write(players_report(clubs_dir)) == (filepath, False)
+    assert "ZZ00001" in filepath.read_text()
+    assert cache.write(players_report(clubs_dir)) == (filepath, True)
+
+    # A club file added, then removed
+    ClubManager(clubs_dir).create("Other Club")
+    assert cache.write(players_report(clubs_dir)) == (filepath, False)
+    (clubs_dir / "OtherClub.json").unlink()
+    assert cache.write(players_report(clubs_dir)) == (filepath, False)
+
+
+def test_cache_is_kept_in_the_manifest(tmp_path, clubs_dir, cache):
+    cache.write(players_report(clubs_dir))
+    assert ReportCache(tmp_path / "reports").write(players_report(clubs_dir))[1]
+    # Every format has its own file
+    assert not cache.write(players_report(clubs_dir), "json")[1]
+
+    # An invalid manifest renders every report again
+    cache.filepath.write_text("{")
+    assert not ReportCache(tmp_path / "reports").write(players_report(clubs_dir))[1]
+
+
+def test_tournament_report_is_only_cached_once_saved(tmp_path, clubs_dir, cache):
+    registry = PlayerRegistry()
+    players = make_players(4)
+    for player in players:
+        registry.add(player)
+    manager = TournamentManager(tmp_path / "tournaments", player_registry=registry, journaled=True)
+    tournament = make_tournament(players)
+
+    def write():
+        return cache.write(rounds_report(tournament, manager.tournaments_dir, clubs_dir))[1]
+
+    manager.save_tournament(tournament)
+    tournament.advance_round()
+    # Changed since it was saved: rendered every time
+    assert not write()
+    assert not write()
+
+    manager.save_tournament(tournament)
+    assert not write()
+    assert write()
+    play_round(tournament, manager)
+    assert not write()
+
+
+def test_least_recently_used_reports_are_removed(tmp_path, clubs_dir):
+    cache = ReportCache(tmp_path / "reports", max_bytes=1)
+    first, _ = cache.write(players_report(clubs_dir))
+    second, _ = cache.write(players_report(clubs_dir), "json")
+    # Over max_bytes, but the report just written is kept
+    assert not first.exists()
+    assert second.exists()
+    assert list(cache.entries) == [second.name]
+
+    # A report whose inputs are not files is never cached
+    report = Report("custom", "Custom", ("value",), [(1,)])
+    assert not cache.write(report)[1]
+    assert not cache.write(Report("custom", "Custom", ("value",), [(1,)]))[1]
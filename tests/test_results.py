@@ -0,0 +1,105 @@
+import pytest
+
+from models.player_registry import PlayerRegistry
+from models.results_file import read_results
+from models.tournament_format import compact_tournament
+from models.tournament_manager import TournamentManager
+
+from .helpers import make_players, make_tournament
+
+
+@pytest.fixture
+def tournament():
+    tournament = make_tournament(make_players(6))
+    tournament.advance_round()
+    return tournament
+
+
+def pairs(tournament):
+    return [(match.player1.chess_id, match.player2.chess_id) for match in tournament.rounds[-1].matches]
+
+
+def points(tournament):
+    return {player.chess_id: tournament.get_player_points(player) for player in tournament.players}
+
+
+def test_results_are_recorded_in_any_order(tournament):
+    (a, b), (c, d), (e, f) = pairs(tournament)
+    assert tournament.record_results([(b, a, 1.0, 0.0), (c, d, 0.5, 0.5)]) == 2
+    assert points(tournament) == {a: 0.0, b: 1.0, c: 0.5, d: 0.5, e: 0.0, f: 0.0}
+    assert tournament.rounds[-1].end_datetime is None
+
+    # A result entered again replaces the previous one; the last result closes the round
+    assert tournament.record_results([(a, b, 0.5, 0.5), (e, f, 0.0, 1.0)]) == 2
+    assert points(tournament) == {a: 0.5, b: 0.5, c: 0.5, d: 0.5, e: 0.0, f: 1.0}
+    assert tournament.rounds[-1].end_datetime is not None
+    assert [event["op"] for event in tournament.pending_events][-1] == "round_closed"
+    assert tournament.verify_points() == []
+
+
+def test_invalid_results_are_all_rejected(tournament):
+    (a, b), (c, d), (e, f) = pairs(tournament)
+    events = list(tournament.pending_events)
+    with pytest.raises(ValueError) as error:
+        tournament.record_results([(a, b, 1.0, 0.0), (a, c, 1.0, 0.0), (c, d, 1.0, 1.0), (b, a, 0.0, 1.0)])
+
+    assert str(error.value).splitlines() == [
+        f"Result 2: no match {a} vs {c} in Round 1",
+        "Result 3: invalid score 1.0-1.0",
+        f"Result 4: {b} vs {a} is given more than once",
+    ]
+    # Nothing was applied, not even the valid result
+    assert set(points(tournament).values()) == {0.0}
+    assert tournament.pending_events == events
+
+
+def test_results_file_is_read(tmp_path, tournament):
+    (a, b), (c, d), (e, f) = pairs(tournament)
+    (tmp_path / "round.csv").write_text(
+        f"player1,player2,result\n{a},{b},1-0\n{d},{c},½-½\n{e},{f}, 0 - 1\n", encoding="utf-8-sig"
+    )
+    (tmp_path / "round.jsonl").write_text(
+        f'{{"player1": "{a}", "player2": "{b}", "score1": 1, "score2": 0}}\n\n'
+        f'{{"player1": "{d}", "player2": "{c}", "result": "1/2-1/2"}}\n'
+        f'{{"player1": "{e}", "player2": "{f}", "score1": "0", "score2": "1"}}\n'
+    )
+
+    expected = [(a, b, 1.0, 0.0), (d, c, 0.5, 0.5), (e, f, 0.0, 1.0)]
+    assert read_results(tmp_path / "round.csv") == expected
+    assert read_results(tmp_path / "round.jsonl") == expected
+    assert tournament.record_results(read_results(tmp_path / "round.csv")) == 3
+    assert points(tournament) == {a: 1.0, b: 0.0, c: 0.5, d: 0.5, e: 0.0, f: 1.0}
+
+
+def test_invalid_lines_of_a_results_file_are_listed(tmp_path):
+    (tmp_path / "round.csv").write_text("player1,player2,score1\nTS00000,TS00001,1\n,TS00002,,\nTS00003,TS00004,x\n")
+    with pytest.raises(ValueError) as error:
+        read_results(tmp_path / "round.csv")
+    assert str(error.value).splitlines() == [
+        "Invalid results file:",
+        "line 2: a result or score1 and score2 are required!",
+        "line 3: player1 and player2 are required!",
+        "line 4: a result or score1 and score2 are required!",
+    ]
+
+    (tmp_path / "round.txt").write_text("")
+    with pytest.raises(ValueError):
+        read_results(tmp_path / "round.txt")
+
+
+def test_imported_results_are_replayed_from_the_journal(tmp_path, tournament):
+    registry = PlayerRegistry()
+    for player in tournament.players:
+        registry.add(player)
+    manager = TournamentManager(tmp_path, player_registry=registry, journaled=True)
+    manager.save_tournament(tournament)
+
+    (a, b), (c, d), (e, f) = pairs(tournament)
+    tournament.record_results([(a, b, 1.0, 0.0), (c, d, 0.5, 0.5), (e, f, 0.0, 1.0)])
+    manager.save_tournament(tournament)
+    assert (tmp_path / f"{tournament.filename}.journal").exists()
+
+    loaded, = TournamentManager(tmp_path, player_registry=registry).tournaments
+    assert compact_tournament(loaded) == compact_tournament(tournament)
+    assert points(loaded) == points(tournament)
+    assert loaded.points_drift == []
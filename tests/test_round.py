@@ -0,0 +1,90 @@
+import pickle
+
+import pytest
+
+from models.match import Match
+from models.round import PlayerTable, Round, round_rows
+
+from .helpers import make_players, make_tournament, play_round
+
+
+def test_matches_are_read_from_and_written_to_the_arrays():
+    players = make_players(4)
+    round_obj = Round("Round 1", "01-01-2024 10:00")
+    round_obj.add_pairing(players[0], players[1])
+    round_obj.add_match(Match(players[2], players[3], 0.5, 0.5))
+
+    first, last = round_obj.matches[0], round_obj.matches[-1]
+    assert (first.player1, first.player2, first.score1, first.score2) == (players[0], players[1], 0, 0)
+    first.set_result(1, 0)
+    assert round_obj.matches[0].score1 == 1.0
+    assert [list(column) for column in round_obj.columns()] == [[0, 2], [1, 3], [2, 1], [0, 1]]
+    assert last.serialize() == {"player1": "TS00002", "player2": "TS00003", "score1": 0.5, "score2": 0.5}
+    assert [match.index for match in round_obj.matches[::-1]] == [1, 0]
+    with pytest.raises(IndexError):
+        round_obj.matches[2]
+
+
+def test_scores_are_half_points():
+    players = make_players(2)
+    round_obj = Round("Round 1")
+    with pytest.raises(ValueError):
+        round_obj.add_pairing(players[0], players[1], 0.25, 0.75)
+    with pytest.raises(ValueError):
+        round_obj.add_pairing(players[0], players[1], 128, 0)
+    assert len(round_obj.matches) == 0
+
+    round_obj.add_pairing(players[0], players[1], 127.5, 0)
+    with pytest.raises(ValueError):
+        round_obj.matches[0].set_result(0, -1)
+    assert round_obj.rows() == [("TS00000", "TS00001", 127.5, 0.0)]
+
+
+def test_dates_are_kept_as_timestamps():
+    round_obj = Round("Round 1", "31-12-2023 23:59", "01-01-2024 01:30")
+    assert (round_obj.start_timestamp, round_obj.end_timestamp) == (1704067140, 1704072600)
+    assert round_obj.serialize() == {
+        "name": "Round 1", "start_datetime": "31-12-2023 23:59", "end_datetime": "01-01-2024 01:30", "matches": [],
+    }
+    round_obj.start_datetime = None
+    assert round_obj.start_datetime is None
+
+
+def test_rounds_of_a_tournament_share_its_players():
+    tournament = make_tournament(make_players(8))
+    for _ in range(3):
+        play_round(tournament)
+    assert all(round_obj.player_table is tournament.player_table for round_obj in tournament.rounds)
+    assert len(tournament.player_table) == 8
+
+    # A round built on its own table is moved to the tournament's one
+    players = tournament.players
+    round_obj = Round("Round 4")
+    round_obj.add_pairing(players[7], players[0], 1, 0)
+    tournament.add_round(round_obj)
+    assert round_obj.player_table is tournament.player_table
+    assert round_obj.rows() == [("TS00007", "TS00000", 1.0, 0.0)]
+    assert len(tournament.player_table) == 8
+
+
+def test_pickled_round_keeps_its_matches():
+    tournament = make_tournament(make_players(6))
+    play_round(tournament)
+
+    copy = pickle.loads(pickle.dumps(tournament.rounds[0]))
+    assert copy.rows() == tournament.rounds[0].rows()
+    assert copy.player_table.position(copy.matches[0].player1) == tournament.rounds[0].columns()[0][0]
+
+
+def test_rows_of_every_round_schema():
+    table = PlayerTable()
+    round_obj = Round("Round 2", player_table=table)
+    round_obj.add_pairing("TS00000", "TS00001", 0.5, 0.5)
+    normalized = {"name": "Round 2", "matches": [{"player1": "TS00000", "player2": "TS00001", "score1": 0.5,
+                                                  "score2": 0.5}]}
+    legacy = [{"players": ["TS00000", "TS00001"], "completed": True, "winner": None}]
+
+    expected = [("TS00000", "TS00001", 0.5, 0.5)]
+    assert round_rows(round_obj, 1)[3] == expected
+    assert round_rows(normalized, 1) == ("Round 2", None, None, expected)
+    assert round_rows(legacy, 1) == ("Round 2", None, None, expected)
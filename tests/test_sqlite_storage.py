@@ -0,0 +1,114 @@
+import shutil
+import sqlite3
+from pathlib import Path
+
+import sqlite_tool
+from models.club_manager import ClubManager
+from models.player_registry import PlayerRegistry
+from models.sqlite_storage import SQLiteStorage
+from models.tournament_index import legacy_uid
+from models.tournament_format import compact_tournament
+from models.tournament_manager import TournamentManager
+
+from .helpers import make_players, make_tournament, play_round
+
+DATA = Path(__file__).parent.parent / "data"
+
+
+def test_club_is_loaded_again(tmp_path):
+    database = tmp_path / "chess.db"
+    storage = SQLiteStorage(database)
+    club = ClubManager(tmp_path, storage=storage).create("Test Club")
+    for player in make_players(3, prefix="SQ"):
+        club.create_player(**player.serialize())
+    club.update_player(club.players[1], name="Renamed", email="renamed@example.com")
+    storage.close()
+
+    loaded, = ClubManager(tmp_path, storage=SQLiteStorage(database)).clubs
+    assert loaded.name == "Test Club"
+    assert [player.serialize() for player in loaded.players] == [player.serialize() for player in club.players]
+
+
+def test_tournament_is_loaded_again(tmp_path):
+    database = tmp_path / "chess.db"
+    players = make_players(9, prefix="SQ")
+    registry = PlayerRegistry()
+    for player in players:
+        registry.add(player)
+
+    storage = SQLiteStorage(database)
+    manager = TournamentManager(storage=storage, player_registry=registry)
+    tournament = make_tournament(players, number_of_rounds=5, pairing_engine="weighted")
+    manager.save_tournament(tournament)
+    for _ in range(3):
+        play_round(tournament, manager)
+    storage.close()
+
+    storage = SQLiteStorage(database)
+    loaded, = TournamentManager(storage=storage, player_registry=registry).tournaments
+    assert loaded.uid == tournament.uid
+    assert loaded.points_drift == []
+    # The byes are stored as a number per player: their order is not kept
+    expected, actual = compact_tournament(tournament), compact_tournament(loaded)
+    assert sorted(actual.pop("byes")) == sorted(expected.pop("byes"))
+    assert actual == expected
+    assert storage.tournaments_for_player(players[0].chess_id) == [tournament.uid]
+
+
+def test_tournaments_with_the_same_name_are_kept(tmp_path):
+    storage = SQLiteStorage(tmp_path / "chess.db")
+    manager = TournamentManager(storage=storage, player_registry=PlayerRegistry())
+    tournaments = [make_tournament(make_players(4, prefix="SQ")) for _ in range(2)]
+    for tournament in tournaments:
+        manager.save_tournament(tournament)
+    manager.save_tournament(tournaments[0])
+
+    loaded = TournamentManager(storage=storage, player_registry=PlayerRegistry()).tournaments
+    assert [tournament.uid for tournament in loaded] == [tournament.uid for tournament in tournaments]
+
+
+def test_database_of_a_previous_version_is_migrated(tmp_path):
+    database = tmp_path / "chess.db"
+    connection = sqlite3.connect(database)
+    connection.executescript("""
+        CREATE TABLE tournaments (
+            id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE, location TEXT NOT NULL,
+            description TEXT NOT NULL DEFAULT '', time_control TEXT, start_date TEXT NOT NULL,
+            end_date TEXT NOT NULL, number_of_rounds INTEGER NOT NULL, current_round INTEGER,
+            completed INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE TABLE tournament_players (
+            tournament_id INTEGER NOT NULL REFERENCES tournaments(id) ON DELETE CASCADE,
+            position INTEGER NOT NULL, chess_id TEXT NOT NULL, points REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (tournament_id, position)
+        );
+        INSERT INTO tournaments (name, location, start_date, end_date, number_of_rounds)
+            VALUES ('Test Open', 'Nowhere', '01-01-2024', '02-01-2024', 4);
+        INSERT INTO tournament_players VALUES (1, 0, 'SQ00000', 0), (1, 1, 'SQ00001', 0);
+    """)
+    connection.close()
+
+    storage = SQLiteStorage(database)
+    manager = TournamentManager(storage=storage, player_registry=PlayerRegistry())
+    migrated, = manager.tournaments
+    assert migrated.uid == legacy_uid("Test Open", "01-01-2024", "Nowhere")
+    assert migrated.players == ["SQ00000", "SQ00001"]
+
+    # Another tournament with the same name, and the migrated one saved again
+    manager.save_tournament(make_tournament(make_players(2, prefix="SQ")))
+    manager.save_tournament(migrated)
+    loaded = TournamentManager(storage=storage, player_registry=PlayerRegistry()).tournaments
+    assert [tournament.name for tournament in loaded] == ["Test Open", "Test Open"]
+    assert loaded[0].uid == migrated.uid
+
+
+def test_import_reports_the_files_of_the_same_tournament(tmp_path, capsys):
+    shutil.copytree(DATA / "clubs", tmp_path / "clubs", ignore=shutil.ignore_patterns(".*"))
+    shutil.copytree(DATA / "tournaments", tmp_path / "tournaments", ignore=shutil.ignore_patterns(".*"))
+    database = tmp_path / "chess.db"
+
+    assert sqlite_tool.import_json(database, tmp_path / "clubs", tmp_path / "tournaments") == 0
+    output = capsys.readouterr().out
+    assert "Skipped completed_normalized.json: same tournament" in output
+    assert "and 2 tournaments (2 files skipped)" in output
+    assert len(SQLiteStorage(database).load_tournaments()) == 2
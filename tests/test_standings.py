@@ -0,0 +1,36 @@
+import random
+
+from models.standings import Standings
+
+
+def test_standings_match_a_full_sort():
+    standings = Standings()
+    points = {}
+    for _ in range(2000):
+        player = f"ST{random.randrange(50):05d}"
+        if random.random() < 0.05:
+            standings.remove(player)
+            points.pop(player, None)
+        else:
+            points[player] = random.randrange(8) / 2
+            standings.update(player, points[player])
+
+    ranked = list(standings)
+    assert sorted(ranked) == sorted(points)
+    assert [points[player] for player in ranked] == sorted(points.values(), reverse=True)
+    for player in ranked:
+        assert standings.rank(player) == 1 + sum(value > points[player] for value in points.values())
+    # The stale entries are dropped: a heap holds at most twice its players
+    assert all(len(standings._groups[value]) <= 2 * size for value, size in standings._sizes.items())
+
+
+def test_players_keep_their_order_when_they_move_together():
+    standings = Standings()
+    players = [f"ST{i:05d}" for i in range(20)]
+    for player in players:
+        standings.update(player, 0.0)
+    before = list(standings)
+    for player in players:
+        standings.update(player, 1.0)
+    assert list(standings) == before
+    assert [points for points, _ in standings.points_groups()] == [1.0]
@@ -0,0 +1,140 @@
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from models.player_registry import PlayerRegistry
+from models.tournament_format import compact_tournament, is_compact
+from models.tournament_manager import TournamentManager
+
+from .helpers import make_players, make_tournament, play_round
+
+FIXTURES = Path(__file__).parent.parent / "data" / "tournaments"
+
+
+@pytest.fixture
+def players():
+    return make_players(9)
+
+
+@pytest.fixture
+def registry(players):
+    registry = PlayerRegistry()
+    for player in players:
+        registry.add(player)
+    return registry
+
+
+def played_tournament(manager, players, rounds=3):
+    tournament = make_tournament(players, number_of_rounds=5, pairing_engine="weighted")
+    manager.save_tournament(tournament)
+    for _ in range(rounds):
+        play_round(tournament, manager)
+    return tournament
+
+
+@pytest.mark.parametrize("journaled", [False, True])
+def test_saved_tournament_is_loaded_again(tmp_path, players, registry, journaled):
+    manager = TournamentManager(tmp_path, player_registry=registry, journaled=journaled)
+    tournament = played_tournament(manager, players)
+
+    with open(tmp_path / tournament.filename) as fp:
+        assert is_compact(json.load(fp))
+    assert (tmp_path / f"{tournament.filename}.journal").exists() == journaled
+
+    loaded, = TournamentManager(tmp_path, player_registry=registry).tournaments
+    assert compact_tournament(loaded) == compact_tournament(tournament)
+    assert loaded.points_drift == []
+    assert loaded.players == tournament.players
+    assert all(player is registry.find_by_chess_id(player.chess_id) for player in loaded.players)
+
+
+def test_loaded_tournament_is_played_and_loaded_again(tmp_path, players, registry):
+    tournament = played_tournament(TournamentManager(tmp_path, player_registry=registry, journaled=True), players)
+
+    manager = TournamentManager(tmp_path, player_registry=registry, journaled=True)
+    loaded, = manager.tournaments
+    play_round(loaded, manager)
+
+    reloaded, = TournamentManager(tmp_path, player_registry=registry).tournaments
+    assert len(reloaded.rounds) == len(tournament.rounds) + 1
+    assert compact_tournament(reloaded) == compact_tournament(loaded)
+
+
+def test_legacy_file_is_migrated(tmp_path, players, registry):
+    tournament = played_tournament(TournamentManager(tmp_path / "source", player_registry=registry), players)
+    # The previous (normalized) schema, with a wrong number of points
+    data = tournament.serialize()
+    data["player_points"][players[0].chess_id] += 10
+    with open(tmp_path / "legacy.json", "w") as fp:
+        json.dump(data, fp)
+
+    manager = TournamentManager(tmp_path, player_registry=registry)
+    assert manager.migrate_files() == ["legacy.json"]
+    with open(tmp_path / "legacy.json") as fp:
+        assert is_compact(json.load(fp))
+
+    migrated, = TournamentManager(tmp_path, player_registry=registry).tournaments
+    assert compact_tournament(migrated) == compact_tournament(tournament)
+    assert migrated.points_drift == []
+
+
+def test_points_are_verified_only_when_saved(tmp_path, players, registry):
+    tournament = played_tournament(TournamentManager(tmp_path / "source", player_registry=registry), players)
+    with_points = tournament.serialize()
+    with_points["player_points"][players[0].chess_id] += 10
+    without_points = dict(with_points)
+    del without_points["player_points"]
+    for name, data in (("with_points.json", with_points), ("without_points.json", without_points)):
+        with open(tmp_path / name, "w") as fp:
+            json.dump(data, fp)
+
+    drifts = TournamentManager(tmp_path, player_registry=registry).verify_points()
+    assert list(drifts) == ["with_points.json"]
+
+
+def test_players_in_no_club_are_not_made_up(tmp_path, players):
+    tournament = make_tournament(players[:4], number_of_rounds=2)
+    data = tournament.serialize()
+    data["players"] = [player["chess_id"] for player in data["players"][:2]] + data["players"][2:]
+    with open(tmp_path / "test_open.json", "w") as fp:
+        json.dump(data, fp)
+
+    manager = TournamentManager(tmp_path, player_registry=PlayerRegistry())
+    loaded, = manager.tournaments
+    assert loaded.players[:2] == [players[0].chess_id, players[1].chess_id]
+    assert [player.serialize() for player in loaded.players[2:]] == [player.serialize() for player in players[2:4]]
+
+    play_round(loaded, manager)
+    with open(tmp_path / "test_open.json") as fp:
+        assert json.load(fp)["players"] == data["players"]
+    reloaded, = TournamentManager(tmp_path, player_registry=PlayerRegistry()).tournaments
+    assert compact_tournament(reloaded) == compact_tournament(loaded)
+
+
+def test_tournament_is_saved_to_the_file_it_was_loaded_from(tmp_path):
+    shutil.copy(FIXTURES / "in_progress_normalized.json", tmp_path)
+    manager = TournamentManager(tmp_path, player_registry=PlayerRegistry(), lazy=True, journaled=True)
+    tournament = manager.open_tournament(*manager.get_all_tournaments())
+    assert tournament.filename == "in_progress_normalized.json"
+
+    pending = [match for match in tournament.rounds[-1].matches if match.score1 + match.score2 == 0]
+    tournament.record_results((match.player1, match.player2, 1, 0) for match in pending)
+    manager.save_tournament(tournament)
+    play_round(tournament, manager)
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        ".index", "in_progress_normalized.json", "in_progress_normalized.json.journal",
+    ]
+    reloaded, = TournamentManager(tmp_path, player_registry=PlayerRegistry()).tournaments
+    assert compact_tournament(reloaded) == compact_tournament(tournament)
+
+
+def test_tournaments_with_the_same_name_get_their_own_file(tmp_path, players, registry):
+    manager = TournamentManager(tmp_path, player_registry=registry)
+    tournaments = [played_tournament(manager, players, rounds=1) for _ in range(2)]
+    assert tournaments[0].filename != tournaments[1].filename
+
+    loaded = TournamentManager(tmp_path, player_registry=registry).tournaments
+    assert sorted(tournament.uid for tournament in loaded) == sorted(tournament.uid for tournament in tournaments)
@@ -0,0 +1,108 @@
+import json
+
+import pytest
+
+from models.player_registry import PlayerRegistry
+from models.tournament_format import compact_tournament
+from models.tournament_manager import TournamentManager
+
+from .helpers import make_players, make_tournament, play_round
+
+
+@pytest.fixture
+def players():
+    return make_players(7)
+
+
+@pytest.fixture
+def manager(tmp_path, players):
+    registry = PlayerRegistry()
+    for player in players:
+        registry.add(player)
+    return TournamentManager(tmp_path, player_registry=registry, journaled=True)
+
+
+def reload(manager):
+    loaded, = TournamentManager(manager.tournaments_dir, player_registry=manager._player_registry).tournaments
+    return loaded
+
+
+def journal_of(manager, tournament):
+    return manager.tournaments_dir / f"{tournament.filename}.journal"
+
+
+def test_events_are_appended_then_replayed(manager, players):
+    tournament = make_tournament(players[:5], pairing_engine="weighted")
+    manager.save_tournament(tournament)
+    for player in players[5:]:
+        tournament.add_player(player)
+    play_round(tournament, manager)
+    tournament.advance_round()
+    manager.save_tournament(tournament)
+
+    with open(journal_of(manager, tournament)) as fp:
+        records = [json.loads(line) for line in fp]
+    assert [record["op"] for record in records] == (
+        ["player_registered"] * 2 + ["round_started"] + ["result_recorded"] * 3 + ["round_closed", "round_started"]
+    )
+    assert [record["seq"] for record in records] == list(range(1, 9))
+    assert records[2]["bye"] == tournament.byes[0]
+
+    loaded = reload(manager)
+    assert compact_tournament(loaded) == compact_tournament(tournament)
+    assert loaded.byes == tournament.byes
+    assert loaded.points_drift == []
+    assert (loaded.journal_seq, loaded.journal_records, loaded.pending_events) == (8, 8, [])
+
+
+def test_interrupted_write_is_dropped(manager, players):
+    tournament = make_tournament(players)
+    manager.save_tournament(tournament)
+    play_round(tournament, manager)
+    expected = compact_tournament(tournament)
+    # A crash in the middle of the next write leaves half an event
+    with open(journal_of(manager, tournament), "a") as fp:
+        fp.write('{"op":"round_started","matches":[["TS0')
+
+    loaded = reload(manager)
+    assert compact_tournament(loaded) == expected
+
+    # The loaded tournament goes on: its events follow the last complete one
+    play_round(loaded, manager)
+    reloaded = reload(manager)
+    assert compact_tournament(reloaded) == compact_tournament(loaded)
+    assert len(reloaded.rounds) == 2
+
+
+def test_snapshot_every_snapshot_every_events(manager, players, monkeypatch):
+    monkeypatch.setattr(TournamentManager, "SNAPSHOT_EVERY", 5)
+    tournament = make_tournament(players, pairing_engine="weighted")
+    manager.save_tournament(tournament)
+    play_round(tournament, manager)
+    assert journal_of(manager, tournament).exists()
+    journal = journal_of(manager, tournament).read_bytes()
+
+    # The next event would go over SNAPSHOT_EVERY events: the file is written again
+    tournament.advance_round()
+    manager.save_tournament(tournament)
+    assert not journal_of(manager, tournament).exists()
+    with open(manager.tournaments_dir / tournament.filename) as fp:
+        assert json.load(fp)["journal_seq"] == tournament.journal_seq
+
+    # A crash after the snapshot was written but before the journal was removed: nothing is applied twice
+    journal_of(manager, tournament).write_bytes(journal)
+    loaded = reload(manager)
+    assert compact_tournament(loaded) == compact_tournament(tournament)
+    assert loaded.points_drift == []
+    assert loaded.journal_records == 0
+
+
+def test_lazy_manager_lists_the_journaled_state(manager, players):
+    tournament = make_tournament(players, number_of_rounds=2)
+    manager.save_tournament(tournament)
+    play_round(tournament, manager)
+    play_round(tournament, manager)
+
+    lazy = TournamentManager(manager.tournaments_dir, player_registry=manager._player_registry, lazy=True)
+    summary, = lazy.get_completed_tournaments()
+    assert compact_tournament(lazy.open_tournament(summary)) == compact_tournament(tournament)
@@ -0,0 +1,83 @@
+"""
+Maintenance of the tournament files of a folder:
+- migrate: rewrites the files in the compact format (see models/tournament_format.py). Files in the
+  previous formats are still read by the application: migrating them makes them smaller and faster
+  to load. Each file is rewritten in place, with the points computed from the match history and byes.
+- verify: reports the players whose saved points do not match their match history and byes
+  (see models/points.py); with --fix, these files are written again with the computed points.
+  Files saved without points (the sample schema) are not reported.
+- ratings: builds the Elo ratings (ratings.json next to the folder, see models/ratings.py) again from the
+  completed tournaments, read one at a time by end date. The application only updates this file.
+- career-stats: builds the players' career statistics (career_stats.json next to the folder, see
+  models/career_stats.py) again from all the tournaments, read one at a time by end date, with the
+  opponents' ratings of ratings.json (build it first). The application only updates this file.
+"""
+import argparse
+import sys
+
+from models.career_stats import CareerStats
+from models.player import chess_id_of
+from models.ratings import RatingEngine, end_date_key, get_rating_engine
+from models.tournament_manager import TournamentManager, data_file_path
+
+
+def migrate(tournaments_dir, dry_run=False):
+    manager = TournamentManager(tournaments_dir, lazy=True)
+    migrated = manager.migrate_files(dry_run=dry_run)
+    for filename in migrated:
+        print(f"{'To migrate' if dry_run else 'Migrated'}: {filename}")
+    print(f"{len(migrated)} tournament files {'to migrate' if dry_run else 'migrated'} in {tournaments_dir}")
+    return 0
+
+
+def verify(tournaments_dir, fix=False):
+    manager = TournamentManager(tournaments_dir, lazy=True)
+    drifts = manager.verify_points(fix=fix)
+    for filename, drift in drifts.items():
+        print(f"{filename}:")
+        for player, kept, computed in drift:
+            name = getattr(player, "name", None) or chess_id_of(player)
+            print(f"  {name} ({chess_id_of(player)}): {kept:g} saved, {computed:g} from the history")
+    fixed = " (fixed)" if fix and drifts else ""
+    print(f"{len(drifts)} tournament files with a points drift{fixed} in {tournaments_dir}")
+    return 1 if drifts and not fix else 0
+
+
+def ratings(tournaments_dir):
+    manager = TournamentManager(tournaments_dir, lazy=True)
+    engine = RatingEngine(data_file_path(tournaments_dir, "ratings.json"))
+    engine.replay(manager.iter_tournaments(key=end_date_key, completed=True))
+    engine.save()
+    print(f"Ratings of {len(engine)} players from {len(engine.rated_rounds)} tournaments written to {engine.filepath}")
+    return 0
+
+
+def career_stats(tournaments_dir):
+    manager = TournamentManager(tournaments_dir, lazy=True)
+    stats = CareerStats(data_file_path(tournaments_dir, "career_stats.json"),
+                        get_rating_engine(data_file_path(tournaments_dir, "ratings.json")))
+    stats.build(manager.iter_tournaments(key=end_date_key))
+    stats.save()
+    print(f"Career statistics of {len(stats)} players ({len(stats.finished)} finished tournaments) "
+          f"written to {stats.filepath}")
+    return 0
+
+
+ACTIONS = {"migrate": migrate, "verify": verify, "ratings": ratings, "career-stats": career_stats}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tournament files maintenance.")
+    parser.add_argument("action", choices=sorted(ACTIONS),
+                        help="migrate: rewrite the files in the compact format, verify: check the players' points, "
+                             "ratings: build the Elo ratings, career-stats: build the players' career statistics")
+    parser.add_argument("tournaments", type=str, nargs="?", default="data/tournaments", help="tournaments folder")
+    parser.add_argument("--dry-run", action="store_true", help="only list the files to migrate")
+    parser.add_argument("--fix", action="store_true", help="write the points computed from the history (verify)")
+
+    args = parser.parse_args()
+    if args.action == "migrate":
+        sys.exit(migrate(args.tournaments, args.dry_run))
+    if args.action == "verify":
+        sys.exit(verify(args.tournaments, args.fix))
+    sys.exit(ACTIONS[args.action](args.tournaments))